@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+BareBlocks Carve - Find images and archives inside disk images and memory dumps
+Scans a blob for PNG/JPEG/GIF/WebP/ZIP signatures, validates each candidate's structure
+and inspects every carved object in memory
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.carver import FileCarver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='BareBlocks - Carve embedded images out of arbitrary data',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python bareblocks-carve.py disk.img
+  python bareblocks-carve.py memory.dmp --workers 8 --json > carved.json
+  python bareblocks-carve.py disk.img --nested --no-reports
+        """
+    )
+    parser.add_argument('blob', help='File to scan (disk image, memory dump, ...)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--segment-size', type=int, default=64, metavar='MB',
+                        help='Bytes scanned per task in MB (default: 64)')
+    parser.add_argument('--max-object-size', type=int, default=512, metavar='MB',
+                        help='Largest object to carve in MB (default: 512)')
+    parser.add_argument('--nested', action='store_true',
+                        help='Also list objects inside other carved objects (thumbnails, archive members)')
+    parser.add_argument('--no-reports', action='store_true', help='Locate objects only, skip inspection')
+    parser.add_argument('--pixels', action='store_true',
+                        help='Include pixel analysis in each report (LSB, watermark, perceptual hashes)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+
+    args = parser.parse_args()
+    console = Console()
+
+    if not Path(args.blob).is_file():
+        console.print(f"[red]Error:[/red] File not found: {args.blob}")
+        sys.exit(1)
+
+    carver = FileCarver(
+        segment_size=args.segment_size * 1024 * 1024,
+        max_object_size=args.max_object_size * 1024 * 1024,
+        max_workers=args.workers,
+        include_nested=args.nested,
+        inspect=not args.no_reports,
+        inspector_options={'pixel_analysis': args.pixels}
+    )
+
+    start = time.time()
+    objects = carver.carve(args.blob)
+    elapsed = time.time() - start
+
+    if args.json:
+        print(json.dumps(objects, indent=2, default=str))
+        return
+
+    table = Table(title=f"[bold]Objects carved from {args.blob}[/bold]", box=box.ROUNDED, show_header=True)
+    table.add_column("Offset", style="dim", justify="right")
+    table.add_column("Length", style="green", justify="right")
+    table.add_column("Type", style="cyan")
+    table.add_column("Dimensions")
+    table.add_column("AI Tool", style="magenta")
+    table.add_column("Flags", style="yellow")
+
+    for obj in objects:
+        report = obj.get("report") or {}
+        summary = report.get("summary", {})
+        ai = (report.get("aiMetadata") or {}).get("aiMetadata", {})
+        table.add_row(
+            f"{obj['offset']:#x}",
+            f"{obj['length']:,}",
+            obj["type"],
+            summary.get("dimensions") or "-",
+            ai.get("tool") or "-",
+            ", ".join((report.get("anomalies") or {}).get("flags", [])) or "-"
+        )
+
+    console.print(table)
+    console.print(f"[dim]{len(objects)} object(s) in {elapsed:.1f}s[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,6 @@ import mimetypes
 import subprocess
 import ffmpeg
 import pdfplumber
-import docx
 import mutagen
 from rich.console import Console
 from rich.table import Table
@@ -23,6 +22,11 @@ from rich.tree import Tree
 from rich.style import Style
 from rich.text import Text
 
+from core.mp4_reader import read_mp4_metadata
+from core.mkv_reader import read_mkv_metadata
+from core.audio_reader import read_audio_metadata
+from core.ooxml_reader import read_ooxml_properties
+
 # Try to import magic, fallback to mimetypes if not available
 try:
     import magic
@@ -30,6 +34,19 @@ try:
 except ImportError:
     HAS_MAGIC = False
 
+def container_reader(file_path):
+    """Native metadata reader for ISO-BMFF (MP4/MOV/M4V) or Matroska/WebM files, else None"""
+    try:
+        with open(file_path, 'rb') as f:
+            header = f.read(12)
+    except OSError:
+        return None
+    if header[4:8] == b'ftyp':
+        return read_mp4_metadata
+    if header[:4] == b'\x1a\x45\xdf\xa3':
+        return read_mkv_metadata
+    return None
+
 class MetadataExtractor:
     def __init__(self):
         self.console = Console()
@@ -161,6 +178,25 @@ class MetadataExtractor:
         # Basic file info
         metadata.update(self.get_basic_file_info(file_path))
         
+        # MP4/MOV/M4V and MKV/WebM: read the container directly instead of running ffprobe
+        reader = container_reader(file_path)
+        info = reader(file_path) if reader else None
+        if info is not None and info["error"] is None:
+            metadata.update({
+                "Duration": f"{info['duration']:.2f} seconds" if info["duration"] else "Unknown",
+                "Format": info.get("brand") or info.get("docType") or "Unknown",
+                "Video Codec": info["codec"],
+                "Video Resolution": f"{info['width']}x{info['height']}" if info["width"] else "Unknown",
+                "Frame Rate": f"{info['frameRate']} fps" if info["frameRate"] else "Unknown",
+                "Audio Codec": info["audioCodec"],
+                "Audio Channels": info["audioChannels"],
+                "Audio Sample Rate": f"{info['audioSampleRate']} Hz" if info["audioSampleRate"] else "Unknown",
+                "Bit Rate": f"{info['bitrate'] / 1000:.2f} kbps" if info["bitrate"] else "Unknown"
+            })
+            if info.get("gps"):
+                metadata["GPS"] = f"{info['gps']['latitude']:.6f}, {info['gps']['longitude']:.6f}"
+            return metadata
+        
         # FFmpeg metadata
         try:
             probe = ffmpeg.probe(file_path)
@@ -190,9 +226,30 @@ class MetadataExtractor:
         # Basic file info
         metadata.update(self.get_basic_file_info(file_path))
         
+        # Header-only reader for MP3/FLAC/Ogg/WAV/M4A; eyed3 below if it fails
+        info = read_audio_metadata(file_path)
+        if info["error"] is None:
+            tags = info["tags"]
+            metadata.update({
+                "Title": tags.get("title"),
+                "Artist": tags.get("artist"),
+                "Album": tags.get("album"),
+                "Album Artist": tags.get("album_artist"),
+                "Track Number": tags.get("track"),
+                "Year": tags.get("date"),
+                "Genre": tags.get("genre"),
+                "Codec": info["codec"],
+                "Duration": f"{info['duration']:.2f} seconds" if info["duration"] else "Unknown",
+                "Bit Rate": f"{info['bitrate'] / 1000:.2f} kbps" if info["bitrate"] else "Unknown",
+                "Sample Rate": f"{info['sampleRate']} Hz" if info["sampleRate"] else "Unknown",
+                "Channels": info["channels"]
+            })
+            if info["pictures"]:
+                metadata["Embedded Pictures"] = ", ".join(f"{p['source']} ({p['size']:,} bytes)" for p in info["pictures"])
+        
         # ID3 tags
         try:
-            audio = eyed3.load(file_path)
+            audio = eyed3.load(file_path) if info["error"] else None
             if audio and audio.tag:
                 tag = audio.tag
                 metadata.update({
@@ -253,29 +310,31 @@ class MetadataExtractor:
         # Basic file info
         metadata.update(self.get_basic_file_info(file_path))
         
-        try:
-            doc = docx.Document(file_path)
-            core_properties = doc.core_properties
-            
+        # docProps/core.xml and app.xml, read straight from the zip
+        props = read_ooxml_properties(file_path)
+        if props["error"] is None:
             metadata.update({
-                "Author": core_properties.author,
-                "Category": core_properties.category,
-                "Comments": core_properties.comments,
-                "Content Status": core_properties.content_status,
-                "Created": core_properties.created,
-                "Identifier": core_properties.identifier,
-                "Keywords": core_properties.keywords,
-                "Language": core_properties.language,
-                "Last Modified By": core_properties.last_modified_by,
-                "Last Printed": core_properties.last_printed,
-                "Modified": core_properties.modified,
-                "Revision": core_properties.revision,
-                "Subject": core_properties.subject,
-                "Title": core_properties.title,
-                "Version": core_properties.version
+                "Author": props.get("creator"),
+                "Category": props.get("category"),
+                "Comments": props.get("description"),
+                "Content Status": props.get("contentStatus"),
+                "Created": props.get("created"),
+                "Identifier": props.get("identifier"),
+                "Keywords": props.get("keywords"),
+                "Language": props.get("language"),
+                "Last Modified By": props.get("lastModifiedBy"),
+                "Last Printed": props.get("lastPrinted"),
+                "Modified": props.get("modified"),
+                "Revision": props.get("revision"),
+                "Subject": props.get("subject"),
+                "Title": props.get("title"),
+                "Version": props.get("version"),
+                "Application": props.get("application"),
+                "Pages": props.get("pages"),
+                "Words": props.get("words")
             })
-        except Exception as e:
-            metadata["DOCX Error"] = str(e)
+        else:
+            metadata["DOCX Error"] = props["error"]
             
         return metadata
 
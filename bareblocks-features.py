@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+BareBlocks Features - Query the columnar feature store
+Evaluates vectorized predicates over per-file features collected during inspection
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.feature_store import FeatureStore
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='BareBlocks - Query the feature store',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python bareblocks-features.py features/ "entropy > 7.9 and nonPixelRatio > 0.3"
+  python bareblocks-features.py features/ "watermarkDetected == true or flags has lsb_embedding_suspected"
+  python bareblocks-features.py features/ --columns
+        """
+    )
+    parser.add_argument('store', help='Feature store directory')
+    parser.add_argument('expression', nargs='?', help='Predicate, e.g. "entropy > 7.9 and nonPixelRatio > 0.3"')
+    parser.add_argument('--columns', action='store_true', help='List columns and exit')
+    parser.add_argument('--limit', type=int, default=50, help='Maximum rows to display (default: 50)')
+    parser.add_argument('--json', action='store_true', help='Output matching paths as JSON')
+
+    args = parser.parse_args()
+    console = Console()
+
+    if not Path(args.store).is_dir():
+        console.print(f"[red]Error:[/red] Feature store not found: {args.store}")
+        sys.exit(1)
+
+    store = FeatureStore(args.store)
+
+    if args.columns or not args.expression:
+        table = Table(title=f"[bold]{args.store}[/bold] ({len(store):,} rows)", box=box.ROUNDED)
+        table.add_column("Column", style="cyan")
+        table.add_column("Type", style="green")
+        for name, dtype in store.schema.items():
+            table.add_row(name, dtype)
+        console.print(table)
+        return
+
+    start = time.time()
+    try:
+        paths = store.select(args.expression)
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+    elapsed = time.time() - start
+
+    if args.json:
+        print(json.dumps(paths, indent=2))
+        return
+
+    for path in paths[:args.limit]:
+        console.print(path)
+    if len(paths) > args.limit:
+        console.print(f"[dim]... {len(paths) - args.limit:,} more[/dim]")
+    console.print(f"[dim]{len(paths):,} of {len(store):,} rows matched in {elapsed * 1000:.1f} ms[/dim]")
+
+
+if __name__ == "__main__":
+    main()
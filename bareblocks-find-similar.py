@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+BareBlocks Find Similar - Near-duplicate search over perceptual hashes
+Builds a hash index for a directory and lists images within a Hamming distance
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.metadata_aggregator import MetadataAggregator
+from core.perceptual_hash import compute_perceptual_hashes, HashIndex, HASH_KINDS
+
+HEX_HASH = re.compile(r'^[0-9a-fA-F]{1,16}$')
+
+
+def _hash_file(file_path):
+    """Worker: hashes for one file, or None if it cannot be decoded."""
+    try:
+        return compute_perceptual_hashes(file_path)
+    except Exception:
+        return None
+
+
+def build_index(directory, index_path, kind, workers, console):
+    """Hash every image under a directory and save the index."""
+    aggregator = MetadataAggregator(verbose=False)
+    files = aggregator.scan_directory(directory, recursive=True, file_types=['image'])
+
+    start = time.time()
+    chunksize = max(1, min(64, len(files) // ((workers or os.cpu_count() or 1) * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        hashes = list(executor.map(_hash_file, files, chunksize=chunksize))
+
+    paths = [f for f, h in zip(files, hashes) if h]
+    index = HashIndex.from_hex([h[kind] for h in hashes if h], paths)
+    index.save(index_path)
+
+    console.print(f"[green][OK][/green] Indexed [cyan]{len(index):,}[/cyan] images "
+                  f"([dim]{len(files) - len(index)} skipped, {time.time() - start:.1f}s[/dim]) -> {index_path}")
+
+
+def load_index(args):
+    """Load the index from an .npz file or the metadata database."""
+    if args.db:
+        from core.data_storage import MetadataDatabase
+        paths, hashes = MetadataDatabase(args.db).get_perceptual_hashes(args.hash)
+        import numpy as np
+        return HashIndex(np.array(hashes, dtype=np.uint64), paths)
+    return HashIndex.load(args.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='BareBlocks - Find similar images by perceptual hash',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python bareblocks-find-similar.py --build ~/Pictures --index hashes.npz
+  python bareblocks-find-similar.py photo.jpg --index hashes.npz -k 8
+  python bareblocks-find-similar.py d62828d628d6d6d7 --db data/metadata.db --hash phash
+        """
+    )
+    parser.add_argument('query', nargs='?', help='Image path or 16-digit hex hash')
+    parser.add_argument('--index', default='hashes.npz', help='Hash index file (default: hashes.npz)')
+    parser.add_argument('--db', help='Read hashes from a metadata database instead of an index file')
+    parser.add_argument('--build', metavar='DIR', help='Hash all images under DIR and write the index')
+    parser.add_argument('--hash', choices=HASH_KINDS, default='phash', help='Hash kind (default: phash)')
+    parser.add_argument('-k', '--distance', type=int, default=8, help='Maximum Hamming distance (default: 8)')
+    parser.add_argument('--workers', type=int, help='Worker processes for --build (default: CPU count)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+
+    args = parser.parse_args()
+    console = Console()
+
+    if args.build:
+        build_index(args.build, args.index, args.hash, args.workers, console)
+        if not args.query:
+            return
+
+    if not args.query:
+        parser.error('a query image or hash is required')
+
+    if os.path.exists(args.query):
+        try:
+            query_hash = compute_perceptual_hashes(args.query)[args.hash]
+        except Exception as e:
+            console.print(f"[red]Error:[/red] Could not hash {args.query}: {e}")
+            sys.exit(1)
+    elif HEX_HASH.match(args.query):
+        query_hash = args.query
+    else:
+        console.print(f"[red]Error:[/red] Query is not a file or 16-digit hex hash: {args.query}")
+        sys.exit(1)
+
+    source = args.db or args.index
+    if not os.path.exists(source):
+        console.print(f"[red]Error:[/red] {'Database' if args.db else 'Hash index'} not found: {source}")
+        sys.exit(1)
+
+    index = load_index(args)
+    start = time.time()
+    matches = index.query(query_hash, args.distance)
+    elapsed = time.time() - start
+
+    if args.json:
+        print(json.dumps({"query": query_hash, "distance": args.distance,
+                          "matches": [{"path": p, "distance": d} for p, d in matches]}, indent=2))
+        return
+
+    table = Table(title=f"[bold]Images within distance {args.distance} of {query_hash}[/bold]",
+                 box=box.ROUNDED, show_header=True)
+    table.add_column("Distance", style="green", justify="right")
+    table.add_column("Path", style="cyan")
+    for path, distance in matches:
+        table.add_row(str(distance), path)
+
+    console.print(table)
+    console.print(f"[dim]{len(matches)} match(es) among {len(index):,} hashes in {elapsed * 1000:.1f} ms[/dim]")
+
+
+if __name__ == "__main__":
+    main()
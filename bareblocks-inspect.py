@@ -16,6 +16,40 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from core.layered_inspector import LayeredInspector
 from core.rich_display import RichDisplay
+from core.archive_source import is_archive, split_member_path, iter_archive, list_members
+
+# Archive members inspected unless --all-members is given
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.heic', '.heif', '.avif', '.tif', '.tiff')
+
+
+def iter_sources(file_path, all_members=False):
+    """
+    Yield (report path, buffer or None, error or None) for everything to inspect.
+    
+    A plain file yields itself with no buffer. An archive yields its image
+    members (every member with all_members) in archive order, and an
+    archive!member path yields that member; member buffers are only valid
+    until the next step. Members that cannot be read (encrypted, corrupt)
+    yield their error instead of a buffer.
+    """
+    archive, name = split_member_path(file_path)
+    if name is not None:
+        names = [name]
+    elif is_archive(file_path):
+        # Select members up front so that skipped ones are never decompressed
+        names = [n for n in list_members(archive) if all_members or n.lower().endswith(IMAGE_EXTENSIONS)]
+        if not names:
+            return
+    else:
+        yield file_path, None, None
+        return
+    found = False
+    for member in iter_archive(archive, names):
+        found = True
+        yield member.path, member.data, member.error
+    if name is not None and not found:
+        raise FileNotFoundError(f"{name} not found in {archive}")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -26,15 +60,40 @@ Examples:
   python bareblocks-inspect.py image.png
   python bareblocks-inspect.py photo.jpg --json
   python bareblocks-inspect.py file.png --quiet
+  python bareblocks-inspect.py photo.jpg --xmp-properties dc:creator xmp:CreatorTool
+  python bareblocks-inspect.py image.png --pixels
+  python bareblocks-inspect.py image.png --pixels --feature-store features/
+  python bareblocks-inspect.py photo.jpg --ela-heatmap
+  python bareblocks-inspect.py photos.zip --json
+  python bareblocks-inspect.py "shoot.tar.gz!raw/IMG_0001.jpg"
         """
     )
-    parser.add_argument('file_path', help='Path to the image file to inspect')
+    parser.add_argument('file_path',
+                        help='Image file, ZIP/TAR archive, or archive!member path to inspect')
+    parser.add_argument('--all-members', action='store_true',
+                        help='Inspect every archive member, not just image files')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
     parser.add_argument('--quiet', '-q', action='store_true', help='Suppress progress output')
+    parser.add_argument('--xmp-properties', nargs='+', metavar='PROP',
+                        help='Only extract these XMP properties (e.g. dc:creator xmp:CreatorTool)')
+    parser.add_argument('--xmp-namespaces', nargs='+', metavar='PREFIX',
+                        help='Only extract XMP properties in these namespaces (e.g. xmpMM photoshop)')
+    parser.add_argument('--c2pa', action='store_true',
+                        help='Decode C2PA claims and assertions (generator, actions, ingredients)')
+    parser.add_argument('--ela', action='store_true',
+                        help='JPEG error level analysis and double-compression detection')
+    parser.add_argument('--ela-heatmap', action='store_true',
+                        help='Also write an ELA heatmap PNG to exports/ (implies --ela)')
+    parser.add_argument('--entropy-profile', action='store_true',
+                        help='Windowed entropy across the file; reports high-entropy regions by chunk/segment')
+    parser.add_argument('--feature-store', metavar='DIR',
+                        help='Append this file\'s features to a columnar feature store')
+    parser.add_argument('--pixels', action='store_true',
+                        help='Decode pixels for LSB steganalysis and invisible-watermark detection')
     
     args = parser.parse_args()
     
-    if not Path(args.file_path).exists():
+    if not Path(split_member_path(args.file_path)[0]).exists():
         console = Console()
         console.print(f"[red]Error:[/red] File not found: {args.file_path}")
         sys.exit(1)
@@ -52,27 +111,76 @@ Examples:
     console.print(Panel(banner, border_style="cyan", padding=(1, 2)))
     console.print()
     
+    feature_store = None
+    if args.feature_store:
+        from core.feature_store import FeatureStore
+        feature_store = FeatureStore(args.feature_store)
+    
     # Run inspection
-    inspector = LayeredInspector(console=console, verbose=not args.quiet)
+    inspector = LayeredInspector(
+        console=console,
+        verbose=not args.quiet,
+        xmp_properties=args.xmp_properties,
+        xmp_namespaces=args.xmp_namespaces,
+        decode_c2pa=args.c2pa,
+        pixel_analysis=args.pixels,
+        jpeg_forensics=args.ela or args.ela_heatmap,
+        ela_heatmap=args.ela_heatmap,
+        entropy_profile=args.entropy_profile,
+        feature_store=feature_store
+    )
     
     try:
-        results = inspector.phase_0_orchestrate(args.file_path)
-        final_report = results["phases"]["8_report"]
+        reports = []
+        failures = 0
+        for path, buffer, error in iter_sources(args.file_path, args.all_members):
+            # One bad archive member is reported and skipped; the others are still inspected
+            try:
+                if error is not None:
+                    raise ValueError(error)
+                if buffer is None:
+                    results = inspector.phase_0_orchestrate(path)
+                else:
+                    results = inspector.inspect_bytes(buffer, path)
+            except Exception as e:
+                if path == args.file_path:
+                    raise
+                failures += 1
+                if args.json:
+                    reports.append({"file": path, "error": str(e)})
+                else:
+                    console.print(f"[red]Error inspecting {path}:[/red] {e}")
+                continue
+            final_report = results["phases"]["8_report"]
+            
+            if args.json:
+                reports.append(final_report)
+            else:
+                # Display with Rich formatting
+                display = RichDisplay(console=console)
+                display.display_inspection_report(final_report)
+        if feature_store is not None:
+            feature_store.close()
         
         if args.json:
             import json
-            print(json.dumps(final_report, indent=2, default=str))
+            # An archive gives one report per member
+            output = reports if is_archive(args.file_path) else reports[0]
+            print(json.dumps(output, indent=2, default=str))
         else:
-            # Display with Rich formatting
-            display = RichDisplay(console=console)
-            display.display_inspection_report(final_report)
-            
             # Final summary
-            console.print(Panel(
-                "[bold green][OK] Inspection Complete[/bold green]\n"
-                "[dim]All phases executed successfully. See above for detailed results.[/dim]",
-                border_style="green"
-            ))
+            if failures:
+                console.print(Panel(
+                    "[bold yellow]Inspection Complete[/bold yellow]\n"
+                    f"[dim]{failures} member(s) could not be inspected. See above for detailed results.[/dim]",
+                    border_style="yellow"
+                ))
+            else:
+                console.print(Panel(
+                    "[bold green][OK] Inspection Complete[/bold green]\n"
+                    "[dim]All phases executed successfully. See above for detailed results.[/dim]",
+                    border_style="green"
+                ))
     
     except Exception as e:
         console.print(f"[red]Error during inspection:[/red] {str(e)}")
@@ -3,4 +3,4 @@ Core module for BareBlocks metadata extraction and aggregation.
 """
 
 __version__ = "1.0.0"
-__all__ = ['metadata_aggregator', 'data_storage', 'data_models']
+__all__ = ['metadata_aggregator', 'data_storage', 'data_models', 'xmp_parser', 'c2pa_locator', 'icc_profile', 'steganalysis', 'stealth_pnginfo', 'watermark', 'perceptual_hash', 'feature_store', 'jpeg_forensics', 'png_idat', 'entropy_profile', 'buffer_io', 'carver', 'archive_source', 'mime_sniff', 'mp4_reader', 'mkv_reader', 'audio_reader', 'ooxml_reader']
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Archive Source - Read files inside ZIP and TAR archives as virtual directories.
+
+This module provides iter_archive(), which yields the members of a .zip,
+.tar, .tar.gz, .tar.bz2, .tar.xz or .tar.zst archive in archive order
+without extracting anything to disk, and read_member() for a single member.
+Members are addressed as "archive!member" paths (e.g. "photos.zip!2024/a.jpg").
+
+ZIP archives are read with random access from their central directory.
+Members stored without compression are served as a slice of a read-only
+mmap of the archive, so they are inspected without being copied; compressed
+members are inflated into memory one at a time. TAR archives (compressed or
+not) are read as a single sequential stream, so a .tar.gz is decompressed
+exactly once however many members it holds.
+"""
+
+import mmap
+import os
+import tarfile
+import zipfile
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, List, Optional, Iterable, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+MEMBER_SEPARATOR = "!"
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ZSTD_SUFFIXES = (".tar.zst", ".tzst")
+ARCHIVE_SUFFIXES = ZIP_SUFFIXES + TAR_SUFFIXES + ZSTD_SUFFIXES
+
+# Fixed part of a ZIP local file header; name and extra field lengths sit at 26 and 28
+ZIP_LOCAL_HEADER_SIZE = 30
+
+
+@dataclass
+class ArchiveMember:
+    """
+    One regular file inside an archive.
+
+    `data` is a bytes object, or a memoryview into the mapped archive for
+    stored ZIP members; it is only valid until the iterator that produced
+    it advances. A member that cannot be read (encrypted, corrupt) has
+    empty data and the reason in `error`.
+    """
+    archive: str
+    name: str
+    size: int
+    modified: Optional[datetime]
+    data: Union[bytes, memoryview]
+    zero_copy: bool = False
+    error: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        """Virtual path of the member: archive!member"""
+        return f"{self.archive}{MEMBER_SEPARATOR}{self.name}"
+
+
+def is_archive(path: str) -> bool:
+    """Whether a path names a supported archive (by suffix)."""
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def split_member_path(path: str) -> Tuple[str, Optional[str]]:
+    """
+    Split an "archive!member" path.
+
+    Args:
+        path: Virtual member path or plain file path
+
+    Returns:
+        (archive path, member name), or (path, None) for a plain path
+    """
+    position = path.find(MEMBER_SEPARATOR)
+    while position >= 0:
+        # File names may contain "!", so the prefix has to be an archive that exists
+        archive = path[:position]
+        if is_archive(archive) and os.path.isfile(archive):
+            return archive, path[position + 1:]
+        position = path.find(MEMBER_SEPARATOR, position + 1)
+    return path, None
+
+
+def iter_archive(archive_path: str, names: Optional[Iterable[str]] = None) -> Iterator[ArchiveMember]:
+    """
+    Yield the regular files of an archive in archive order.
+
+    Args:
+        archive_path: .zip or (compressed) .tar archive
+        names: Only yield these member names (all files if None)
+
+    Yields:
+        ArchiveMember for each file; its data must not be kept past the next step
+    """
+    wanted = set(names) if names is not None else None
+    if archive_path.lower().endswith(ZIP_SUFFIXES):
+        yield from _iter_zip(archive_path, wanted)
+    else:
+        yield from _iter_tar(archive_path, wanted)
+
+
+def list_members(archive_path: str) -> List[str]:
+    """
+    Names of the regular files in an archive, in archive order.
+
+    ZIP archives only read the central directory; TAR archives are streamed
+    through their headers, skipping member data.
+    """
+    if archive_path.lower().endswith(ZIP_SUFFIXES):
+        with zipfile.ZipFile(archive_path) as zf:
+            return [info.filename for info in zf.infolist() if not info.is_dir()]
+    with _open_tar(archive_path) as tf:
+        return [member.name for member in tf if member.isfile()]
+
+
+def read_member(archive_path: str, name: str) -> bytes:
+    """
+    Contents of a single member.
+
+    Random access for ZIP; TAR archives are streamed up to the member, so
+    use iter_archive() when reading several members of one TAR.
+    """
+    for member in iter_archive(archive_path, [name]):
+        if member.error is not None:
+            raise ValueError(member.error)
+        return bytes(member.data)
+    raise KeyError(f"{name} not found in {archive_path}")
+
+
+def _iter_zip(archive_path: str, wanted: Optional[set]) -> Iterator[ArchiveMember]:
+    with open(archive_path, "rb") as f, zipfile.ZipFile(f) as zf:
+        size = os.fstat(f.fileno()).st_size
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        try:
+            for info in zf.infolist():
+                if info.is_dir() or (wanted is not None and info.filename not in wanted):
+                    continue
+                modified = datetime(*info.date_time) if info.date_time[0] >= 1980 else None
+                if info.flag_bits & 0x1:
+                    yield ArchiveMember(archive_path, info.filename, info.file_size, modified, b"",
+                                        error=f"{info.filename} is encrypted")
+                    continue
+                start = _stored_data_offset(mm, info)
+                if start is None:
+                    # One corrupt member must not end the walk over the others
+                    try:
+                        data = zf.read(info)
+                    except (RuntimeError, zipfile.BadZipFile, zlib.error, EOFError) as e:
+                        yield ArchiveMember(archive_path, info.filename, info.file_size, modified, b"",
+                                            error=f"Could not read {info.filename}: {e}")
+                        continue
+                    yield ArchiveMember(archive_path, info.filename, info.file_size, modified, data)
+                    continue
+                view = memoryview(mm)[start:start + info.file_size]
+                try:
+                    yield ArchiveMember(archive_path, info.filename, info.file_size, modified, view, zero_copy=True)
+                finally:
+                    view.release()
+        finally:
+            if mm is not None:
+                mm.close()
+
+
+def _stored_data_offset(mm, info: zipfile.ZipInfo) -> Optional[int]:
+    """Offset of an uncompressed, unencrypted member's data in the archive, else None."""
+    if mm is None or info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        return None
+    header = info.header_offset
+    if bytes(mm[header:header + 4]) != b"PK\x03\x04":
+        return None
+    name_length = int.from_bytes(mm[header + 26:header + 28], "little")
+    extra_length = int.from_bytes(mm[header + 28:header + 30], "little")
+    start = header + ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+    return start if start + info.file_size <= len(mm) else None
+
+
+@contextmanager
+def _open_tar(archive_path: str) -> Iterator[tarfile.TarFile]:
+    """Open a TAR archive as a forward-only stream ("r|*", or zstd via zstandard)."""
+    if not archive_path.lower().endswith(ZSTD_SUFFIXES):
+        with tarfile.open(archive_path, mode="r|*") as tf:
+            yield tf
+        return
+    if zstandard is None:
+        raise ImportError("zstandard is required for .tar.zst archives")
+    # tarfile does not close a fileobj it was handed, so the reader is closed here
+    with open(archive_path, "rb") as raw, zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+        with tarfile.open(fileobj=stream, mode="r|") as tf:
+            yield tf
+
+
+def _iter_tar(archive_path: str, wanted: Optional[set]) -> Iterator[ArchiveMember]:
+    with _open_tar(archive_path) as tf:
+        for member in tf:
+            if not member.isfile() or (wanted is not None and member.name not in wanted):
+                continue
+            data = tf.extractfile(member).read()
+            modified = datetime.fromtimestamp(member.mtime) if member.mtime else None
+            yield ArchiveMember(archive_path, member.name, member.size, modified, data)
+            if wanted is not None:
+                wanted.discard(member.name)
+                if not wanted:
+                    return
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Audio Reader - Tags and stream properties from audio file headers.
+
+This module provides read_audio_metadata(), which reads duration, sample
+rate, channels, bit depth, bitrate and tags from the headers of MP3, FLAC,
+Ogg (Vorbis, Opus, FLAC), WAV, AAC and M4A files without decoding audio:
+
+- MP3: ID3v2 text frames, then the first frame header and its Xing/Info or
+  VBRI frame count; CBR files without one are timed from the stream size.
+  An ID3v1 tag at the end fills in missing tags.
+- FLAC: STREAMINFO (total samples / sample rate) and VORBIS_COMMENT blocks.
+- Ogg: the identification and comment packets from the first pages, and the
+  granule position of the last page for the sample count.
+- WAV: RIFF `fmt `, LIST/INFO and `id3 ` chunks; duration from the `data`
+  chunk size, whose payload is skipped.
+- M4A: the `moov` box, through mp4_reader.
+
+Embedded pictures (ID3 APIC, FLAC PICTURE, METADATA_BLOCK_PICTURE comments)
+are skipped by their length and only reported by size.
+"""
+
+import struct
+from contextlib import nullcontext
+from typing import Dict, Any, Optional, Union, BinaryIO
+
+from .mp4_reader import read_mp4_metadata
+
+
+# Largest tag field read into memory; longer fields are skipped
+MAX_FIELD_SIZE = 1024 * 1024
+
+# Bytes searched for the first MPEG audio frame after the ID3v2 tag
+FRAME_SEARCH_BYTES = 64 * 1024
+
+# An Ogg page is at most 27 + 255 + 255 * 255 bytes
+MAX_OGG_PAGE_SIZE = 65307
+OGG_TAIL_BYTES = 8192
+
+# Common names for ID3v2 text frames (v2.3/2.4 and v2.2 ids)
+ID3_FRAMES = {
+    "TIT2": "title", "TPE1": "artist", "TALB": "album", "TPE2": "album_artist",
+    "TCON": "genre", "TDRC": "date", "TYER": "date", "TRCK": "track", "TPOS": "disc",
+    "TCOM": "composer", "TSSE": "encoder", "TENC": "encoded_by", "TCOP": "copyright",
+    "TT2": "title", "TP1": "artist", "TAL": "album", "TP2": "album_artist",
+    "TCO": "genre", "TYE": "date", "TRK": "track", "TPA": "disc", "TCM": "composer", "TSS": "encoder",
+}
+ID3_PICTURES = ("APIC", "PIC")
+
+# Common names for Vorbis comment fields
+VORBIS_FIELDS = {
+    "TITLE": "title", "ARTIST": "artist", "ALBUM": "album", "ALBUMARTIST": "album_artist",
+    "ALBUM ARTIST": "album_artist", "GENRE": "genre", "DATE": "date", "TRACKNUMBER": "track",
+    "DISCNUMBER": "disc", "COMPOSER": "composer", "ENCODER": "encoder", "COPYRIGHT": "copyright",
+}
+VORBIS_PICTURES = ("METADATA_BLOCK_PICTURE", "COVERART")
+
+# Common names for RIFF INFO chunks
+RIFF_INFO = {
+    b"INAM": "title", b"IART": "artist", b"IPRD": "album", b"IGNR": "genre", b"ICRD": "date",
+    b"ITRK": "track", b"IPRT": "track", b"ICMT": "comment", b"ISFT": "encoder", b"ICOP": "copyright",
+}
+
+WAVE_FORMATS = {1: "pcm", 2: "adpcm", 3: "float", 6: "alaw", 7: "mulaw", 0x55: "mp3", 0xFFFE: "extensible"}
+
+# MPEG audio: bitrates (kbps) by (version is MPEG-1, layer) and sample rates by version
+MPEG_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MPEG_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+ADTS_SAMPLE_RATES = (96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350)
+
+
+def read_audio_metadata(source: Union[str, BinaryIO]) -> Dict[str, Any]:
+    """
+    Read stream properties and tags from an audio file's headers.
+
+    Args:
+        source: Path to the file, or a seekable binary stream over it
+
+    Returns:
+        Dictionary with format, codec, duration, sampleRate, channels,
+        bitsPerSample, bitrate, tags (title, artist, album, album_artist,
+        genre, date, track, ... plus any other fields under their own
+        names), pictures (size of each embedded image) and error
+    """
+    result = {
+        "format": None,
+        "codec": None,
+        "duration": None,
+        "sampleRate": None,
+        "channels": None,
+        "bitsPerSample": None,
+        "bitrate": None,
+        "tags": {},
+        "pictures": [],
+        "error": None
+    }
+
+    with open(source, "rb") if isinstance(source, str) else nullcontext(source) as f:
+        file_size = f.seek(0, 2)
+        f.seek(0)
+        header = f.read(12)
+        try:
+            if header[4:8] == b"ftyp":
+                _read_mp4(f, result)
+            elif header[:4] == b"fLaC":
+                _read_flac(f, 4, file_size, result)
+            elif header[:4] == b"OggS":
+                _read_ogg(f, file_size, result)
+            elif header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+                _read_wav(f, file_size, result)
+            else:
+                start = _read_id3v2(f, result) if header[:3] == b"ID3" else 0
+                f.seek(start)
+                if f.read(4) == b"fLaC":
+                    # FLAC with a (non-standard) leading ID3v2 tag
+                    _read_flac(f, start + 4, file_size, result)
+                else:
+                    _read_mpeg(f, start, file_size, result)
+        except (struct.error, IndexError, ValueError, UnicodeDecodeError) as e:
+            result["error"] = f"Malformed header: {e}"
+
+    if result["error"] is None and result["format"] is None:
+        result["error"] = "Unrecognized audio format"
+    if result["duration"] and result["bitrate"] is None:
+        result["bitrate"] = int(file_size * 8 / result["duration"])
+    return result
+
+
+def _read_mp4(f, result: Dict[str, Any]) -> None:
+    """M4A/MP4 audio through mp4_reader."""
+    info = read_mp4_metadata(f)
+    result["format"] = "mp4"
+    if info["error"]:
+        result["error"] = info["error"]
+        return
+    result.update({
+        "codec": info["audioCodec"],
+        "duration": info["duration"],
+        "sampleRate": info["audioSampleRate"],
+        "channels": info["audioChannels"],
+        "bitrate": info["bitrate"]
+    })
+    for name, value in info["tags"].items():
+        if isinstance(value, str) and value.startswith("<") and value.endswith(" bytes>"):
+            result["pictures"].append({"source": name, "size": int(value.rsplit(", ", 1)[1].split()[0])})
+        else:
+            result["tags"].setdefault(name, value)
+
+
+def _read_flac(f, offset: int, file_size: int, result: Dict[str, Any]) -> None:
+    """FLAC metadata blocks from an offset just past "fLaC"; audio frames follow the last block."""
+    result["format"] = result["codec"] = "flac"
+    total_samples = None
+    last = False
+    while not last and offset + 4 <= file_size:
+        f.seek(offset)
+        block_header = f.read(4)
+        if len(block_header) < 4:
+            break
+        last = bool(block_header[0] & 0x80)
+        block_type = block_header[0] & 0x7F
+        length = int.from_bytes(block_header[1:4], "big")
+        offset += 4 + length
+        if block_type == 0:
+            total_samples = _flac_streaminfo(f.read(34), result)
+        elif block_type == 4 and length <= MAX_FIELD_SIZE:
+            _vorbis_comment(_Reader(f, length), result)
+        elif block_type == 6:
+            result["pictures"].append({"source": "PICTURE", "size": length})
+    if total_samples and result["sampleRate"]:
+        result["duration"] = round(total_samples / result["sampleRate"], 3)
+        result["bitrate"] = int(max(file_size - offset, 0) * 8 / result["duration"])
+
+
+def _flac_streaminfo(data: bytes, result: Dict[str, Any]) -> Optional[int]:
+    """Sample rate, channels and bit depth from STREAMINFO; the total sample count."""
+    if len(data) < 18:
+        raise ValueError("Truncated STREAMINFO")
+    packed = int.from_bytes(data[10:18], "big")
+    result["sampleRate"] = packed >> 44
+    result["channels"] = ((packed >> 41) & 0x07) + 1
+    result["bitsPerSample"] = ((packed >> 36) & 0x1F) + 1
+    return packed & 0xFFFFFFFFF or None
+
+
+def _read_ogg(f, file_size: int, result: Dict[str, Any]) -> None:
+    """Codec from the identification packet, tags from the comment packet, samples from the last page."""
+    result["format"] = "ogg"
+    stream = _OggStream(f, 0)
+    identification = stream.read(stream.page_remaining)
+    serial = stream.serial
+    pre_skip = 0
+    if identification.startswith(b"\x01vorbis"):
+        channels, rate, _, nominal = struct.unpack_from("<BIiI", identification, 11)
+        result.update({"codec": "vorbis", "channels": channels, "sampleRate": rate})
+        if 0 < nominal < 0x7FFFFFFF:
+            result["bitrate"] = nominal
+        comment_magic = b"\x03vorbis"
+    elif identification.startswith(b"OpusHead"):
+        channels, pre_skip, rate = struct.unpack_from("<BHI", identification, 9)
+        # Opus always decodes at 48 kHz; the header rate is only the input's
+        result.update({"codec": "opus", "channels": channels, "sampleRate": 48000})
+        if rate:
+            result["tags"]["input_sample_rate"] = rate
+        comment_magic = b"OpusTags"
+    elif identification.startswith(b"\x7fFLAC"):
+        # Ogg FLAC mapping: 9-byte header, "fLaC", then a STREAMINFO block
+        _flac_streaminfo(identification[17:51], result)
+        result["codec"] = "flac"
+        comment_magic = None
+    else:
+        result["codec"] = identification[:8].strip(b"\x00\x01\x7f").decode("latin1") or None
+        return
+
+    stream.next_page()
+    if comment_magic is None:
+        stream.skip(4)  # FLAC metadata block header before the VORBIS_COMMENT body
+        _vorbis_comment(stream, result)
+    elif stream.read(len(comment_magic)) == comment_magic:
+        _vorbis_comment(stream, result)
+
+    granule = _last_granule(f, file_size, serial)
+    if granule and result["sampleRate"]:
+        samples = granule - pre_skip
+        if samples > 0:
+            result["duration"] = round(samples / result["sampleRate"], 3)
+
+
+def _last_granule(f, file_size: int, serial: int) -> Optional[int]:
+    """Granule position of the last page of a logical stream, from the file's tail."""
+    # Last pages are usually a few KB, so try a short tail before the largest possible page
+    for window in (OGG_TAIL_BYTES, MAX_OGG_PAGE_SIZE):
+        start = max(0, file_size - window)
+        f.seek(start)
+        tail = f.read(file_size - start)
+        position = tail.rfind(b"OggS")
+        while position >= 0:
+            if position + 27 <= len(tail) and tail[position + 4] == 0:
+                granule, page_serial = struct.unpack_from("<qI", tail, position + 6)
+                if page_serial == serial and granule >= 0:
+                    return granule
+            position = tail.rfind(b"OggS", 0, position)
+        if start == 0:
+            break
+    return None
+
+
+def _read_wav(f, file_size: int, result: Dict[str, Any]) -> None:
+    """RIFF/WAVE chunks; the data chunk is skipped by its size."""
+    result["format"] = "wav"
+    byte_rate = None
+    data_size = None
+    offset = 12
+    while offset + 8 <= file_size:
+        f.seek(offset)
+        chunk_id, size = struct.unpack("<4sI", f.read(8))
+        start = offset + 8
+        if chunk_id == b"fmt ":
+            fmt = f.read(min(size, 40))
+            tag, channels, rate, byte_rate, _, bits = struct.unpack_from("<HHIIHH", fmt)
+            if tag == 0xFFFE and len(fmt) >= 26:
+                # WAVE_FORMAT_EXTENSIBLE: the real format is the sub-format GUID's first two bytes
+                tag = struct.unpack_from("<H", fmt, 24)[0]
+            result.update({
+                "codec": WAVE_FORMATS.get(tag, f"0x{tag:04x}"),
+                "channels": channels,
+                "sampleRate": rate,
+                "bitsPerSample": bits or None,
+                "bitrate": byte_rate * 8 or None
+            })
+        elif chunk_id == b"data":
+            # Streamed writers leave the size at 0 or 0xFFFFFFFF
+            data_size = size if 0 < size <= file_size - start else file_size - start
+        elif chunk_id == b"LIST" and size <= MAX_FIELD_SIZE and f.read(4) == b"INFO":
+            _riff_info(f.read(size - 4), result["tags"])
+        elif chunk_id in (b"id3 ", b"ID3 "):
+            _read_id3v2(f, result, start)
+        offset = start + size + (size & 1)
+    if byte_rate and data_size:
+        result["duration"] = round(data_size / byte_rate, 3)
+
+
+def _riff_info(data: bytes, tags: Dict[str, Any]) -> None:
+    position = 0
+    while position + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, position)
+        value = data[position + 8:position + 8 + size].split(b"\x00", 1)[0]
+        name = RIFF_INFO.get(chunk_id, chunk_id.decode("latin1").strip())
+        if value:
+            tags.setdefault(name, value.decode("utf-8", "replace").strip())
+        position += 8 + size + (size & 1)
+
+
+def _read_id3v2(f, result: Dict[str, Any], offset: int = 0) -> int:
+    """
+    Text frames of the ID3v2 tag at an offset; pictures and other frames are skipped.
+
+    Returns:
+        Offset just past the tag
+    """
+    f.seek(offset)
+    header = f.read(10)
+    if header[:3] != b"ID3":
+        return offset
+    version, flags = header[3], header[5]
+    tag_end = offset + 10 + _syncsafe(header[6:10]) + (10 if flags & 0x10 else 0)
+    position = offset + 10
+    if flags & 0x40 and version >= 3:
+        f.seek(position)
+        extended = f.read(4)
+        position += _syncsafe(extended) if version == 4 else 4 + int.from_bytes(extended, "big")
+
+    id_length, header_length = (3, 6) if version == 2 else (4, 10)
+    while position + header_length <= tag_end:
+        f.seek(position)
+        frame_header = f.read(header_length)
+        frame_id = frame_header[:id_length]
+        if not frame_id.strip(b"\x00") or not frame_id.isalnum():
+            break  # Padding
+        if version == 2:
+            size = int.from_bytes(frame_header[3:6], "big")
+        elif version == 4:
+            size = _syncsafe(frame_header[4:8])
+        else:
+            size = int.from_bytes(frame_header[4:8], "big")
+        frame_id = frame_id.decode("latin1")
+        position += header_length + size
+        if frame_id in ID3_PICTURES:
+            result["pictures"].append({"source": frame_id, "size": size})
+        elif frame_id[0] == "T" and frame_id != "TXXX" and size <= MAX_FIELD_SIZE:
+            value = _id3_text(f.read(size))
+            if value:
+                result["tags"].setdefault(ID3_FRAMES.get(frame_id, frame_id), value)
+    return tag_end
+
+
+def _id3_text(data: bytes) -> Optional[str]:
+    """First value of an ID3v2 text frame (encoding byte, then the text)."""
+    if not data:
+        return None
+    encoding, text = data[0], data[1:]
+    if encoding == 1:
+        value = text.decode("utf-16", "replace")
+    elif encoding == 2:
+        value = text.decode("utf-16-be", "replace")
+    elif encoding == 3:
+        value = text.decode("utf-8", "replace")
+    else:
+        value = text.decode("latin1")
+    # ID3v2.4 separates multiple values with NUL
+    return value.split("\x00", 1)[0].strip() or None
+
+
+def _syncsafe(data: bytes) -> int:
+    """Integer from 7-bit bytes (ID3v2 sizes)."""
+    value = 0
+    for byte in data:
+        value = (value << 7) | (byte & 0x7F)
+    return value
+
+
+def _read_mpeg(f, start: int, file_size: int, result: Dict[str, Any]) -> None:
+    """First MPEG audio (or ADTS AAC) frame after any ID3v2 tag, plus its Xing/VBRI header."""
+    end = file_size - 128 if _id3v1(f, file_size, result) else file_size
+    f.seek(start)
+    data = f.read(FRAME_SEARCH_BYTES)
+    position = data.find(b"\xff")
+    while 0 <= position <= len(data) - 4:
+        if data[position + 1] & 0xE0 == 0xE0:
+            header = int.from_bytes(data[position:position + 4], "big")
+            if (header >> 17) & 0x03 == 0:
+                # ADTS has a 12-bit sync word and layer 0
+                if data[position + 1] & 0xF6 == 0xF0 and _adts_header(data, position, result):
+                    return
+            elif _mpeg_header(header, data, position, end - start, result):
+                return
+        position = data.find(b"\xff", position + 1)
+
+
+def _mpeg_header(header: int, data: bytes, position: int, stream_size: int, result: Dict[str, Any]) -> bool:
+    """Stream properties from a frame header at data[position]; False if the header is not valid."""
+    version = (header >> 19) & 0x03
+    layer = 4 - ((header >> 17) & 0x03)
+    bitrate_index = (header >> 12) & 0x0F
+    rate_index = (header >> 10) & 0x03
+    if version == 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return False
+    mpeg1 = version == 3
+    sample_rate = MPEG_SAMPLE_RATES[version][rate_index]
+    mono = (header >> 6) & 0x03 == 3
+    samples_per_frame = 384 if layer == 1 else 1152 if mpeg1 or layer == 2 else 576
+    result.update({
+        "format": "mp3" if layer == 3 else f"mp{layer}",
+        "codec": f"MPEG-{'1' if mpeg1 else '2.5' if version == 0 else '2'} Layer {'I' * layer}",
+        "sampleRate": sample_rate,
+        "channels": 1 if mono else 2
+    })
+
+    # Xing/Info sits after the side information, VBRI at a fixed 32 bytes
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    frames = audio_bytes = None
+    xing = position + 4 + side_info
+    vbri = position + 4 + 32
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(data[xing + 4:xing + 8], "big")
+        field = xing + 8
+        if flags & 0x1:
+            frames = int.from_bytes(data[field:field + 4], "big")
+            field += 4
+        if flags & 0x2:
+            audio_bytes = int.from_bytes(data[field:field + 4], "big")
+    elif data[vbri:vbri + 4] == b"VBRI":
+        audio_bytes, frames = struct.unpack_from(">II", data, vbri + 10)
+
+    if frames:
+        result["duration"] = round(frames * samples_per_frame / sample_rate, 3)
+        if audio_bytes:
+            result["bitrate"] = int(audio_bytes * 8 / result["duration"])
+    else:
+        # Constant bitrate: the stream size gives the duration
+        bitrate = MPEG_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+        result["bitrate"] = bitrate
+        result["duration"] = round((stream_size - position) * 8 / bitrate, 3)
+    return True
+
+
+def _adts_header(data: bytes, position: int, result: Dict[str, Any]) -> bool:
+    """Sample rate and channels from an ADTS AAC frame header; False if not valid."""
+    rate_index = (data[position + 2] >> 2) & 0x0F
+    if rate_index >= len(ADTS_SAMPLE_RATES):
+        return False
+    result.update({
+        "format": "aac",
+        "codec": "aac",
+        "sampleRate": ADTS_SAMPLE_RATES[rate_index],
+        "channels": ((data[position + 2] & 0x01) << 2 | data[position + 3] >> 6) or None
+    })
+    return True
+
+
+def _id3v1(f, file_size: int, result: Dict[str, Any]) -> bool:
+    """Fill tags missing from ID3v2 with the 128-byte ID3v1 tag at the end; whether there is one."""
+    if file_size < 128:
+        return False
+    f.seek(file_size - 128)
+    tag = f.read(128)
+    if tag[:3] != b"TAG":
+        return False
+    fields = {"title": tag[3:33], "artist": tag[33:63], "album": tag[63:93], "date": tag[93:97]}
+    for name, value in fields.items():
+        value = value.split(b"\x00", 1)[0].decode("latin1").strip()
+        if value:
+            result["tags"].setdefault(name, value)
+    # ID3v1.1: a zero byte before the last comment byte marks a track number
+    if tag[125] == 0 and tag[126]:
+        result["tags"].setdefault("track", str(tag[126]))
+    return True
+
+
+def _vorbis_comment(reader, result: Dict[str, Any]) -> None:
+    """Vorbis comment fields from a reader; pictures are skipped by length."""
+    vendor_length = int.from_bytes(reader.read(4), "little")
+    vendor = reader.read(vendor_length) if vendor_length <= MAX_FIELD_SIZE else reader.skip(vendor_length)
+    if vendor:
+        result["tags"].setdefault("encoder", vendor.decode("utf-8", "replace"))
+    for _ in range(int.from_bytes(reader.read(4), "little")):
+        length = int.from_bytes(reader.read(4), "little")
+        if length == 0:
+            continue
+        # Read the field name first so that picture fields are never loaded
+        prefix = reader.read(min(length, 32))
+        name, separator, value = prefix.partition(b"=")
+        key = name.decode("utf-8", "replace").upper()
+        if separator and key in VORBIS_PICTURES:
+            reader.skip(length - len(prefix))
+            # base64 text: every 4 characters hold 3 bytes
+            result["pictures"].append({"source": key, "size": (length - len(name) - 1) * 3 // 4})
+            continue
+        if length > MAX_FIELD_SIZE:
+            reader.skip(length - len(prefix))
+            continue
+        field = prefix + reader.read(length - len(prefix))
+        name, _, value = field.partition(b"=")
+        key = name.decode("utf-8", "replace").upper()
+        result["tags"].setdefault(VORBIS_FIELDS.get(key, key.lower()), value.decode("utf-8", "replace"))
+
+
+class _Reader:
+    """Bounded reader over the current position of a file (a FLAC metadata block)."""
+
+    def __init__(self, f, length: int):
+        self.f = f
+        self.remaining = length
+
+    def read(self, size: int) -> bytes:
+        size = min(size, self.remaining)
+        self.remaining -= size
+        return self.f.read(size)
+
+    def skip(self, size: int) -> None:
+        size = min(size, self.remaining)
+        self.remaining -= size
+        self.f.seek(size, 1)
+
+
+class _OggStream:
+    """
+    Packet bytes of one logical Ogg stream, read across page boundaries.
+
+    Page headers are parsed as they are reached; skip() seeks over page
+    payloads without reading them.
+    """
+
+    def __init__(self, f, offset: int):
+        self.f = f
+        self.serial = None
+        self.page_remaining = 0
+        self.next_offset = offset
+        self.next_page()
+
+    def next_page(self) -> bool:
+        """Move to the start of the next page of this stream; False at the end."""
+        while True:
+            self.f.seek(self.next_offset)
+            header = self.f.read(27)
+            if len(header) < 27 or header[:4] != b"OggS":
+                self.page_remaining = 0
+                return False
+            serial = struct.unpack_from("<I", header, 14)[0]
+            segments = self.f.read(header[26])
+            self.page_remaining = sum(segments)
+            self.next_offset += 27 + len(segments) + self.page_remaining
+            if self.serial is None:
+                self.serial = serial
+            if serial == self.serial:
+                return True
+
+    def read(self, size: int) -> bytes:
+        chunks = []
+        while size > 0:
+            if self.page_remaining == 0 and not self.next_page():
+                break
+            chunk = self.f.read(min(size, self.page_remaining))
+            self.page_remaining -= len(chunk)
+            size -= len(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def skip(self, size: int) -> None:
+        while size > 0:
+            if self.page_remaining == 0 and not self.next_page():
+                return
+            step = min(size, self.page_remaining)
+            self.f.seek(step, 1)
+            self.page_remaining -= step
+            size -= step
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Buffer IO - File-like access to in-memory buffers without copying.
+
+This module provides the BufferReader class, a read-only, seekable binary
+stream over any buffer-protocol object (bytes, bytearray, mmap or a
+memoryview slice of one), and buffer_find(), a find() that also works on
+memoryviews. Together they let code written against open(path, 'rb') and
+mmap inspect an object that only exists in memory, such as a region carved
+out of a disk image.
+"""
+
+import io
+import re
+from typing import Optional
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only seekable stream over a buffer.
+
+    read() returns bytes copied from the requested range only; the
+    underlying buffer is never copied as a whole. Closing the reader
+    releases its view, so the buffer (e.g. an mmap) can be closed afterwards.
+    """
+
+    def __init__(self, buffer):
+        """
+        Initialize the reader.
+
+        Args:
+            buffer: Any object supporting the buffer protocol
+        """
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        self._check_closed()
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._position + size)
+        data = bytes(self._view[self._position:end]) if end > self._position else b""
+        self._position = max(self._position, end)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read(-1)
+
+    def readinto(self, b) -> int:
+        self._check_closed()
+        target = memoryview(b).cast("B")
+        count = max(0, min(len(target), len(self._view) - self._position))
+        target[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check_closed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        self._check_closed()
+        return self._position
+
+    def getbuffer(self) -> memoryview:
+        """
+        The whole underlying buffer as a new memoryview.
+
+        Like BytesIO.getbuffer(), the caller may release the returned view
+        without affecting the reader.
+        """
+        self._check_closed()
+        return memoryview(self._view)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+    def _check_closed(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed buffer")
+
+
+def buffer_find(buffer, sub: bytes, start: int = 0, end: Optional[int] = None) -> int:
+    """
+    Lowest index of `sub` in buffer[start:end], or -1 (like bytes.find).
+
+    bytes and mmap objects use their own find(); other buffers (memoryview)
+    are searched with a compiled literal pattern, which re accepts without
+    copying.
+    """
+    if hasattr(buffer, "find"):
+        return buffer.find(sub, start) if end is None else buffer.find(sub, start, end)
+    match = re.compile(re.escape(sub)).search(buffer, start, len(buffer) if end is None else end)
+    return match.start() if match else -1
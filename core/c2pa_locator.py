@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+C2PA Locator - Content credential (JUMBF manifest store) detection.
+
+This module provides the C2PALocator class for finding C2PA manifest stores
+from the structure already enumerated by the inspector (JPEG APP11 segments,
+PNG caBX chunks, ISOBMFF uuid boxes), and the C2PAManifestStore class, which
+reports the JUMBF box layout from headers only and decodes the CBOR claim and
+assertions on request. Signatures are not verified.
+"""
+
+import json
+import struct
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# ISOBMFF uuid box carrying a C2PA manifest store
+C2PA_ISOBMFF_UUID = bytes.fromhex("d8fec3d61b0e483c92975828877ec481")
+
+# JPEG APP11 JUMBF segments start with the "JP" common identifier
+JPEG_JUMBF_CI = b"JP"
+
+JUMBF_SUPERBOX = b"jumb"
+JUMBF_DESCRIPTION = b"jumd"
+MAX_BOX_DEPTH = 8
+
+# Digital source types that mark generative AI output
+AI_SOURCE_TYPES = ("trainedAlgorithmicMedia", "compositeWithTrainedAlgorithmicMedia")
+
+
+class C2PAManifestStore:
+    """
+    A located C2PA manifest store.
+
+    The box layout is read from JUMBF headers on first access; CBOR content is
+    only decoded when decode() is called.
+    """
+
+    def __init__(self, source: str, offset: int, data: bytes):
+        """
+        Initialize the manifest store.
+
+        Args:
+            source: Where the store was found (e.g. 'APP11:JUMBF', 'caBX')
+            offset: File offset of the first segment/chunk/box holding the store
+            data: The reassembled JUMBF superbox bytes
+        """
+        self.source = source
+        self.offset = offset
+        self.data = data
+        self._boxes: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def size(self) -> int:
+        """Size of the manifest store in bytes."""
+        return len(self.data)
+
+    @property
+    def boxes(self) -> List[Dict[str, Any]]:
+        """Parsed JUMBF box tree (headers and description labels only)."""
+        if self._boxes is None:
+            self._boxes = _walk_boxes(self.data, 0, len(self.data), 0)
+        return self._boxes
+
+    def layout(self) -> List[Dict[str, Any]]:
+        """Return a JSON-serializable view of the box tree."""
+        def strip(box):
+            entry = {"type": box["type"], "size": box["size"], "offset": box["offset"]}
+            if box.get("label"):
+                entry["label"] = box["label"]
+            if box.get("children"):
+                entry["children"] = [strip(child) for child in box["children"]]
+            return entry
+        return [strip(box) for box in self.boxes]
+
+    def manifest_labels(self) -> List[str]:
+        """Labels of the manifests in the store; the last one is the active manifest."""
+        store = self._store_box()
+        if store is None:
+            return []
+        return [child.get("label") for child in store.get("children", []) if child["type"] == "jumb"]
+
+    def summary(self) -> Dict[str, Any]:
+        """Size, manifest count and layout without decoding any CBOR."""
+        labels = self.manifest_labels()
+        return {
+            "size": self.size,
+            "manifestCount": len(labels),
+            "activeManifest": labels[-1] if labels else None,
+            "layout": self.layout()
+        }
+
+    def decode(self) -> List[Dict[str, Any]]:
+        """
+        Decode the claim and assertion labels of every manifest.
+
+        Returns:
+            One dictionary per manifest with generator, assertions, actions
+            and ingredients
+        """
+        store = self._store_box()
+        if store is None:
+            return []
+
+        manifests = []
+        for manifest in store.get("children", []):
+            if manifest["type"] != "jumb":
+                continue
+            entry = {
+                "label": manifest.get("label"),
+                "assertions": [],
+                "actions": [],
+                "ingredients": [],
+                "signaturePresent": False
+            }
+            for child in manifest.get("children", []):
+                label = child.get("label") or ""
+                if label.startswith("c2pa.claim"):
+                    entry.update(self._decode_claim(child))
+                elif label == "c2pa.signature":
+                    entry["signaturePresent"] = True
+                elif label == "c2pa.assertions":
+                    self._decode_assertions(child, entry)
+            manifests.append(entry)
+        return manifests
+
+    def _store_box(self) -> Optional[Dict[str, Any]]:
+        """The top-level superbox labelled 'c2pa'."""
+        for box in self.boxes:
+            if box["type"] == "jumb" and box.get("label") == "c2pa":
+                return box
+        return None
+
+    def _content(self, superbox: Dict[str, Any], box_type: str = "cbor") -> Optional[Any]:
+        """Decode the first content box of the given type inside a superbox."""
+        for child in superbox.get("children", []):
+            if child["type"] == box_type:
+                payload = self.data[child["payloadStart"]:child["end"]]
+                try:
+                    if box_type == "cbor":
+                        return _decode_cbor(payload, 0)[0]
+                    if box_type == "json":
+                        return json.loads(payload.decode("utf-8"))
+                except Exception:
+                    return None
+        return None
+
+    def _decode_claim(self, claim_box: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the generator and identifiers from a claim."""
+        claim = self._content(claim_box)
+        if not isinstance(claim, dict):
+            return {}
+        generator = claim.get("claim_generator")
+        info = claim.get("claim_generator_info")
+        if isinstance(info, dict):
+            info = [info]
+        if not generator and isinstance(info, list) and info and isinstance(info[0], dict):
+            generator = " ".join(str(info[0].get(k)) for k in ("name", "version") if info[0].get(k))
+        return {
+            "claimGenerator": generator,
+            "claimGeneratorInfo": _printable(info),
+            "title": claim.get("dc:title"),
+            "format": claim.get("dc:format"),
+            "instanceID": claim.get("instanceID")
+        }
+
+    def _decode_assertions(self, store_box: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """Record assertion labels, decoding only actions and ingredients."""
+        for assertion in store_box.get("children", []):
+            if assertion["type"] != "jumb":
+                continue
+            label = assertion.get("label") or ""
+            entry["assertions"].append(label)
+            if label.startswith("c2pa.actions"):
+                content = self._content(assertion)
+                for action in (content or {}).get("actions", []) if isinstance(content, dict) else []:
+                    if isinstance(action, dict):
+                        entry["actions"].append(_printable({
+                            "action": action.get("action"),
+                            "softwareAgent": action.get("softwareAgent"),
+                            "digitalSourceType": action.get("digitalSourceType"),
+                            "when": action.get("when")
+                        }))
+            elif label.startswith("c2pa.ingredient"):
+                content = self._content(assertion)
+                if isinstance(content, dict):
+                    entry["ingredients"].append(_printable({
+                        "title": content.get("dc:title"),
+                        "format": content.get("dc:format"),
+                        "relationship": content.get("relationship"),
+                        "instanceID": content.get("instanceID")
+                    }))
+
+
+class C2PALocator:
+    """
+    Locates C2PA manifest stores from an already-enumerated file structure.
+
+    has_candidates() only inspects the phase 3 structure, so files without
+    content credentials are rejected without touching the file.
+    """
+
+    def has_candidates(self, structure: Dict[str, Any]) -> bool:
+        """Check the structure for boxes that can hold a manifest store."""
+        for segment in structure.get("segments", []):
+            if segment.get("marker") == "0xFFEB":
+                return True
+        for chunk in structure.get("chunks", []):
+            if chunk.get("type") == "caBX":
+                return True
+        for box in structure.get("boxes", []):
+            if box.get("type") == "c2pa" or (box.get("type") == "uuid" and box.get("uuid") == C2PA_ISOBMFF_UUID.hex()):
+                return True
+        return False
+
+    def locate(self, view: memoryview, structure: Dict[str, Any]) -> List[C2PAManifestStore]:
+        """
+        Locate manifest stores in a file buffer.
+
+        Args:
+            view: Buffer (typically a memoryview over an mmap) of the whole file
+            structure: Phase 3 structure with 'segments', 'chunks' or 'boxes'
+
+        Returns:
+            List of C2PAManifestStore objects
+        """
+        if "segments" in structure:
+            return self._locate_jpeg(view, structure["segments"])
+        if "chunks" in structure:
+            return self._locate_png(view, structure["chunks"])
+        if "boxes" in structure:
+            return self._locate_isobmff(view, structure["boxes"])
+        return []
+
+    def _locate_jpeg(self, view: memoryview, segments: List[Dict]) -> List[C2PAManifestStore]:
+        """Reassemble APP11 JUMBF packets grouped by box instance number."""
+        instances: Dict[int, Dict[str, Any]] = {}
+        for segment in segments:
+            if segment.get("marker") != "0xFFEB":
+                continue
+            start = segment["offset"] + 4
+            data = view[start:start + segment["size"]]
+            # CI (2) + En box instance (2) + Z packet sequence (4), then the JUMBF box
+            if len(data) < 16 or data[:2] != JPEG_JUMBF_CI:
+                continue
+            instance = int.from_bytes(data[2:4], "big")
+            sequence = int.from_bytes(data[4:8], "big")
+            entry = instances.setdefault(instance, {"offset": segment["offset"], "parts": {}})
+            entry["parts"][sequence] = data[8:]
+
+        stores = []
+        for entry in instances.values():
+            parts = [entry["parts"][z] for z in sorted(entry["parts"])]
+            first = parts[0]
+            # Continuation packets repeat the LBox/TBox (and XLBox) header of the first
+            header_size = 16 if int.from_bytes(first[:4], "big") == 1 else 8
+            data = bytes(first) + b"".join(bytes(part[header_size:]) for part in parts[1:])
+            if data[4:8] == JUMBF_SUPERBOX:
+                stores.append(C2PAManifestStore("APP11:JUMBF", entry["offset"], data))
+        return stores
+
+    def _locate_png(self, view: memoryview, chunks: List[Dict]) -> List[C2PAManifestStore]:
+        """The caBX chunk holds the JUMBF superbox directly."""
+        stores = []
+        for chunk in chunks:
+            if chunk.get("type") == "caBX":
+                start = chunk["offset"] + 8
+                stores.append(C2PAManifestStore("caBX", chunk["offset"], bytes(view[start:start + chunk["size"]])))
+        return stores
+
+    def _locate_isobmff(self, view: memoryview, boxes: List[Dict]) -> List[C2PAManifestStore]:
+        """C2PA uuid box: uuid, version/flags, purpose string, merkle offset, then JUMBF."""
+        stores = []
+        for box in boxes:
+            start = box["offset"] + box.get("headerSize", 8)
+            end = box["offset"] + box["size"]
+            if box.get("type") == "c2pa":
+                stores.append(C2PAManifestStore("c2pa", box["offset"], bytes(view[start:end])))
+            elif box.get("type") == "uuid" and box.get("uuid") == C2PA_ISOBMFF_UUID.hex():
+                pos = start + 16 + 4
+                purpose_end = pos
+                while purpose_end < end and view[purpose_end] != 0:
+                    purpose_end += 1
+                purpose = bytes(view[pos:purpose_end]).decode("ascii", errors="ignore")
+                if purpose != "manifest":
+                    continue
+                pos = purpose_end + 1 + 8  # Skip NUL and merkle offset
+                stores.append(C2PAManifestStore("uuid:c2pa", box["offset"], bytes(view[pos:end])))
+        return stores
+
+
+def _walk_boxes(data: bytes, start: int, end: int, depth: int) -> List[Dict[str, Any]]:
+    """Walk JUMBF/ISOBMFF style boxes, descending into 'jumb' superboxes."""
+    boxes = []
+    pos = start
+    while pos + 8 <= end:
+        size = int.from_bytes(data[pos:pos + 4], "big")
+        box_type = data[pos + 4:pos + 8]
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                break
+            size = int.from_bytes(data[pos + 8:pos + 16], "big")
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            break
+
+        box = {
+            "type": box_type.decode("latin1"),
+            "size": size,
+            "offset": pos,
+            "payloadStart": pos + header,
+            "end": pos + size
+        }
+        if box_type == JUMBF_SUPERBOX and depth < MAX_BOX_DEPTH:
+            children = _walk_boxes(data, pos + header, pos + size, depth + 1)
+            if children and children[0]["type"] == "jumd":
+                box["label"] = children[0].get("label")
+                box["contentType"] = children[0].get("contentType")
+            box["children"] = children
+        elif box_type == JUMBF_DESCRIPTION:
+            box.update(_parse_description(data[pos + header:pos + size]))
+        boxes.append(box)
+        pos += size
+    return boxes
+
+
+def _parse_description(data: bytes) -> Dict[str, Any]:
+    """Parse a jumd box: content type UUID, toggles, optional label."""
+    if len(data) < 17:
+        return {}
+    result = {"contentType": data[:16].hex()}
+    toggles = data[16]
+    if toggles & 0x02:
+        label_end = data.find(b"\x00", 17)
+        if label_end > 0:
+            result["label"] = data[17:label_end].decode("utf-8", errors="replace")
+    return result
+
+
+def _decode_cbor(data: bytes, pos: int) -> Tuple[Any, int]:
+    """Decode one CBOR item (RFC 8949) starting at pos; tags are unwrapped."""
+    initial = data[pos]
+    major, info = initial >> 5, initial & 0x1F
+    pos += 1
+
+    if major == 7:
+        if info == 25:
+            return struct.unpack(">e", data[pos:pos + 2])[0], pos + 2
+        if info == 26:
+            return struct.unpack(">f", data[pos:pos + 4])[0], pos + 4
+        if info == 27:
+            return struct.unpack(">d", data[pos:pos + 8])[0], pos + 8
+        return {20: False, 21: True}.get(info), pos + (1 if info == 24 else 0)
+
+    if info < 24:
+        arg = info
+    elif info in (24, 25, 26, 27):
+        width = 1 << (info - 24)
+        arg = int.from_bytes(data[pos:pos + width], "big")
+        pos += width
+    elif info == 31:
+        arg = None  # Indefinite length
+    else:
+        raise ValueError(f"Invalid CBOR additional info {info}")
+
+    if major == 0:
+        return arg, pos
+    if major == 1:
+        return -1 - arg, pos
+    if major in (2, 3):
+        if arg is None:
+            parts = []
+            while data[pos] != 0xFF:
+                part, pos = _decode_cbor(data, pos)
+                parts.append(part)
+            value = b"".join(parts) if major == 2 else "".join(parts)
+            return value, pos + 1
+        value = bytes(data[pos:pos + arg])
+        return (value if major == 2 else value.decode("utf-8", errors="replace")), pos + arg
+    if major == 4:
+        items = []
+        while (arg is None and data[pos] != 0xFF) or (arg is not None and len(items) < arg):
+            item, pos = _decode_cbor(data, pos)
+            items.append(item)
+        return items, pos + (1 if arg is None else 0)
+    if major == 5:
+        result = {}
+        count = 0
+        while (arg is None and data[pos] != 0xFF) or (arg is not None and count < arg):
+            key, pos = _decode_cbor(data, pos)
+            value, pos = _decode_cbor(data, pos)
+            result[key if isinstance(key, (str, int)) else str(key)] = value
+            count += 1
+        return result, pos + (1 if arg is None else 0)
+    # major == 6: semantic tag, keep the tagged value
+    return _decode_cbor(data, pos)
+
+
+def _printable(value: Any) -> Any:
+    """Make decoded CBOR JSON-serializable (byte strings become hex or a size note)."""
+    if isinstance(value, bytes):
+        return value.hex() if len(value) <= 64 else f"<{len(value)} bytes>"
+    if isinstance(value, dict):
+        return {str(k): _printable(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_printable(v) for v in value]
+    return value
+
+
+def is_ai_generated(manifests: List[Dict[str, Any]]) -> bool:
+    """Whether any decoded action declares a generative-AI digital source type."""
+    for manifest in manifests:
+        for action in manifest.get("actions", []):
+            source_type = action.get("digitalSourceType") or ""
+            if any(source_type.endswith(t) for t in AI_SOURCE_TYPES):
+                return True
+    return False
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Carver - Find and inspect images and archives embedded in arbitrary blobs.
+
+This module provides the FileCarver class for disk images, memory dumps and
+other unstructured data. The blob is memory-mapped and split into segments
+that worker processes scan with mmap.find() for PNG, JPEG, GIF, WebP and ZIP
+signatures; a signature straddling a segment boundary is found by the
+segment it starts in, because each search runs len(signature) - 1 bytes
+past the segment end. Every candidate is validated by walking its structure
+(LayeredInspector's PNG and JPEG walkers, RIFF chunks for WebP, GIF blocks,
+the ZIP end-of-central-directory record) to find where it really ends.
+Validated objects are then inspected in the same workers straight from the
+mapping, so nothing is written to disk.
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+
+from rich.console import Console
+
+from .layered_inspector import LayeredInspector
+
+
+SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"GIF87a", "GIF"),
+    (b"GIF89a", "GIF"),
+    (b"RIFF", "WEBP"),
+    # ZIP archives are located from their end-of-central-directory record;
+    # every member has a local header, so those would only yield duplicates
+    (b"PK\x05\x06", "ZIP"),
+]
+
+WEBP_CHUNKS = (b"VP8 ", b"VP8L", b"VP8X")
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+DEFAULT_MAX_OBJECT_SIZE = 512 * 1024 * 1024
+
+
+class FileCarver:
+    """
+    Signature scan plus structural validation over a memory-mapped blob.
+    """
+
+    def __init__(
+        self,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        max_object_size: int = DEFAULT_MAX_OBJECT_SIZE,
+        max_workers: Optional[int] = None,
+        include_nested: bool = False,
+        inspect: bool = True,
+        inspector_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the FileCarver.
+
+        Args:
+            segment_size: Bytes scanned per worker task
+            max_object_size: Largest object a candidate may be validated as
+            max_workers: Worker processes (defaults to the CPU count)
+            include_nested: Keep objects that lie inside another carved object
+                (e.g. EXIF thumbnails, images stored in a carved ZIP)
+            inspect: Produce a LayeredInspector report for every object
+            inspector_options: Keyword arguments for LayeredInspector
+                (e.g. {'pixel_analysis': True})
+        """
+        self.segment_size = max(segment_size, 1024 * 1024)
+        self.max_object_size = max_object_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.include_nested = include_nested
+        self.inspect = inspect
+        self.inspector_options = dict(inspector_options or {})
+
+    def carve(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Carve every recognizable object out of a file.
+
+        Args:
+            file_path: Blob to scan (disk image, memory dump, ...)
+
+        Returns:
+            List of objects sorted by offset, each with name, offset, length,
+            type and (if inspect is set) the phase 8 report
+        """
+        size = os.path.getsize(file_path)
+        if size == 0:
+            return []
+        segments = [(start, min(start + self.segment_size, size)) for start in range(0, size, self.segment_size)]
+
+        settings = {"max_object_size": self.max_object_size, "inspector_options": self.inspector_options}
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker, initargs=(file_path, settings)) as executor:
+            found = [obj for objects in executor.map(_scan_in_worker, segments) for obj in objects]
+            objects = self._select(found)
+
+            if self.inspect and objects:
+                base = os.path.basename(file_path)
+                for obj in objects:
+                    obj["name"] = f"{base}@{obj['offset']:#x}.{obj['type'].lower()}"
+                reports = executor.map(_inspect_in_worker, [(obj["offset"], obj["length"], obj["name"]) for obj in objects])
+                for obj, report in zip(objects, reports):
+                    obj["report"] = report
+        return objects
+
+    def _select(self, found: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sort, de-duplicate and (unless include_nested) drop objects inside earlier objects."""
+        objects = []
+        seen = set()
+        enclosing_end = -1
+        for obj in sorted(found, key=lambda o: (o["offset"], -o["length"])):
+            if obj["offset"] in seen:
+                continue
+            seen.add(obj["offset"])
+            if not self.include_nested and obj["offset"] < enclosing_end:
+                continue
+            enclosing_end = max(enclosing_end, obj["offset"] + obj["length"])
+            objects.append(obj)
+        return objects
+
+
+def scan_segment(mm, start: int, end: int, inspector: LayeredInspector, max_object_size: int) -> List[Dict[str, Any]]:
+    """
+    Find and validate candidates whose signature starts in [start, end).
+
+    Args:
+        mm: Mapped blob (mmap or bytes)
+        start: Segment start
+        end: Segment end
+        inspector: LayeredInspector whose structure walkers validate PNG/JPEG
+        max_object_size: Largest object considered
+
+    Returns:
+        List of {offset, length, type} for validated objects
+    """
+    objects = []
+    for signature, kind in SIGNATURES:
+        position = mm.find(signature, start, min(end + len(signature) - 1, len(mm)))
+        while position >= 0:
+            obj = _validate(mm, position, kind, inspector, max_object_size)
+            if obj is not None:
+                objects.append(obj)
+            position = mm.find(signature, position + 1, min(end + len(signature) - 1, len(mm)))
+    return objects
+
+
+def _validate(mm, offset: int, kind: str, inspector: LayeredInspector, max_object_size: int) -> Optional[Dict[str, Any]]:
+    """Walk the structure of a candidate; {offset, length, type} if it holds together."""
+    limit = min(len(mm), offset + max_object_size)
+    try:
+        if kind == "ZIP":
+            return _validate_zip(mm, offset)
+        container, _ = inspector._identify_container(bytes(mm[offset:offset + 32]))
+        if container != kind:
+            return None
+        if kind == "PNG":
+            end = _png_end(mm, offset, limit, inspector)
+        elif kind == "JPEG":
+            end = _jpeg_end(mm, offset, limit, inspector)
+        elif kind == "GIF":
+            end = _gif_end(mm, offset, limit)
+        else:
+            end = _webp_end(mm, offset, limit)
+    except (ValueError, IndexError, OSError):
+        return None
+    if end is None:
+        return None
+    return {"offset": offset, "length": end - offset, "type": kind}
+
+
+def _png_end(mm, offset: int, limit: int, inspector: LayeredInspector) -> Optional[int]:
+    """End of a PNG from the phase 3 chunk walk: IHDR first, IEND last, sane chunk types."""
+    view = memoryview(mm)[offset:limit]
+    try:
+        with inspector._in_memory(view):
+            chunks = inspector._parse_png_structure("carved.png")["chunks"]
+    finally:
+        view.release()
+    if not chunks or chunks[0]["type"] != "IHDR" or chunks[-1]["type"] != "IEND":
+        return None
+    if not all(len(chunk["type"]) == 4 and chunk["type"].isalpha() for chunk in chunks):
+        return None
+    return offset + chunks[-1]["offset"] + 12
+
+
+def _jpeg_end(mm, offset: int, limit: int, inspector: LayeredInspector) -> Optional[int]:
+    """End of a JPEG from the phase 3 segment walk (EOI after the last scan)."""
+    view = memoryview(mm)[offset:limit]
+    try:
+        with inspector._in_memory(view):
+            structure = inspector._parse_jpeg_structure("carved.jpg")
+    finally:
+        view.release()
+    # A real image has tables and a frame header before scan data that ends in EOI
+    markers = {segment["marker"] for segment in structure.get("segments", [])}
+    if structure.get("endOffset") is None or "0xFFDB" not in markers:
+        return None
+    return offset + structure["endOffset"]
+
+
+def _gif_end(mm, offset: int, limit: int) -> Optional[int]:
+    """End of a GIF: header, optional global colour table, then blocks up to the trailer."""
+    packed = mm[offset + 10]
+    position = offset + 13
+    if packed & 0x80:
+        position += 3 << ((packed & 0x07) + 1)
+    images = 0
+    while position < limit:
+        block = mm[position]
+        if block == 0x3B:  # Trailer
+            return position + 1 if images else None
+        if block == 0x21:  # Extension: label, then sub-blocks
+            position += 2
+        elif block == 0x2C:  # Image descriptor, optional local colour table, LZW code size
+            descriptor = mm[position + 9]
+            position += 10
+            if descriptor & 0x80:
+                position += 3 << ((descriptor & 0x07) + 1)
+            position += 1
+            images += 1
+        else:
+            return None
+        # Data sub-blocks end with a zero-length block
+        while position < limit:
+            length = mm[position]
+            position += 1 + length
+            if length == 0:
+                break
+    return None
+
+
+def _webp_end(mm, offset: int, limit: int) -> Optional[int]:
+    """End of a WebP from the RIFF size, checked by walking its chunks."""
+    end = offset + 8 + int.from_bytes(mm[offset + 4:offset + 8], "little")
+    if end > limit or bytes(mm[offset + 12:offset + 16]) not in WEBP_CHUNKS:
+        return None
+    position = offset + 12
+    while position + 8 <= end:
+        size = int.from_bytes(mm[position + 4:position + 8], "little")
+        position += 8 + size + (size & 1)
+    return end if position in (end, end + 1) else None
+
+
+def _validate_zip(mm, eocd: int) -> Optional[Dict[str, Any]]:
+    """Locate a ZIP archive from its end-of-central-directory record."""
+    if eocd + 22 > len(mm):
+        return None
+    record = bytes(mm[eocd:eocd + 22])
+    entries = int.from_bytes(record[10:12], "little")
+    directory_size = int.from_bytes(record[12:16], "little")
+    directory_offset = int.from_bytes(record[16:20], "little")
+    comment_length = int.from_bytes(record[20:22], "little")
+    # The central directory sits right before the EOCD; its offset is relative to the archive start
+    start = eocd - directory_size - directory_offset
+    if start < 0 or entries == 0 or eocd + 22 + comment_length > len(mm):
+        return None
+    if bytes(mm[start:start + 4]) != b"PK\x03\x04" or bytes(mm[eocd - directory_size:eocd - directory_size + 4]) != b"PK\x01\x02":
+        return None
+    return {"offset": start, "length": eocd + 22 + comment_length - start, "type": "ZIP"}
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(file_path: str, settings: Dict[str, Any]) -> None:
+    """Map the blob and build one inspector per worker process."""
+    f = open(file_path, "rb")
+    _worker_state.update({
+        "file": f,
+        "mm": mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ),
+        "inspector": LayeredInspector(console=Console(quiet=True), verbose=False, **settings["inspector_options"]),
+        "max_object_size": settings["max_object_size"]
+    })
+
+
+def _scan_in_worker(segment: tuple) -> List[Dict[str, Any]]:
+    state = _worker_state
+    return scan_segment(state["mm"], segment[0], segment[1], state["inspector"], state["max_object_size"])
+
+
+def _inspect_in_worker(task: tuple) -> Dict[str, Any]:
+    """Phase 8 report for one carved object, read directly from the mapping."""
+    offset, length, name = task
+    view = memoryview(_worker_state["mm"])[offset:offset + length]
+    try:
+        return _worker_state["inspector"].inspect_bytes(view, name)["phases"]["8_report"]
+    except Exception as e:
+        return {"error": f"Inspection failed: {e}"}
+    finally:
+        view.release()
@@ -163,6 +163,17 @@ class MetadataDatabase:
                 )
             ''')
             
+            # Perceptual hashes (64-bit, stored as signed SQLite integers)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS perceptual_hashes (
+                    file_id INTEGER PRIMARY KEY,
+                    ahash INTEGER,
+                    dhash INTEGER,
+                    phash INTEGER,
+                    FOREIGN KEY (file_id) REFERENCES files(id) ON DELETE CASCADE
+                )
+            ''')
+            
             # Generic metadata fields (key-value pairs)
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS metadata_fields (
@@ -218,6 +229,8 @@ class MetadataDatabase:
             
             if file_type == 'image':
                 self._insert_image_metadata(cursor, file_id, metadata)
+                if metadata.get('perceptual_hash'):
+                    self._insert_perceptual_hashes(cursor, file_id, metadata['perceptual_hash'])
             elif file_type == 'video':
                 self._insert_video_metadata(cursor, file_id, metadata)
             elif file_type == 'audio':
@@ -261,6 +274,48 @@ class MetadataDatabase:
             metadata.get('format')
         ))
     
+    def _insert_perceptual_hashes(self, cursor, file_id: int, hashes: Dict[str, str]):
+        """Insert perceptual hashes (hex strings) as signed 64-bit integers."""
+        def to_signed(value):
+            if value is None:
+                return None
+            value = int(value, 16)
+            return value - (1 << 64) if value >= (1 << 63) else value
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO perceptual_hashes (file_id, ahash, dhash, phash)
+            VALUES (?, ?, ?, ?)
+        ''', (
+            file_id,
+            to_signed(hashes.get('ahash')),
+            to_signed(hashes.get('dhash')),
+            to_signed(hashes.get('phash'))
+        ))
+    
+    def get_perceptual_hashes(self, kind: str = 'phash') -> Tuple[List[str], List[int]]:
+        """
+        Get all stored hashes of one kind.
+        
+        Args:
+            kind: 'ahash', 'dhash' or 'phash'
+        
+        Returns:
+            Tuple of (file paths, unsigned 64-bit hashes)
+        """
+        if kind not in ('ahash', 'dhash', 'phash'):
+            raise ValueError(f"Unknown hash kind: {kind}")
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT f.file_path, h.{kind}
+                FROM files f
+                JOIN perceptual_hashes h ON f.id = h.file_id
+                WHERE h.{kind} IS NOT NULL
+            ''')
+            rows = cursor.fetchall()
+            return [row[0] for row in rows], [row[1] & 0xFFFFFFFFFFFFFFFF for row in rows]
+    
     def _insert_video_metadata(self, cursor, file_id: int, metadata: Dict[str, Any]):
         """Insert video-specific metadata."""
         cursor.execute('''
@@ -576,6 +631,7 @@ class MetadataDatabase:
             cursor.execute("DELETE FROM audio_metadata")
             cursor.execute("DELETE FROM document_metadata")
             cursor.execute("DELETE FROM metadata_fields")
+            cursor.execute("DELETE FROM perceptual_hashes")
             
             return count
     
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Entropy Profile - Windowed Shannon entropy across a whole file.
+
+This module provides the EntropyProfiler class. The file is memory-mapped and
+cut into half-window blocks; each block gets a byte histogram from a single
+bincount (bytes are tagged with their block number in the high 8 bits of a
+uint16), and overlapping windows are the sums of adjacent block histograms
+taken through a sliding-window view. Entropy comes from a c*log2(c) lookup
+table, so the cost is one pass over the bytes plus a few operations per
+window.
+
+Windows are mapped back onto the phase 3 structure (PNG chunks, JPEG
+segments, ISOBMFF boxes), and runs of high-entropy windows are reported as
+regions attributed to the elements they overlap. High entropy is normal in
+compressed image data, so regions entirely inside such elements are marked
+as expected.
+"""
+
+import mmap
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Elements whose contents are compressed or encoded and therefore near 8 bits/byte
+COMPRESSED_ELEMENTS = {"IDAT", "fdAT", "zTXt", "iCCP", "iTXt", "JPEG scan", "mdat", "idat"}
+
+# Blocks per bincount call; block ids must fit in the high byte of a uint16
+BLOCK_GROUP = 256
+# Bytes mapped into NumPy at a time
+SEGMENT_BLOCKS = 4096
+
+PROFILE_POINTS = 256
+
+
+class EntropyProfiler:
+    """
+    Sliding-window entropy profile of a file, attributed to its structure.
+    """
+
+    def __init__(self, window_size: int = 4096, threshold: float = 7.8, min_region_windows: int = 2):
+        """
+        Initialize the EntropyProfiler.
+
+        Args:
+            window_size: Window length in bytes (even); windows overlap by half
+            threshold: Entropy in bits/byte at or above which a window is high
+            min_region_windows: Shortest run of high windows reported as a region
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for EntropyProfiler")
+        self.window_size = max(2, window_size - window_size % 2)
+        self.step = self.window_size // 2
+        self.threshold = threshold
+        self.min_region_windows = min_region_windows
+        counts = np.arange(self.window_size + 1, dtype=np.float64)
+        # c * log2(c) with 0 * log2(0) = 0
+        self._clogc = np.where(counts > 0, counts * np.log2(np.maximum(counts, 1)), 0.0)
+
+    def profile(self, file_path: str, structure: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Compute the entropy profile of a file.
+
+        Args:
+            file_path: File to profile
+            structure: Phase 3 structure used to attribute regions (optional)
+
+        Returns:
+            Dictionary with windowSize, step, windows, min/mean/max entropy,
+            a downsampled profile, and high-entropy regions
+        """
+        with open(file_path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return self._summarize(np.zeros(0), 0, [])
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self.profile_buffer(mm, structure)
+
+    def profile_buffer(self, buffer, structure: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Compute the entropy profile of an in-memory object (bytes, mmap, memoryview).
+
+        Args:
+            buffer: Object contents
+            structure: Phase 3 structure used to attribute regions (optional)
+
+        Returns:
+            Same dictionary as profile()
+        """
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        try:
+            entropy = self._window_entropy(data) if len(data) else np.zeros(0)
+            size = len(data)
+        finally:
+            del data
+        return self._summarize(entropy, size, self._elements(structure or {}, size))
+
+    def _window_entropy(self, data: "np.ndarray") -> "np.ndarray":
+        """Entropy of every window starting at a multiple of the step."""
+        if len(data) <= self.window_size:
+            counts = np.bincount(data, minlength=256)
+            return self._entropy(counts[None, :], len(data))
+
+        blocks = len(data) // self.step
+        entropies = []
+        carry = None
+        for start in range(0, blocks, SEGMENT_BLOCKS):
+            count = min(SEGMENT_BLOCKS, blocks - start)
+            histograms = self._block_histograms(data[start * self.step:(start + count) * self.step], count)
+            if carry is not None:
+                histograms = np.concatenate((carry, histograms))
+            # Window i covers blocks i and i+1
+            windows = np.lib.stride_tricks.sliding_window_view(histograms, 2, axis=0).sum(axis=-1)
+            entropies.append(self._entropy(windows, self.window_size))
+            carry = histograms[-1:]
+
+        # Last window ends at the last byte when the file is not a whole number of steps
+        if len(data) % self.step:
+            tail = np.bincount(data[-self.window_size:], minlength=256)
+            entropies.append(self._entropy(tail[None, :], self.window_size))
+        return np.concatenate(entropies)
+
+    def _block_histograms(self, data: "np.ndarray", count: int) -> "np.ndarray":
+        """(count, 256) byte histograms of consecutive step-sized blocks."""
+        blocks = data.reshape(count, self.step)
+        histograms = np.empty((count, 256), dtype=np.int32)
+        tags = np.arange(BLOCK_GROUP, dtype=np.uint16) << 8
+        for start in range(0, count, BLOCK_GROUP):
+            group = blocks[start:start + BLOCK_GROUP]
+            keys = tags[:len(group), None] | group
+            histograms[start:start + len(group)] = np.bincount(keys.ravel(), minlength=len(group) * 256).reshape(-1, 256)
+        return histograms
+
+    def _entropy(self, counts: "np.ndarray", total: int) -> "np.ndarray":
+        """Shannon entropy (bits/byte) of each histogram row: log2(n) - sum(c log2 c) / n."""
+        return np.log2(total) - self._clogc[counts].sum(axis=1) / total
+
+    def _window_start(self, index: int, windows: int, file_size: int) -> int:
+        """Byte offset where window `index` starts."""
+        if index == windows - 1 and file_size > self.window_size and file_size % self.step:
+            return file_size - self.window_size
+        return index * self.step
+
+    def _elements(self, structure: Dict[str, Any], file_size: int) -> List[Tuple[int, int, str]]:
+        """(start, end, label) of every structural element, sorted by start."""
+        elements = []
+        for chunk in structure.get("chunks", []):
+            elements.append((chunk["offset"], chunk["offset"] + chunk["size"] + 12, chunk["type"]))
+        segments = structure.get("segments")
+        if segments is not None:
+            end = 2
+            for segment in segments:
+                end = segment["offset"] + segment["size"] + 4
+                elements.append((segment["offset"], end, segment["marker"]))
+            # Scan data runs from the SOS marker after the last segment through EOI
+            if structure.get("pixelDataBytes"):
+                elements.append((end, end + structure["pixelDataBytes"], "JPEG scan"))
+        for box in structure.get("boxes", []):
+            elements.append((box["offset"], box["offset"] + box["size"], box["type"]))
+        return sorted(elements)
+
+    def _summarize(self, entropy: "np.ndarray", file_size: int, elements: List[Tuple[int, int, str]]) -> Dict[str, Any]:
+        """Statistics, a max-pooled profile and high-entropy regions."""
+        result = {
+            "windowSize": self.window_size,
+            "step": self.step,
+            "threshold": self.threshold,
+            "windows": int(entropy.size),
+            "min": None,
+            "mean": None,
+            "max": None,
+            "profile": [],
+            "regions": [],
+            "unexpectedRegions": 0
+        }
+        if entropy.size == 0:
+            return result
+
+        # Max-pooling keeps short spikes visible in the downsampled profile
+        buckets = np.array_split(entropy, min(PROFILE_POINTS, entropy.size))
+        result.update({
+            "min": round(float(entropy.min()), 4),
+            "mean": round(float(entropy.mean()), 4),
+            "max": round(float(entropy.max()), 4),
+            "profile": [round(float(bucket.max()), 3) for bucket in buckets]
+        })
+
+        starts = np.array([element[0] for element in elements], dtype=np.int64)
+        ends = np.array([element[1] for element in elements], dtype=np.int64)
+        compressed = np.array([element[2] in COMPRESSED_ELEMENTS for element in elements], dtype=bool)
+
+        # A high window is expected when its centre lies inside a compressed element
+        centres = np.arange(entropy.size, dtype=np.int64) * self.step
+        centres[-1] = self._window_start(entropy.size - 1, entropy.size, file_size)
+        centres += min(self.window_size, file_size) // 2
+        owner = np.searchsorted(starts, centres, side="right") - 1
+        if elements:
+            owner = np.maximum(owner, 0)
+            window_expected = (centres >= starts[owner]) & (centres < ends[owner]) & compressed[owner]
+        else:
+            window_expected = np.zeros(entropy.size, dtype=bool)
+
+        # Runs of high windows, split where they cross between expected and unexpected
+        labels = np.where(entropy >= self.threshold, 1 + window_expected, 0)
+        bounds = np.flatnonzero(np.diff(np.concatenate(([0], labels, [0]))))
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            if labels[first] == 0 or last - first < self.min_region_windows:
+                continue
+            start = self._window_start(int(first), entropy.size, file_size)
+            end = min(self._window_start(int(last) - 1, entropy.size, file_size) + self.window_size, file_size)
+            # Elements overlapping [start, end)
+            hit = np.flatnonzero((starts < end) & (ends > start))
+
+            result["regions"].append({
+                "start": start,
+                "end": end,
+                "length": end - start,
+                "windows": int(last - first),
+                "meanEntropy": round(float(entropy[first:last].mean()), 4),
+                "elements": sorted({elements[i][2] for i in hit}) or ["unmapped"],
+                "expected": bool(labels[first] == 2)
+            })
+        result["unexpectedRegions"] = sum(1 for region in result["regions"] if not region["expected"])
+        return result
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Feature Store - Columnar, memory-mapped storage of per-file features.
+
+This module provides the FeatureStore class. Each feature is a fixed-width
+NumPy column in its own .npy file, opened as a memory map, and row i of every
+column belongs to the i-th path in paths.txt. Rows are appended during batch
+inspection (re-inspecting a path overwrites its row), and queries evaluate
+vectorized predicates over whole columns without touching the reports.
+"""
+
+import operator
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Column name -> dtype; floats use NaN for "not measured"
+SCHEMA = {
+    "fileSize": "int64",
+    "width": "int32",
+    "height": "int32",
+    "nonPixelRatio": "float32",
+    "entropy": "float32",
+    "payloadCount": "int32",
+    "hasExif": "bool",
+    "hasAiMetadata": "bool",
+    "lsbMaxRate": "float32",
+    "watermarkDetected": "bool",
+    "aHash": "uint64",
+    "dHash": "uint64",
+    "pHash": "uint64",
+    "flags": "uint32",
+}
+
+# Phase 7 anomaly flags packed into the 'flags' column
+FLAG_BITS = {
+    "large_non_pixel_data": 1 << 0,
+    "custom_chunks_present": 1 << 1,
+    "lsb_embedding_suspected": 1 << 2,
+    "double_jpeg_compression": 1 << 3,
+    "ela_inconsistent_tiles": 1 << 4,
+    "idat_trailing_data": 1 << 5,
+    "idat_size_mismatch": 1 << 6,
+    "high_entropy_region": 1 << 7,
+}
+
+INITIAL_CAPACITY = 1024
+
+_CONDITION = re.compile(r"^\s*(\w+)\s*(==|!=|>=|<=|>|<)\s*(\S+)\s*$")
+_OPERATORS = {
+    "==": operator.eq, "!=": operator.ne,
+    ">=": operator.ge, "<=": operator.le,
+    ">": operator.gt, "<": operator.lt,
+}
+
+
+def features_from_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a LayeredInspector phase 8 report into a feature row."""
+    summary = report.get("summary", {})
+    anomalies = report.get("anomalies", {})
+    pixels = report.get("pixelAnalysis") or {}
+    lsb = pixels.get("lsb") or {}
+    watermark = pixels.get("watermark") or {}
+    hashes = pixels.get("perceptualHash") or {}
+
+    row = {
+        "fileSize": summary.get("fileSize"),
+        "width": summary.get("width"),
+        "height": summary.get("height"),
+        "nonPixelRatio": anomalies.get("nonPixelRatio"),
+        "entropy": anomalies.get("fileEntropy"),
+        "payloadCount": len(report.get("payloads", {}).get("payloads", [])),
+        "hasExif": summary.get("hasExif"),
+        "hasAiMetadata": summary.get("hasAiMetadata"),
+        "lsbMaxRate": lsb.get("maxEmbeddingRate"),
+        "watermarkDetected": watermark.get("detected"),
+        "flags": sum(FLAG_BITS.get(flag, 0) for flag in anomalies.get("flags", [])),
+    }
+    for kind, column in (("ahash", "aHash"), ("dhash", "dHash"), ("phash", "pHash")):
+        if hashes.get(kind):
+            row[column] = int(hashes[kind], 16)
+    return row
+
+
+def features_from_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a MetadataAggregator result into a feature row."""
+    hashes = metadata.get("perceptual_hash") or {}
+    watermark = metadata.get("invisible_watermark") or {}
+    row = {
+        "fileSize": metadata.get("file_size"),
+        "width": metadata.get("width"),
+        "height": metadata.get("height"),
+        "watermarkDetected": watermark.get("detected"),
+    }
+    for kind, column in (("ahash", "aHash"), ("dhash", "dHash"), ("phash", "pHash")):
+        if hashes.get(kind):
+            row[column] = int(hashes[kind], 16)
+    return row
+
+
+class FeatureStore:
+    """
+    Append-only columnar feature store backed by memory-mapped .npy files.
+
+    A single process writes; any number may read. Columns are preallocated
+    and doubled when full, so appends are amortized O(1).
+    """
+
+    def __init__(self, directory: str, schema: Optional[Dict[str, str]] = None):
+        """
+        Open or create a feature store.
+
+        Args:
+            directory: Directory holding <column>.npy files and paths.txt
+            schema: Column name -> dtype (defaults to SCHEMA)
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for FeatureStore")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.schema = dict(schema or SCHEMA)
+
+        self._paths_file = self.directory / "paths.txt"
+        self.paths: List[str] = []
+        if self._paths_file.exists():
+            with open(self._paths_file, "r", encoding="utf-8") as f:
+                self.paths = f.read().splitlines()
+        # path -> row, built on first append/get; queries never need it
+        self._id_index: Optional[Dict[str, int]] = None
+
+        self._columns: Dict[str, "np.memmap"] = {}
+        for name, dtype in self.schema.items():
+            self._columns[name] = self._open_column(name, dtype, max(INITIAL_CAPACITY, len(self.paths)))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def _ids(self) -> Dict[str, int]:
+        if self._id_index is None:
+            self._id_index = {path: i for i, path in enumerate(self.paths)}
+        return self._id_index
+
+    def __getitem__(self, column: str) -> "np.ndarray":
+        """Read-only view of one column over the stored rows."""
+        view = self._columns[column][:len(self.paths)]
+        view.flags.writeable = False
+        return view
+
+    def append(self, path: str, features: Dict[str, Any]) -> int:
+        """
+        Store a feature row for a path, overwriting an existing row.
+
+        Args:
+            path: File path (the row's key)
+            features: Column name -> value; missing or None values become
+                NaN (floats) or 0
+
+        Returns:
+            Row id
+        """
+        row = self._ids.get(path)
+        if row is None:
+            row = len(self.paths)
+            self._ensure_capacity(row + 1)
+            self.paths.append(path)
+            self._ids[path] = row
+            with open(self._paths_file, "a", encoding="utf-8") as f:
+                f.write(path + "\n")
+
+        for name, column in self._columns.items():
+            value = features.get(name)
+            if value is None:
+                value = np.nan if column.dtype.kind == "f" else 0
+            column[row] = value
+        return row
+
+    def extend(self, rows: Iterable[tuple]) -> None:
+        """Append many (path, features) pairs."""
+        for path, features in rows:
+            self.append(path, features)
+
+    def where(self, expression: str) -> "np.ndarray":
+        """
+        Evaluate a predicate such as "entropy > 7.9 and nonPixelRatio > 0.3".
+
+        Conditions compare a column with a number (or true/false) using
+        ==, !=, >, >=, <, <=; they are joined with 'and' (binding tighter)
+        and 'or'. 'flags has NAME' tests an anomaly flag bit.
+
+        Returns:
+            Boolean mask over the stored rows
+        """
+        result = None
+        for alternative in re.split(r"\s+or\s+", expression.strip()):
+            mask = None
+            for condition in re.split(r"\s+and\s+", alternative):
+                term = self._evaluate(condition)
+                mask = term if mask is None else mask & term
+            result = mask if result is None else result | mask
+        return result
+
+    def select(self, expression: str) -> List[str]:
+        """Paths of the rows matching an expression (see where())."""
+        return [self.paths[i] for i in np.flatnonzero(self.where(expression))]
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Feature row for a path as a dictionary."""
+        row = self._ids.get(path)
+        if row is None:
+            return None
+        return {name: column[row].item() for name, column in self._columns.items()}
+
+    def flush(self) -> None:
+        """Write dirty pages of every column to disk."""
+        for column in self._columns.values():
+            column.flush()
+
+    def close(self) -> None:
+        """Flush and release the memory maps."""
+        self.flush()
+        self._columns.clear()
+
+    def _evaluate(self, condition: str) -> "np.ndarray":
+        """Boolean mask for one 'column op value' condition."""
+        flag = re.match(r"^\s*flags\s+has\s+(\w+)\s*$", condition)
+        if flag:
+            if flag.group(1) not in FLAG_BITS:
+                raise ValueError(f"Unknown flag: {flag.group(1)}")
+            return (self["flags"] & FLAG_BITS[flag.group(1)]) != 0
+
+        match = _CONDITION.match(condition)
+        if not match:
+            raise ValueError(f"Invalid condition: {condition!r}")
+        name, op, literal = match.groups()
+        if name not in self._columns:
+            raise ValueError(f"Unknown column: {name}")
+        column = self[name]
+        if literal.lower() in ("true", "false"):
+            value = literal.lower() == "true"
+        elif column.dtype.kind in "iub" and not re.search(r"[.eE]", literal):
+            value = int(literal, 0)
+        else:
+            value = float(literal)
+        return _OPERATORS[op](column, value)
+
+    def _column_path(self, name: str) -> Path:
+        return self.directory / f"{name}.npy"
+
+    def _open_column(self, name: str, dtype: str, capacity: int) -> "np.memmap":
+        """Open an existing column, or create one with the given capacity."""
+        path = self._column_path(name)
+        if path.exists():
+            column = np.load(path, mmap_mode="r+")
+            if column.shape[0] >= capacity:
+                return column
+            return self._grow(name, column, capacity)
+        column = np.lib.format.open_memmap(path, mode="w+", dtype=np.dtype(dtype), shape=(capacity,))
+        if column.dtype.kind == "f":
+            column[:] = np.nan
+        return column
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Double every column that cannot hold `rows` rows."""
+        for name, column in list(self._columns.items()):
+            if column.shape[0] < rows:
+                self._columns[name] = self._grow(name, column, max(rows, column.shape[0] * 2))
+
+    def _grow(self, name: str, column: "np.memmap", capacity: int) -> "np.memmap":
+        """Copy a column into a larger file and swap it in place."""
+        path = self._column_path(name)
+        tmp_path = path.with_suffix(".npy.tmp")
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=column.dtype, shape=(capacity,))
+        grown[:column.shape[0]] = column
+        if grown.dtype.kind == "f":
+            grown[column.shape[0]:] = np.nan
+        grown.flush()
+        del grown
+        column.flush()
+        del column
+        os.replace(tmp_path, path)
+        return np.load(path, mmap_mode="r+")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+ICC Profile - Header and tag parsing for embedded colour profiles.
+
+This module provides parse_icc_profile(), which summarises an ICC profile
+(description, copyright, version, device class, colour space, rendering
+intent). Almost every file carries one of a handful of standard profiles, so
+summaries are memoized process-wide in an LRU keyed by a BLAKE2 digest of the
+profile bytes.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+DEVICE_CLASSES = {
+    b"scnr": "Input", b"mntr": "Display", b"prtr": "Output",
+    b"link": "DeviceLink", b"spac": "ColorSpace", b"abst": "Abstract",
+    b"nmcl": "NamedColor"
+}
+
+RENDERING_INTENTS = {
+    0: "Perceptual", 1: "Media-Relative Colorimetric",
+    2: "Saturation", 3: "ICC-Absolute Colorimetric"
+}
+
+CACHE_SIZE = 256
+
+_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def parse_icc_profile(data: bytes) -> Dict[str, Any]:
+    """
+    Summarise an ICC profile, reusing a cached summary for identical bytes.
+
+    Args:
+        data: Raw ICC profile bytes
+
+    Returns:
+        Dictionary with description, copyright, version, deviceClass,
+        colorSpace, pcs, renderingIntent and related header fields
+    """
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    with _cache_lock:
+        summary = _cache.get(key)
+        if summary is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return dict(summary)
+        _cache_stats["misses"] += 1
+
+    summary = _parse_profile(data)
+    summary["hash"] = key.hex()
+
+    with _cache_lock:
+        _cache[key] = summary
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return dict(summary)
+
+
+def cache_info() -> Dict[str, int]:
+    """Hit/miss counters and current size of the profile cache."""
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_cache)}
+
+
+def clear_cache() -> None:
+    """Empty the profile cache."""
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
+
+
+def _parse_profile(data: bytes) -> Dict[str, Any]:
+    """Parse the 128-byte header and the desc/cprt tags."""
+    if len(data) < 132 or data[36:40] != b"acsp":
+        return {"size": len(data), "error": "Invalid ICC profile header"}
+
+    major, minor = data[8], data[9]
+    intent = int.from_bytes(data[64:68], "big") & 0xFFFF
+    profile_id = data[84:100]
+
+    summary = {
+        "size": int.from_bytes(data[0:4], "big"),
+        "description": None,
+        "copyright": None,
+        "version": f"{major}.{minor >> 4}.{minor & 0x0F}",
+        "deviceClass": DEVICE_CLASSES.get(data[12:16], _signature(data[12:16])),
+        "colorSpace": _signature(data[16:20]),
+        "pcs": _signature(data[20:24]),
+        "renderingIntent": RENDERING_INTENTS.get(intent, str(intent)),
+        "cmm": _signature(data[4:8]),
+        "platform": _signature(data[40:44]),
+        "manufacturer": _signature(data[48:52]),
+        "creator": _signature(data[80:84]),
+        "created": _header_date(data[24:36]),
+        "profileId": profile_id.hex() if any(profile_id) else None
+    }
+
+    tag_count = int.from_bytes(data[128:132], "big")
+    for i in range(min(tag_count, (len(data) - 132) // 12)):
+        entry = 132 + i * 12
+        signature = data[entry:entry + 4]
+        if signature not in (b"desc", b"cprt"):
+            continue
+        offset = int.from_bytes(data[entry + 4:entry + 8], "big")
+        size = int.from_bytes(data[entry + 8:entry + 12], "big")
+        text = _decode_text_tag(data[offset:offset + size])
+        summary["description" if signature == b"desc" else "copyright"] = text
+
+    return summary
+
+
+def _decode_text_tag(tag: bytes) -> Optional[str]:
+    """Decode textDescriptionType (v2), textType or multiLocalizedUnicodeType (v4)."""
+    tag_type = tag[:4]
+    if tag_type == b"desc":
+        length = int.from_bytes(tag[8:12], "big")
+        return tag[12:12 + length].split(b"\x00", 1)[0].decode("latin1").strip() or None
+    if tag_type == b"text":
+        return tag[8:].split(b"\x00", 1)[0].decode("latin1").strip() or None
+    if tag_type == b"mluc":
+        records = int.from_bytes(tag[8:12], "big")
+        record_size = int.from_bytes(tag[12:16], "big")
+        chosen = None
+        for i in range(records):
+            record = 16 + i * record_size
+            language = tag[record:record + 2]
+            length = int.from_bytes(tag[record + 4:record + 8], "big")
+            offset = int.from_bytes(tag[record + 8:record + 12], "big")
+            # Prefer English, otherwise the first record
+            if chosen is None or language == b"en":
+                chosen = tag[offset:offset + length]
+                if language == b"en":
+                    break
+        if chosen is None:
+            return None
+        return chosen.decode("utf-16-be", errors="replace").strip("\x00 ") or None
+    return None
+
+
+def _signature(value: bytes) -> Optional[str]:
+    """Four-character signature as text, or None when zero."""
+    if not any(value):
+        return None
+    return value.decode("latin1").strip()
+
+
+def _header_date(value: bytes) -> Optional[str]:
+    """dateTimeNumber (six big-endian uint16) as ISO 8601."""
+    year, month, day, hour, minute, second = (int.from_bytes(value[i:i + 2], "big") for i in range(0, 12, 2))
+    if not year:
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}T{hour:02d}:{minute:02d}:{second:02d}"
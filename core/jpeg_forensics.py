@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+JPEG Forensics - Error level analysis and double-quantization evidence.
+
+This module provides the JPEGForensics class. The image is decoded once in
+YCbCr (no colour conversion) and split into tiles aligned to the 16-pixel MCU
+grid, so each tile can be re-encoded independently with the same result as
+re-encoding the whole image. Tiles run in a thread pool because Pillow
+releases the GIL while encoding and decoding.
+
+Per tile it computes the error level (mean absolute difference after
+re-encoding at a known quality, per 8x8 block and overall) and histograms of
+the quantized luminance DCT coefficients. Re-quantizing with a different step
+leaves periodic gaps or peaks in those histograms, which show up as a peak in
+their Fourier spectrum.
+"""
+
+import io
+import math
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Union, BinaryIO
+
+from PIL import Image
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Zigzag positions (row, column) of the first AC coefficients
+ZIGZAG_AC = [(0, 1), (1, 0), (2, 0), (1, 1), (0, 2), (0, 3), (1, 2), (2, 1), (3, 0)]
+
+
+def _dct_matrix(n: int) -> "np.ndarray":
+    """Orthonormal DCT-II basis; for n=8 this is the JPEG forward DCT."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    basis = np.cos(math.pi * (2 * i + 1) * k / (2 * n)) * math.sqrt(2.0 / n)
+    basis[0] /= math.sqrt(2.0)
+    return basis
+
+
+class JPEGForensics:
+    """
+    Tiled error level analysis and DCT histogram periodicity for JPEG files.
+    """
+
+    def __init__(
+        self,
+        quality: int = 90,
+        tile_size: int = 512,
+        max_workers: Optional[int] = None,
+        histogram_range: int = 32,
+        periodicity_threshold: float = 0.25
+    ):
+        """
+        Initialize the JPEGForensics analyzer.
+
+        Args:
+            quality: JPEG quality used for the ELA re-encode
+            tile_size: Tile edge in pixels (rounded down to a multiple of 16)
+            max_workers: Threads for tile processing (default: executor default)
+            histogram_range: Coefficient histograms cover [-range, range]
+            periodicity_threshold: Spectral peak ratio above which a frequency
+                is counted as double-quantized
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for JPEGForensics")
+        self.quality = quality
+        self.tile_size = max(16, tile_size - tile_size % 16)
+        self.max_workers = max_workers
+        self.histogram_range = histogram_range
+        self.periodicity_threshold = periodicity_threshold
+        dct = _dct_matrix(8)
+        # Only a few coefficients are needed: one (blocks x 64) @ (64 x 9) product
+        self._basis = np.stack([np.outer(dct[u], dct[v]).ravel() for u, v in ZIGZAG_AC], axis=1)
+
+    def analyze(self, file_path: Union[str, BinaryIO], heatmap_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run ELA and double-quantization analysis on a JPEG file.
+
+        Args:
+            file_path: Path to the JPEG, or a seekable binary stream over it
+            heatmap_path: Where to write an ELA heatmap PNG (optional)
+
+        Returns:
+            Dictionary with 'ela' (tile grid and statistics) and
+            'doubleCompression' (per-frequency periodicity)
+        """
+        with Image.open(file_path) as img:
+            if img.format not in ("JPEG", "MPO"):
+                raise ValueError(f"Not a JPEG file: {img.format}")
+            quantization = getattr(img, "quantization", None) or {}
+            # Decode to YCbCr directly so luminance matches the coded samples
+            if img.mode == "RGB":
+                img.draft("YCbCr", img.size)
+            img.load()
+            image = img if img.mode in ("YCbCr", "L") else img.convert("YCbCr")
+            width, height = image.size
+            boxes = [
+                (left, top, min(left + self.tile_size, width), min(top + self.tile_size, height))
+                for top in range(0, height, self.tile_size)
+                for left in range(0, width, self.tile_size)
+            ]
+            luma_table = np.array(quantization.get(0, [1] * 64), dtype=np.float64).reshape(8, 8)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                tiles = list(executor.map(lambda box: self._analyze_tile(image, box, luma_table), boxes))
+
+        columns = -(-width // self.tile_size)
+        grid = [[round(tile["score"], 3) for tile in tiles[row:row + columns]] for row in range(0, len(tiles), columns)]
+        scores = np.array([tile["score"] for tile in tiles])
+        weights = np.array([tile["pixels"] for tile in tiles], dtype=np.float64)
+
+        result = {
+            "ela": {
+                "quality": self.quality,
+                "tileSize": self.tile_size,
+                "grid": grid,
+                "mean": round(float((scores * weights).sum() / weights.sum()), 3),
+                "max": round(float(scores.max()), 3),
+                # Tiles far above the typical level are candidates for local edits
+                "outlierTiles": self._outlier_tiles(scores, columns),
+                "heatmap": None
+            },
+            "doubleCompression": self._periodicity(sum(tile["histograms"] for tile in tiles), luma_table)
+        }
+
+        if heatmap_path:
+            result["ela"]["heatmap"] = self._write_heatmap(tiles, boxes, width, height, heatmap_path)
+        return result
+
+    def _analyze_tile(self, image: Image.Image, box: Tuple[int, int, int, int], luma_table: "np.ndarray") -> Dict[str, Any]:
+        """Re-encode one tile, then measure error levels and coefficient histograms."""
+        tile = image.crop(box)
+        buffer = io.BytesIO()
+        tile.save(buffer, "JPEG", quality=self.quality)
+        buffer.seek(0)
+        with Image.open(buffer) as recompressed:
+            if tile.mode == "YCbCr":
+                recompressed.draft("YCbCr", tile.size)
+            original = np.asarray(tile, dtype=np.int16)
+            error = np.abs(original - np.asarray(recompressed, dtype=np.int16))
+        if error.ndim == 2:
+            error = error[..., None]
+
+        # Mean error per 8x8 block; only edge tiles need padding to the block grid
+        h, w = error.shape[:2]
+        score = float(error.sum(dtype=np.int64)) / error.size
+        if h % 8 or w % 8:
+            error = np.pad(error, ((0, -h % 8), (0, -w % 8), (0, 0)), mode="edge")
+        sums = error.reshape(error.shape[0] // 8, 8, error.shape[1] // 8, 8, -1).sum(axis=(1, 3, 4), dtype=np.int32)
+        block_error = sums / (64.0 * error.shape[2])
+
+        luma = original[..., 0] if original.ndim == 3 else original
+        return {
+            "score": score,
+            "pixels": h * w,
+            "blocks": block_error.astype(np.float32),
+            "histograms": self._coefficient_histograms(luma, luma_table)
+        }
+
+    def _coefficient_histograms(self, luma: "np.ndarray", luma_table: "np.ndarray") -> "np.ndarray":
+        """Histograms of quantized low-frequency AC coefficients over full 8x8 blocks."""
+        h, w = luma.shape[0] // 8 * 8, luma.shape[1] // 8 * 8
+        span = 2 * self.histogram_range + 1
+        if h == 0 or w == 0:
+            return np.zeros((len(ZIGZAG_AC), span), dtype=np.int64)
+
+        # AC coefficients ignore the -128 level shift, so raw samples can be used
+        blocks = luma[:h, :w].astype(np.float32).reshape(h // 8, 8, w // 8, 8).swapaxes(1, 2).reshape(-1, 64)
+        coefficients = blocks @ self._basis.astype(np.float32)
+
+        histograms = np.empty((len(ZIGZAG_AC), span), dtype=np.int64)
+        for i, (u, v) in enumerate(ZIGZAG_AC):
+            quantized = np.rint(coefficients[:, i] / luma_table[u, v]).astype(np.int64)
+            inside = np.abs(quantized) <= self.histogram_range
+            histograms[i] = np.bincount(quantized[inside] + self.histogram_range, minlength=span)
+        return histograms
+
+    def _periodicity(self, histograms: "np.ndarray", luma_table: "np.ndarray") -> Dict[str, Any]:
+        """Spectral peak of each detrended coefficient histogram."""
+        frequencies = []
+        r = self.histogram_range
+        for (u, v), histogram in zip(ZIGZAG_AC, histograms):
+            # Magnitudes 1..r folded onto one side; 0 is dominated by flat blocks
+            magnitude = (histogram[r + 1:] + histogram[r - 1::-1]).astype(np.float64)
+            entry = {"position": [u, v], "step": int(luma_table[u, v]), "score": None, "period": None}
+            if magnitude.sum() >= 1000 and np.count_nonzero(magnitude) >= 4:
+                # Divide out the smooth Laplacian falloff, leaving only periodic structure
+                kernel = np.ones(5) / 5
+                trend = np.convolve(np.pad(magnitude, 2, mode="edge"), kernel, mode="valid")
+                residual = np.where(trend > 0, magnitude / np.maximum(trend, 1e-9) - 1.0, 0.0)
+                residual = residual[:np.flatnonzero(magnitude)[-1] + 1]
+                spectrum = np.abs(np.fft.rfft(residual))
+                if len(spectrum) > 2:
+                    peak = int(np.argmax(spectrum[2:])) + 2
+                    entry["score"] = round(float(spectrum[peak] / len(residual)), 3)
+                    entry["period"] = round(len(residual) / peak, 2)
+            frequencies.append(entry)
+
+        scored = [f["score"] for f in frequencies if f["score"] is not None]
+        suspicious = [f for f in frequencies if f["score"] is not None and f["score"] > self.periodicity_threshold]
+        return {
+            "frequencies": frequencies,
+            "score": round(float(np.median(scored)), 3) if scored else None,
+            "periodicFrequencies": len(suspicious),
+            # One periodic frequency can be chance; require a few to agree
+            "suspected": len(suspicious) >= 3
+        }
+
+    def _outlier_tiles(self, scores: "np.ndarray", columns: int) -> List[List[int]]:
+        """Grid positions [row, column] of tiles with unusually high error levels."""
+        if len(scores) < 4:
+            return []
+        median = np.median(scores)
+        spread = np.median(np.abs(scores - median)) * 1.4826
+        limit = median + 3 * max(spread, 0.05 * median, 1e-6)
+        return [[int(i // columns), int(i % columns)] for i in np.flatnonzero(scores > limit)]
+
+    def _write_heatmap(self, tiles: List[Dict], boxes: List[Tuple], width: int, height: int, heatmap_path: str) -> str:
+        """Assemble per-block error levels into a false-colour PNG (one pixel per 8x8 block)."""
+        canvas = np.zeros((-(-height // 8), -(-width // 8)), dtype=np.float32)
+        for tile, (left, top, _, _) in zip(tiles, boxes):
+            blocks = tile["blocks"]
+            canvas[top // 8:top // 8 + blocks.shape[0], left // 8:left // 8 + blocks.shape[1]] = blocks
+
+        # Scale so the 99th percentile is full intensity; black -> red -> yellow -> white
+        level = np.clip(canvas / max(float(np.percentile(canvas, 99)), 1e-6), 0.0, 1.0)
+        rgb = np.stack([
+            np.clip(level * 3, 0, 1),
+            np.clip(level * 3 - 1, 0, 1),
+            np.clip(level * 3 - 2, 0, 1)
+        ], axis=-1)
+        heatmap = Image.fromarray((rgb * 255).astype(np.uint8), "RGB").resize((width, height), Image.NEAREST)
+
+        path = Path(heatmap_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        heatmap.save(path, "PNG")
+        return str(path)
@@ -3,10 +3,17 @@ Layered Image Inspector - Phase-by-phase parsing architecture
 Implements the step-by-step analysis from CursorInstructions_BareBlocks.md
 """
 
+import io
 import os
+import re
 import json
+import math
+import mmap
+import hashlib
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, BinaryIO
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
@@ -21,6 +28,25 @@ import exifread
 from PIL import Image
 from PIL.ExifTags import GPSTAGS, TAGS
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .xmp_parser import XMPParser
+from .c2pa_locator import C2PALocator, is_ai_generated
+from .icc_profile import parse_icc_profile
+from .steganalysis import LSBAnalyzer
+from .stealth_pnginfo import decode_stealth_pnginfo
+from .watermark import WatermarkDetector
+from .perceptual_hash import compute_perceptual_hashes
+from .feature_store import features_from_report
+from .jpeg_forensics import JPEGForensics
+from .png_idat import analyze_idat_stream
+from .entropy_profile import EntropyProfiler
+from .buffer_io import BufferReader, buffer_find
+from .archive_source import split_member_path
+
 class LayeredInspector:
     """
     Implements the layered parsing architecture:
@@ -30,15 +56,86 @@ class LayeredInspector:
     Phase 3: Structural Enumeration
     Phase 4: Declared Metadata Extraction
     Phase 5: Opaque Payload Detection
+    Phase 5b: Pixel Analysis (optional)
+    Phase 5c: JPEG Forensics (optional)
     Phase 6: AI/Workflow Pattern Recognition
     Phase 7: Size & Anomaly Heuristics
     Phase 8: Report Assembly
     """
     
-    def __init__(self, console: Optional[Console] = None, verbose: bool = True):
+    # JPEG APPn identifiers (NUL-terminated signatures at the start of the segment payload)
+    JPEG_XMP_ID = b'http://ns.adobe.com/xap/1.0/\x00'
+    JPEG_XMP_EXT_ID = b'http://ns.adobe.com/xmp/extension/\x00'
+    JPEG_ICC_ID = b'ICC_PROFILE\x00'
+    JPEG_MPF_ID = b'MPF\x00'
+    JPEG_IRB_ID = b'Photoshop 3.0\x00'
+    
+    # ISOBMFF major brands (ftyp) mapped to container names
+    ISOBMFF_BRANDS = {
+        b'heic': "HEIF", b'heix': "HEIF", b'hevc': "HEIF", b'heim': "HEIF",
+        b'heis': "HEIF", b'mif1': "HEIF", b'msf1': "HEIF",
+        b'avif': "AVIF", b'avis': "AVIF",
+        b'qt  ': "MOV"
+    }
+    ISOBMFF_CONTAINERS = ("HEIF", "AVIF", "MOV", "MP4")
+    
+    # APNG fcTL dispose/blend operations
+    APNG_DISPOSE_OPS = {0: "none", 1: "background", 2: "previous"}
+    APNG_BLEND_OPS = {0: "source", 1: "over"}
+    
+    IPTC_DATASETS = {
+        5: "ObjectName", 15: "Category", 25: "Keywords", 40: "SpecialInstructions",
+        55: "DateCreated", 60: "TimeCreated", 80: "By-line", 85: "By-lineTitle",
+        90: "City", 101: "Country", 105: "Headline", 110: "Credit", 115: "Source",
+        116: "CopyrightNotice", 120: "Caption-Abstract", 122: "Writer-Editor"
+    }
+    
+    # Marker inside entropy-coded JPEG data (not stuffing, RSTn or fill)
+    JPEG_MARKER = re.compile(rb'\xff[^\x00\xd0-\xd7\xff]')
+    
+    def __init__(
+        self,
+        console: Optional[Console] = None,
+        verbose: bool = True,
+        xmp_properties: Optional[List[str]] = None,
+        xmp_namespaces: Optional[List[str]] = None,
+        decode_c2pa: bool = False,
+        pixel_analysis: bool = False,
+        jpeg_forensics: bool = False,
+        ela_heatmap: bool = False,
+        entropy_profile: bool = False,
+        feature_store=None
+    ):
         self.console = console or Console()
         self.verbose = verbose
         self.results = {}
+        # XMP projection (e.g. ['dc:creator', 'xmp:CreatorTool']); None keeps everything
+        self.xmp_properties = xmp_properties
+        self.xmp_namespaces = xmp_namespaces
+        # Shared across files so repeated packet templates are parsed once per batch
+        self.xmp_parser = XMPParser()
+        # C2PA manifests are always located; CBOR claims are decoded only on request
+        self.c2pa_locator = C2PALocator()
+        self.decode_c2pa = decode_c2pa
+        # Decoding pixels is the expensive part of an inspection, so it is opt-in
+        self.pixel_analysis = pixel_analysis
+        self._lsb_analyzer = None
+        self._watermark_detector = None
+        # ELA and double-compression analysis for JPEGs; heatmaps go to exports/
+        self.jpeg_forensics = jpeg_forensics
+        self.ela_heatmap = ela_heatmap
+        self._forensics = None
+        # Windowed entropy over the whole file, attributed to phase 3 elements
+        self.entropy_profile = entropy_profile
+        self._entropy_profiler = None
+        # Optional FeatureStore; one row is appended per inspected file
+        self.feature_store = feature_store
+        # Decoded pixels of the file being inspected, shared by phases 5 and 5b
+        self._pixel_cache = None
+        # Object being inspected (set by _orchestrate); phases read it instead of their file path
+        self._buffer = None
+        # os.stat_result of the file behind the buffer, when there is one
+        self._source_stat = None
         
     def _convert_exif_value(self, value):
         """Convert EXIF values to JSON-serializable format"""
@@ -59,7 +156,75 @@ class LayeredInspector:
             return str(value)
     
     def phase_0_orchestrate(self, file_path: str) -> Dict[str, Any]:
-        """Phase 0: Orchestration - Coordinate all inspection phases"""
+        """Phase 0: Orchestration - Map the file and run every phase on it (see inspect_bytes)"""
+        with open(file_path, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            if file_stat.st_size == 0:
+                return self._orchestrate(b'', os.path.abspath(file_path), file_stat)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self._orchestrate(mm, os.path.abspath(file_path), file_stat)
+    
+    def inspect_bytes(self, buffer, name: str = "buffer") -> Dict[str, Any]:
+        """
+        Run every inspection phase on an in-memory object.
+        
+        Args:
+            buffer: bytes, bytearray, memoryview or mmap holding the whole file
+            name: Stands in for the file path (its extension is the MIME
+                fallback, and it keys feature store rows)
+        
+        Returns:
+            Results dictionary as returned by phase_0_orchestrate
+        """
+        return self._orchestrate(buffer, name, None)
+    
+    def inspect_stream(self, stream: BinaryIO, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run every inspection phase on a seekable binary stream.
+        
+        Files on disk are memory-mapped and BytesIO objects are used in place;
+        any other stream (e.g. an in-memory SpooledTemporaryFile) is read once.
+        
+        Args:
+            stream: Binary stream positioned anywhere; the whole content is inspected
+            name: Stands in for the file path (defaults to stream.name)
+        
+        Returns:
+            Results dictionary as returned by phase_0_orchestrate
+        """
+        if name is None:
+            name = getattr(stream, "name", None)
+            name = name if isinstance(name, str) else "stream"
+        
+        if hasattr(stream, "getbuffer"):
+            # A view of our own, so releasing it leaves the stream's buffer usable
+            view = memoryview(stream.getbuffer())
+            try:
+                return self.inspect_bytes(view, name)
+            finally:
+                view.release()
+        
+        # Only real files are mapped; fileno() would force a spooled file to disk
+        if isinstance(getattr(stream, "raw", stream), io.FileIO):
+            file_stat = os.fstat(stream.fileno())
+            if file_stat.st_size > 0:
+                with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._orchestrate(mm, name, file_stat)
+        
+        stream.seek(0)
+        return self.inspect_bytes(stream.read(), name)
+    
+    def _orchestrate(self, buffer, name: str, file_stat: Optional[os.stat_result]) -> Dict[str, Any]:
+        """Run phases 1-8 with every read served from `buffer`"""
+        self._source_stat = file_stat
+        try:
+            with self._in_memory(buffer):
+                return self._run_phases(name)
+        finally:
+            self._source_stat = None
+    
+    def _run_phases(self, file_path: str) -> Dict[str, Any]:
+        """Coordinate all inspection phases"""
         if self.verbose:
             self.console.print("\n[bold cyan]Phase 0: Orchestration[/bold cyan]")
             self.console.print(f"[dim]Coordinating inspection phases for: {os.path.basename(file_path)}[/dim]\n")
@@ -71,15 +236,25 @@ class LayeredInspector:
             "uncertainties": []
         }
         
+        self._pixel_cache = None
+        
         # Execute phases in order
         results["phases"]["1_intake"] = self.phase_1_file_intake(file_path)
         results["phases"]["2_container"] = self.phase_2_container_identification(file_path, results["phases"]["1_intake"])
         results["phases"]["3_structure"] = self.phase_3_structural_enumeration(file_path, results["phases"]["2_container"])
         results["phases"]["4_metadata"] = self.phase_4_declared_metadata(file_path, results["phases"]["3_structure"])
         results["phases"]["5_payloads"] = self.phase_5_opaque_payloads(file_path, results["phases"]["3_structure"])
-        results["phases"]["6_ai_patterns"] = self.phase_6_ai_patterns(results["phases"]["5_payloads"])
+        if self.pixel_analysis:
+            results["phases"]["5b_pixels"] = self.phase_5b_pixel_analysis(file_path, results["phases"]["2_container"])
+        if self.jpeg_forensics:
+            results["phases"]["5c_forensics"] = self.phase_5c_jpeg_forensics(file_path, results["phases"]["2_container"])
+        results["phases"]["6_ai_patterns"] = self.phase_6_ai_patterns(results["phases"]["5_payloads"], results["phases"].get("5b_pixels"))
         results["phases"]["7_anomalies"] = self.phase_7_anomaly_heuristics(results)
         results["phases"]["8_report"] = self.phase_8_report_assembly(results)
+        self._pixel_cache = None
+        
+        if self.feature_store is not None:
+            self.feature_store.append(results["phases"]["1_intake"]["filePath"], features_from_report(results["phases"]["8_report"]))
         
         return results
     
@@ -90,11 +265,18 @@ class LayeredInspector:
             self.console.print("[dim]  WHAT: Raw file from input[/dim]")
             self.console.print("[dim]  STEPS: Read file, store size, detect MIME type[/dim]\n")
         
-        file_stat = os.stat(file_path)
-        file_size = file_stat.st_size
+        if self._buffer is not None:
+            file_size = len(self._buffer)
+            file_stat = self._source_stat
+        else:
+            file_stat = os.stat(file_path)
+            file_size = file_stat.st_size
+        # Timestamps only exist for objects backed by a file
+        created = datetime.fromtimestamp(file_stat.st_ctime).isoformat() if file_stat else None
+        modified = datetime.fromtimestamp(file_stat.st_mtime).isoformat() if file_stat else None
         
         # Read first bytes for MIME detection
-        with open(file_path, 'rb') as f:
+        with self._open_source(file_path) as f:
             first_bytes = f.read(32)
         
         # Detect MIME type from magic bytes
@@ -102,11 +284,13 @@ class LayeredInspector:
         
         result = {
             "fileSize": file_size,
-            "fileName": os.path.basename(file_path),
-            "filePath": os.path.abspath(file_path),
+            # Archive members are named after the member, not the archive
+            "fileName": os.path.basename(split_member_path(file_path)[1] or file_path),
+            # In-memory objects keep the name they were given
+            "filePath": file_path if self._buffer is not None else os.path.abspath(file_path),
             "mimeHint": mime_hint,
-            "created": datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
-            "modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat()
+            "created": created,
+            "modified": modified
         }
         
         if self.verbose:
@@ -126,7 +310,7 @@ class LayeredInspector:
             self.console.print("[dim]  WHAT: First ~32 bytes of file (magic bytes)[/dim]")
             self.console.print("[dim]  STEPS: Read magic bytes, match against known formats[/dim]\n")
         
-        with open(file_path, 'rb') as f:
+        with self._open_source(file_path) as f:
             magic_bytes = f.read(32)
         
         container_type, confidence = self._identify_container(magic_bytes)
@@ -160,11 +344,13 @@ class LayeredInspector:
             structure = self._parse_png_structure(file_path)
         elif container_type in ["JPEG", "JPG"]:
             structure = self._parse_jpeg_structure(file_path)
+        elif container_type in self.ISOBMFF_CONTAINERS:
+            structure = self._parse_isobmff_structure(file_path)
         else:
             structure = {
                 "format": container_type,
                 "note": "Structure parsing not yet implemented for this format",
-                "fileSize": os.path.getsize(file_path)
+                "fileSize": self._source_size(file_path)
             }
         
         if self.verbose:
@@ -177,6 +363,21 @@ class LayeredInspector:
                     self.console.print(f"  [cyan]{chunk_type}[/cyan] - {size:,} bytes at offset {offset:,}")
                 if len(structure.get("chunks", [])) > 5:
                     self.console.print(f"  [dim]... and {len(structure['chunks']) - 5} more[/dim]")
+                if structure.get("animation"):
+                    animation = structure["animation"]
+                    loops = animation["loopCount"] or "infinite"
+                    self.console.print(f"[green][OK][/green] Animated PNG: [cyan]{animation['frameCount']}[/cyan] frames, {animation['totalDuration']}s, loops: {loops}")
+                idat = structure.get("idat")
+                if idat and idat.get("zlibHeader"):
+                    zlib_header = idat["zlibHeader"]
+                    self.console.print(f"[dim]IDAT zlib:[/dim] window [cyan]{zlib_header['windowSize']:,}[/cyan], level hint [cyan]{zlib_header['levelHint']}[/cyan], filters [cyan]{idat['filterStrategy']}[/cyan]")
+                    self.console.print(f"[dim]Inflated:[/dim] [cyan]{idat['inflatedSize']:,}[/cyan] of [cyan]{idat['expectedSize']:,}[/cyan] expected bytes")
+                    if idat["trailingBytes"]:
+                        self.console.print(f"[yellow][!][/yellow] [cyan]{idat['trailingBytes']:,}[/cyan] bytes after the end of the zlib stream")
+            elif "boxes" in structure:
+                self.console.print(f"[dim]Found {len(structure['boxes'])} top-level boxes:[/dim]")
+                for box in structure["boxes"][:5]:
+                    self.console.print(f"  [cyan]{box['type']}[/cyan] - {box['size']:,} bytes at offset {box['offset']:,}")
             self.console.print()
         
         return structure
@@ -197,7 +398,7 @@ class LayeredInspector:
         
         try:
             # EXIF data using exifread
-            with open(file_path, 'rb') as f:
+            with self._open_source(file_path) as f:
                 tags = exifread.process_file(f, details=False)
                 
                 for tag, value in tags.items():
@@ -206,7 +407,7 @@ class LayeredInspector:
                         metadata["exif"][tag] = self._convert_exif_value(value)
             
             # Image properties using PIL
-            with Image.open(file_path) as img:
+            with self._open_source(file_path) as f, Image.open(f) as img:
                 metadata["image_properties"] = {
                     "format": img.format,
                     "mode": img.mode,
@@ -215,6 +416,10 @@ class LayeredInspector:
                     "has_color_profile": 'icc_profile' in img.info
                 }
                 
+                # ICC summary (memoized process-wide by profile hash)
+                if img.info.get('icc_profile'):
+                    metadata["icc_profile"] = parse_icc_profile(img.info['icc_profile'])
+                
                 # GPS coordinates if available
                 if hasattr(img, '_getexif') and img._getexif():
                     gps_info = self._extract_gps_from_pil(img)
@@ -224,6 +429,9 @@ class LayeredInspector:
         except Exception as e:
             metadata["error"] = str(e)
         
+        # XMP packets located from the phase 3 structure
+        metadata["xmp"] = self._extract_xmp(file_path, structure)
+        
         if self.verbose:
             exif_count = len(metadata.get("exif", {}))
             if exif_count > 0:
@@ -231,10 +439,16 @@ class LayeredInspector:
             else:
                 self.console.print("[yellow][!][/yellow] No EXIF data found")
             
+            if metadata.get("xmp"):
+                self.console.print(f"[green][OK][/green] Found [cyan]{len(metadata['xmp'])}[/cyan] XMP properties")
+            
             if metadata.get("image_properties"):
                 props = metadata["image_properties"]
                 self.console.print(f"[green][OK][/green] Image: [cyan]{props.get('size', {}).get('width')}x{props.get('size', {}).get('height')}[/cyan] {props.get('format', '')}")
             
+            if metadata.get("icc_profile"):
+                self.console.print(f"[green][OK][/green] ICC profile: [cyan]{metadata['icc_profile'].get('description')}[/cyan]")
+            
             if metadata.get("gps"):
                 self.console.print(f"[green][OK][/green] GPS coordinates found")
             
@@ -259,6 +473,19 @@ class LayeredInspector:
                     payload_info = self._analyze_png_text_chunk(file_path, chunk)
                     if payload_info:
                         payloads.append(payload_info)
+            
+            # Generation metadata hidden in alpha LSBs (NovelAI / stealth pnginfo)
+            stealth_payload = self._analyze_stealth_pnginfo(file_path, structure)
+            if stealth_payload:
+                payloads.append(stealth_payload)
+        
+        # For JPEG, classify APPn/COM segments located by the segment walker
+        elif "segments" in structure:
+            payloads.extend(self._analyze_jpeg_segments(file_path, structure))
+        
+        # Content credentials (C2PA manifest stores in JUMBF boxes)
+        if self.c2pa_locator.has_candidates(structure):
+            payloads.extend(self._analyze_c2pa(file_path, structure))
         
         if self.verbose:
             if payloads:
@@ -271,7 +498,115 @@ class LayeredInspector:
         
         return {"payloads": payloads}
     
-    def phase_6_ai_patterns(self, payloads_data: Dict) -> Dict[str, Any]:
+    def phase_5b_pixel_analysis(self, file_path: str, container: Dict) -> Dict[str, Any]:
+        """Phase 5b: Pixel Analysis - Statistical LSB steganalysis and watermark decoding"""
+        if self.verbose:
+            self.console.print("[bold yellow]Phase 5b:[/bold yellow] [cyan]Pixel Analysis[/cyan]")
+            self.console.print("[dim]  WHAT: Decoded 8-bit pixel planes[/dim]")
+            self.console.print("[dim]  STEPS: Chi-square attack, RS analysis, DWT-DCT watermark decode, perceptual hashes[/dim]\n")
+        
+        result = {"analyzed": False, "lsb": None, "watermark": None, "perceptualHash": None, "note": None}
+        
+        pixels, channel_names, note = (None, None, "numpy not installed") if np is None else self._decode_pixels(file_path)
+        if pixels is None:
+            result["note"] = note
+        else:
+            result["analyzed"] = True
+            result["mode"] = "".join(channel_names)
+            
+            # Lossy decoders do not reproduce embedded LSBs; the statistics would be meaningless
+            if container.get("containerType") in ("JPEG", "HEIF", "AVIF"):
+                result["note"] = "LSB analysis skipped for lossy container"
+            else:
+                if self._lsb_analyzer is None:
+                    self._lsb_analyzer = LSBAnalyzer()
+                result["lsb"] = self._lsb_analyzer.analyze(pixels, channel_names)
+            
+            if pixels.shape[2] >= 3:
+                if self._watermark_detector is None:
+                    self._watermark_detector = WatermarkDetector()
+                result["watermark"] = self._watermark_detector.detect(pixels)
+            
+            # Separate reduced-size decode (JPEG draft mode) rather than downscaling the full frame
+            try:
+                with self._open_source(file_path) as f, Image.open(f) as img:
+                    result["perceptualHash"] = compute_perceptual_hashes(img)
+            except Exception as e:
+                result["perceptualHash"] = {"error": str(e)}
+        
+        if self.verbose:
+            if not result["analyzed"]:
+                self.console.print(f"[dim]Pixel analysis skipped: {result['note']}[/dim]")
+            lsb = result["lsb"]
+            if lsb:
+                for name, channel in lsb["channels"].items():
+                    self.console.print(f"  [dim]{name}:[/dim] embedding rate [cyan]{channel['embeddingRate']:.1%}[/cyan] [dim](chi-square p={channel['chiSquareP']})[/dim]")
+                if lsb["lsbEmbeddingSuspected"]:
+                    self.console.print(f"[yellow][!][/yellow] LSB embedding suspected in: [cyan]{', '.join(lsb['suspiciousChannels'])}[/cyan]")
+                else:
+                    self.console.print("[green][OK][/green] No LSB embedding detected")
+            elif result["analyzed"]:
+                self.console.print(f"[dim]{result['note']}[/dim]")
+            watermark = result["watermark"]
+            if watermark and watermark["detected"]:
+                self.console.print(f"[green][OK][/green] Invisible watermark: [cyan]{watermark['mark']}[/cyan] [dim]({watermark['bitAccuracy']:.0%} of {watermark['bitLength']} bits)[/dim]")
+            elif watermark:
+                self.console.print("[dim]No known invisible watermark[/dim]")
+            hashes = result["perceptualHash"]
+            if hashes and "phash" in hashes:
+                self.console.print(f"[dim]pHash:[/dim] [cyan]{hashes['phash']}[/cyan] [dim]dHash:[/dim] [cyan]{hashes['dhash']}[/cyan] [dim]aHash:[/dim] [cyan]{hashes['ahash']}[/cyan]")
+            self.console.print()
+        
+        return result
+    
+    def phase_5c_jpeg_forensics(self, file_path: str, container: Dict) -> Dict[str, Any]:
+        """Phase 5c: JPEG Forensics - Error level analysis and double-compression evidence"""
+        if self.verbose:
+            self.console.print("[bold yellow]Phase 5c:[/bold yellow] [cyan]JPEG Forensics[/cyan]")
+            self.console.print("[dim]  WHAT: Decoded JPEG tiles and luminance DCT coefficients[/dim]")
+            self.console.print("[dim]  STEPS: Re-encode tiles in memory, per-tile error level, coefficient histogram periodicity[/dim]\n")
+        
+        result = {"analyzed": False, "ela": None, "doubleCompression": None, "note": None}
+        
+        if container.get("containerType") != "JPEG":
+            result["note"] = "Forensics only applies to JPEG files"
+        elif np is None:
+            result["note"] = "numpy not installed"
+        else:
+            if self._forensics is None:
+                self._forensics = JPEGForensics()
+            heatmap_path = None
+            if self.ela_heatmap:
+                # Same-named files (or archive members) get distinct heatmaps via a hash of the full path
+                digest = hashlib.blake2b(os.path.abspath(file_path).encode("utf-8", "surrogateescape"), digest_size=4).hexdigest()
+                heatmap_path = str(Path("exports") / f"{Path(file_path).stem}_{digest}_ela.png")
+            try:
+                with self._open_source(file_path) as f:
+                    result.update(self._forensics.analyze(f, heatmap_path))
+                result["analyzed"] = True
+            except Exception as e:
+                result["note"] = f"Could not analyze JPEG: {e}"
+        
+        if self.verbose:
+            if result["analyzed"]:
+                ela = result["ela"]
+                double = result["doubleCompression"]
+                self.console.print(f"[dim]ELA (q={ela['quality']}):[/dim] mean [cyan]{ela['mean']}[/cyan], max [cyan]{ela['max']}[/cyan] over [cyan]{sum(len(row) for row in ela['grid'])}[/cyan] tile(s)")
+                if ela["outlierTiles"]:
+                    self.console.print(f"[yellow][!][/yellow] Tiles with inconsistent error level: [cyan]{ela['outlierTiles']}[/cyan]")
+                if double["suspected"]:
+                    self.console.print(f"[yellow][!][/yellow] Double JPEG compression suspected [dim](periodicity score {double['score']})[/dim]")
+                else:
+                    self.console.print("[green][OK][/green] No double-compression periodicity")
+                if ela["heatmap"]:
+                    self.console.print(f"[dim]Heatmap:[/dim] [cyan]{ela['heatmap']}[/cyan]")
+            else:
+                self.console.print(f"[dim]JPEG forensics skipped: {result['note']}[/dim]")
+            self.console.print()
+        
+        return result
+    
+    def phase_6_ai_patterns(self, payloads_data: Dict, pixels_data: Optional[Dict] = None) -> Dict[str, Any]:
         """Phase 6: AI/Workflow Pattern Recognition"""
         if self.verbose:
             self.console.print("[bold yellow]Phase 6:[/bold yellow] [cyan]AI/Workflow Pattern Recognition[/cyan]")
@@ -283,7 +618,9 @@ class LayeredInspector:
             "graphDetected": False,
             "wildcardsPresent": False,
             "resolvedPromptAvailable": False,
-            "pgpSignatureDetected": False
+            "pgpSignatureDetected": False,
+            "contentCredentials": False,
+            "invisibleWatermark": None
         }
         
         # Check payloads for AI patterns and PGP signatures
@@ -292,14 +629,34 @@ class LayeredInspector:
             if payload.get("hasPGP"):
                 ai_metadata["pgpSignatureDetected"] = True
             
+            # C2PA manifests declare generative-AI output in their actions
+            if payload.get("classification") == "c2pa_manifest":
+                ai_metadata["contentCredentials"] = True
+                manifests = payload.get("content", {}).get("manifests", [])
+                if is_ai_generated(manifests):
+                    ai_metadata["tool"] = ai_metadata["tool"] or manifests[-1].get("claimGenerator") or "C2PA-declared AI"
+                continue
+            
+            content = payload.get("content", "")
+            
+            # NovelAI writes Software/Source fields (tEXt chunks or stealth alpha payloads)
+            if isinstance(content, dict) and "NovelAI" in str(content.get("Software", "")) + str(content.get("Source", "")):
+                ai_metadata["tool"] = "NovelAI"
+                ai_metadata["resolvedPromptAvailable"] = bool(content.get("Description") or content.get("Comment"))
+                continue
+            
+            # A1111-style parameter strings: prompt, "Negative prompt:", "Steps: N, Sampler: ..."
+            if isinstance(content, str) and "Steps: " in content and "Sampler: " in content:
+                ai_metadata["tool"] = ai_metadata["tool"] or "Stable Diffusion WebUI"
+                ai_metadata["resolvedPromptAvailable"] = True
+                continue
+            
             # Check if payload is already marked as ComfyUI
             if payload.get("isComfyUI"):
                 ai_metadata["tool"] = "ComfyUI"
                 ai_metadata["graphDetected"] = True
                 continue
             
-            content = payload.get("content", "")
-            
             # If content is already a dict (parsed JSON), check it directly
             if isinstance(content, dict):
                 if content.get("nodes") or content.get("workflow") or content.get("prompt"):
@@ -332,6 +689,13 @@ class LayeredInspector:
                 except:
                     pass
         
+        # DWT-DCT watermark decoded from pixels in phase 5b
+        watermark = (pixels_data or {}).get("watermark")
+        if watermark:
+            ai_metadata["invisibleWatermark"] = watermark
+            if watermark["detected"] and not ai_metadata["tool"]:
+                ai_metadata["tool"] = f"Stable Diffusion ({watermark['mark']} watermark)"
+        
         if self.verbose:
             if ai_metadata["tool"]:
                 self.console.print(f"[green][OK][/green] AI Tool detected: [cyan]{ai_metadata['tool']}[/cyan]")
@@ -339,6 +703,8 @@ class LayeredInspector:
                     self.console.print(f"[green][OK][/green] Workflow graph detected")
             else:
                 self.console.print("[dim]No AI workflow patterns detected[/dim]")
+            if ai_metadata["contentCredentials"]:
+                self.console.print(f"[green][OK][/green] C2PA content credentials present")
             self.console.print()
         
         return {"aiMetadata": ai_metadata}
@@ -367,23 +733,64 @@ class LayeredInspector:
             if non_pixel_ratio > 0.3:  # More than 30% non-pixel data
                 flags.append("large_non_pixel_data")
             
-            if len(payloads.get("payloads", [])) > 0:
+            # Declared payloads (ICC, XMP, MPF, IRB) are expected in ordinary files
+            if any(not p.get("declared") for p in payloads.get("payloads", [])):
                 flags.append("custom_chunks_present")
         
+        lsb = all_results["phases"].get("5b_pixels", {}).get("lsb")
+        if lsb and lsb.get("lsbEmbeddingSuspected"):
+            flags.append("lsb_embedding_suspected")
+        
+        idat = structure.get("idat")
+        if idat:
+            if idat.get("trailingBytes"):
+                flags.append("idat_trailing_data")
+            if not idat.get("sizeMatches"):
+                flags.append("idat_size_mismatch")
+        
+        forensics = all_results["phases"].get("5c_forensics", {})
+        if (forensics.get("doubleCompression") or {}).get("suspected"):
+            flags.append("double_jpeg_compression")
+        if (forensics.get("ela") or {}).get("outlierTiles"):
+            flags.append("ela_inconsistent_tiles")
+        
         result = {
             "flags": flags,
             "nonPixelRatio": round(non_pixel_ratio, 3) if file_size > 0 else 0,
+            "fileEntropy": None,
             "fileSize": file_size,
             "pixelDataBytes": pixel_data_bytes,
             "nonPixelBytes": non_pixel_bytes
         }
         
+        if self.entropy_profile and np is not None and file_size > 0:
+            if self._entropy_profiler is None:
+                self._entropy_profiler = EntropyProfiler()
+            try:
+                with self._map_source(intake.get("filePath")) as mm:
+                    profile = self._entropy_profiler.profile_buffer(mm, structure)
+                    result["fileEntropy"] = self._buffer_entropy(mm)
+            except (OSError, ValueError) as e:
+                profile = {"error": str(e)}
+            result["entropyProfile"] = profile
+            if profile.get("unexpectedRegions"):
+                flags.append("high_entropy_region")
+        elif self.feature_store is not None and file_size > 0:
+            # Whole-file histogram only when the feature store will record it
+            result["fileEntropy"] = self._file_entropy(intake.get("filePath"))
+        
         if self.verbose:
             if flags:
                 self.console.print(f"[yellow][!][/yellow] Anomalies detected: [cyan]{', '.join(flags)}[/cyan]")
             else:
                 self.console.print("[green][OK][/green] No significant anomalies")
             self.console.print(f"[dim]Non-pixel ratio:[/dim] [cyan]{result['nonPixelRatio']:.1%}[/cyan]")
+            profile = result.get("entropyProfile")
+            if profile and profile.get("windows"):
+                self.console.print(f"[dim]Entropy profile:[/dim] [cyan]{profile['windows']:,}[/cyan] windows, min {profile['min']}, mean {profile['mean']}, max {profile['max']}")
+                for region in profile["regions"]:
+                    if not region["expected"]:
+                        self.console.print(f"  [yellow][!][/yellow] {region['length']:,} bytes at offset {region['start']:,} ({', '.join(region['elements'])}), entropy {region['meanEntropy']}")
             self.console.print()
         
         return result
@@ -402,17 +809,8 @@ class LayeredInspector:
         width = size_info.get("width") if isinstance(size_info, dict) else None
         height = size_info.get("height") if isinstance(size_info, dict) else None
         
-        # Get file creation date
-        file_path = all_results["phases"]["1_intake"].get("filePath", "")
-        date_created = None
-        if file_path:
-            try:
-                import os
-                from datetime import datetime
-                stat = os.stat(file_path)
-                date_created = datetime.fromtimestamp(stat.st_ctime).isoformat()
-            except:
-                pass
+        # File creation date (from the phase 1 stat; None for in-memory objects)
+        date_created = all_results["phases"]["1_intake"].get("created")
         
         file_size = all_results["phases"]["1_intake"]["fileSize"]
         file_size_mb = round(file_size / (1024 * 1024), 2) if file_size else 0
@@ -445,6 +843,8 @@ class LayeredInspector:
             "payloads": all_results["phases"]["5_payloads"],
             "aiMetadata": all_results["phases"]["6_ai_patterns"],
             "anomalies": all_results["phases"]["7_anomalies"],
+            "pixelAnalysis": all_results["phases"].get("5b_pixels"),
+            "forensics": all_results["phases"].get("5c_forensics"),
             "warnings": all_results.get("warnings", []),
             "uncertainties": all_results.get("uncertainties", [])
         }
@@ -457,6 +857,35 @@ class LayeredInspector:
     
     # Helper methods
     
+    @contextmanager
+    def _in_memory(self, buffer):
+        """Make phases and walkers read from `buffer` instead of opening their file path"""
+        self._buffer = memoryview(buffer).cast('B')
+        try:
+            yield
+        finally:
+            self._buffer.release()
+            self._buffer = None
+    
+    def _open_source(self, file_path: str):
+        """Binary stream over the object being inspected: the in-memory buffer, or the file"""
+        if self._buffer is not None:
+            return BufferReader(self._buffer)
+        return open(file_path, 'rb')
+    
+    @contextmanager
+    def _map_source(self, file_path: str):
+        """Whole-object buffer: the in-memory buffer itself, or a read-only mmap of the file"""
+        if self._buffer is not None:
+            yield self._buffer
+        else:
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+    
+    def _source_size(self, file_path: str) -> int:
+        """Size of the object being inspected"""
+        return len(self._buffer) if self._buffer is not None else os.path.getsize(file_path)
+    
     def _detect_mime_from_bytes(self, first_bytes: bytes, file_path: str) -> str:
         """Detect MIME type from magic bytes"""
         if first_bytes.startswith(b'\x89PNG\r\n\x1a\n'):
@@ -469,6 +898,9 @@ class LayeredInspector:
             return "image/bmp"
         elif first_bytes.startswith(b'RIFF') and b'WEBP' in first_bytes[:12]:
             return "image/webp"
+        elif first_bytes[4:8] == b'ftyp':
+            container = self.ISOBMFF_BRANDS.get(first_bytes[8:12], "MP4")
+            return {"HEIF": "image/heic", "AVIF": "image/avif", "MOV": "video/quicktime"}.get(container, "video/mp4")
         else:
             # Fallback to extension
             ext = Path(file_path).suffix.lower()
@@ -491,16 +923,22 @@ class LayeredInspector:
             return "BMP", "high"
         elif magic_bytes.startswith(b'RIFF') and b'WEBP' in magic_bytes[:12]:
             return "WEBP", "high"
+        elif magic_bytes[4:8] == b'ftyp':
+            brand = magic_bytes[8:12]
+            return self.ISOBMFF_BRANDS.get(brand, "MP4"), "high" if brand in self.ISOBMFF_BRANDS else "medium"
         else:
             return "UNKNOWN", "low"
     
     def _parse_png_structure(self, file_path: str) -> Dict:
-        """Parse PNG file structure - walk chunks"""
+        """Parse PNG file structure - walk chunks (APNG frame control read from chunk headers)"""
         chunks = []
         pixel_data_bytes = 0
         non_pixel_bytes = 8  # PNG signature
+        header = None
+        animation = None
+        frames = []
         
-        with open(file_path, 'rb') as f:
+        with self._open_source(file_path) as f:
             # Skip PNG signature (8 bytes)
             f.read(8)
             offset = 8
@@ -517,26 +955,51 @@ class LayeredInspector:
                     # Read chunk type (4 bytes)
                     chunk_type = f.read(4).decode('ascii', errors='ignore')
                     
-                    # Read chunk data
-                    chunk_data = f.read(length)
-                    
-                    # Read CRC (4 bytes)
-                    crc = f.read(4)
+                    # Only IHDR and the small APNG control chunks are read; everything else is skipped
+                    if chunk_type in ("IHDR", "acTL", "fcTL"):
+                        chunk_data = f.read(length)
+                        f.seek(4, 1)  # CRC
+                    else:
+                        chunk_data = None
+                        f.seek(length + 4, 1)  # Chunk data and CRC
                     
                     chunk_info = {
                         "type": chunk_type,
                         "size": length,
                         "offset": offset,
-                        "hasData": len(chunk_data) > 0
+                        "hasData": length > 0
                     }
                     
                     chunks.append(chunk_info)
                     
-                    if chunk_type == "IDAT":
+                    if chunk_type == "IHDR" and len(chunk_data) >= 13:
+                        header = {
+                            "width": int.from_bytes(chunk_data[0:4], 'big'),
+                            "height": int.from_bytes(chunk_data[4:8], 'big'),
+                            "bitDepth": chunk_data[8],
+                            "colorType": chunk_data[9],
+                            "interlaced": chunk_data[12] == 1
+                        }
+                    elif chunk_type == "acTL" and len(chunk_data) >= 8:
+                        animation = {
+                            "declaredFrames": int.from_bytes(chunk_data[0:4], 'big'),
+                            # 0 means loop forever
+                            "loopCount": int.from_bytes(chunk_data[4:8], 'big')
+                        }
+                    elif chunk_type == "fcTL" and len(chunk_data) >= 26:
+                        frames.append(self._parse_apng_frame_control(chunk_data, offset))
+                    
+                    if chunk_type in ("IDAT", "fdAT"):
+                        # fdAT carries animation frame pixel data
                         pixel_data_bytes += length
+                        if frames:
+                            frames[-1]["dataBytes"] += length
                     else:
                         non_pixel_bytes += length + 12  # +12 for length, type, CRC
                     
+                    if chunk_type == "IDAT" and frames:
+                        frames[-1]["isDefaultImage"] = True
+                    
                     offset += length + 12
                     
                     if chunk_type == "IEND":
@@ -545,20 +1008,66 @@ class LayeredInspector:
                 except Exception as e:
                     break
         
-        return {
+        structure = {
             "format": "PNG",
             "chunks": chunks,
             "pixelDataBytes": pixel_data_bytes,
             "nonPixelBytes": non_pixel_bytes,
             "totalChunks": len(chunks)
         }
+        
+        if header is not None:
+            structure["header"] = header
+            # Inflate IDAT in bounded steps: encoder hints, filters, data after the stream
+            with self._open_source(file_path) as f:
+                structure["idat"] = analyze_idat_stream(f, chunks, header)
+        
+        if animation is not None:
+            structure["animated"] = True
+            structure["animation"] = self._summarize_apng(animation, frames)
+        
+        return structure
+    
+    def _parse_apng_frame_control(self, data: bytes, offset: int) -> Dict:
+        """Parse an APNG fcTL chunk (26 bytes)"""
+        delay_num = int.from_bytes(data[20:22], 'big')
+        delay_den = int.from_bytes(data[22:24], 'big') or 100  # 0 denominator means 1/100 s
+        return {
+            "sequence": int.from_bytes(data[0:4], 'big'),
+            "width": int.from_bytes(data[4:8], 'big'),
+            "height": int.from_bytes(data[8:12], 'big'),
+            "xOffset": int.from_bytes(data[12:16], 'big'),
+            "yOffset": int.from_bytes(data[16:20], 'big'),
+            "delay": round(delay_num / delay_den, 4),
+            "disposeOp": self.APNG_DISPOSE_OPS.get(data[24], str(data[24])),
+            "blendOp": self.APNG_BLEND_OPS.get(data[25], str(data[25])),
+            "offset": offset,
+            "dataBytes": 0,
+            "isDefaultImage": False
+        }
+    
+    def _summarize_apng(self, animation: Dict, frames: List[Dict]) -> Dict:
+        """Frame count, loop count and per-frame statistics for an animated PNG"""
+        delays = [frame["delay"] for frame in frames]
+        frame_bytes = [frame["dataBytes"] for frame in frames]
+        return {
+            **animation,
+            "frameCount": len(frames),
+            "frameCountMismatch": len(frames) != animation["declaredFrames"],
+            "defaultImageIsFrame": bool(frames and frames[0]["isDefaultImage"]),
+            "totalDuration": round(sum(delays), 4),
+            "minDelay": min(delays) if delays else None,
+            "maxDelay": max(delays) if delays else None,
+            "averageFrameBytes": round(sum(frame_bytes) / len(frame_bytes)) if frame_bytes else 0,
+            "frames": frames
+        }
     
     def _parse_jpeg_structure(self, file_path: str) -> Dict:
         """Parse JPEG file structure - walk segments"""
         segments = []
         non_pixel_bytes = 0
         
-        with open(file_path, 'rb') as f:
+        with self._open_source(file_path) as f:
             # Check SOI marker
             soi = f.read(2)
             if soi != b'\xff\xd8':
@@ -583,9 +1092,13 @@ class LayeredInspector:
                     elif marker_type == 0xd9:  # EOI
                         break
                     elif marker_type == 0xda:  # SOS (Start of Scan - image data starts)
-                        # Skip to end of file or next marker
-                        remaining = f.read()
-                        pixel_data_size = len(remaining)
+                        # Follow the entropy-coded data (and any further scans) to EOI
+                        file_end = f.seek(0, 2)
+                        end_offset = self._find_jpeg_scan_end(f, offset)
+                        pixel_data_size = (end_offset or file_end) - offset
+                        # Bytes after EOI are not image data
+                        if end_offset is not None:
+                            non_pixel_bytes += file_end - end_offset
                         break
                     else:
                         # Read segment length
@@ -608,13 +1121,106 @@ class LayeredInspector:
                 except Exception as e:
                     break
         
-        return {
+        structure = {
             "format": "JPEG",
             "segments": segments,
             "pixelDataBytes": pixel_data_size if 'pixel_data_size' in locals() else 0,
             "nonPixelBytes": non_pixel_bytes,
             "totalSegments": len(segments)
         }
+        if 'end_offset' in locals():
+            # None when the scan data runs to the end of the file without EOI
+            structure["endOffset"] = end_offset
+            structure["trailingBytes"] = file_end - end_offset if end_offset is not None else 0
+        return structure
+    
+    def _find_jpeg_scan_end(self, f, offset: int) -> Optional[int]:
+        """Offset just past EOI, starting from the SOS marker at `offset`; None if EOI is missing"""
+        position = offset
+        while True:
+            # Skip the marker segment (SOS header, or DHT/DQT/DRI between progressive scans)
+            f.seek(position + 2)
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            position += 2 + int.from_bytes(length_bytes, 'big')
+            
+            # Entropy-coded data: 0xFF is followed by 0x00 (stuffing), RSTn or 0xFF (fill)
+            f.seek(position)
+            base = position
+            carry = b''
+            marker = None
+            while marker is None:
+                block = f.read(65536)
+                if not block:
+                    return None
+                data = carry + block
+                match = self.JPEG_MARKER.search(data)
+                if match:
+                    marker = data[match.start() + 1]
+                    position = base + match.start()
+                else:
+                    # A trailing 0xFF may pair with the first byte of the next block
+                    carry = data[-1:] if data.endswith(b'\xff') else b''
+                    base += len(data) - len(carry)
+            
+            if marker == 0xd9:  # EOI
+                return position + 2
+
+    
+    def _parse_isobmff_structure(self, file_path: str) -> Dict:
+        """Parse ISOBMFF (HEIF/AVIF/MP4/MOV) structure - walk top-level box headers"""
+        boxes = []
+        pixel_data_bytes = 0
+        non_pixel_bytes = 0
+        brand = None
+        file_size = self._source_size(file_path)
+        
+        with self._open_source(file_path) as f:
+            offset = 0
+            while offset + 8 <= file_size:
+                f.seek(offset)
+                header = f.read(16)
+                size = int.from_bytes(header[:4], 'big')
+                box_type = header[4:8].decode('latin1')
+                header_size = 8
+                if size == 1:  # 64-bit largesize
+                    size = int.from_bytes(header[8:16], 'big')
+                    header_size = 16
+                elif size == 0:  # Box extends to end of file
+                    size = file_size - offset
+                if size < header_size:
+                    break
+                
+                box_info = {
+                    "type": box_type,
+                    "size": size,
+                    "offset": offset,
+                    "headerSize": header_size
+                }
+                if box_type == "ftyp":
+                    brand = header[8:12].decode('latin1')
+                elif box_type == "uuid":
+                    f.seek(offset + header_size)
+                    box_info["uuid"] = f.read(16).hex()
+                boxes.append(box_info)
+                
+                if box_type == "mdat":
+                    pixel_data_bytes += size - header_size
+                    non_pixel_bytes += header_size
+                else:
+                    non_pixel_bytes += size
+                
+                offset += size
+        
+        return {
+            "format": "ISOBMFF",
+            "brand": brand,
+            "boxes": boxes,
+            "pixelDataBytes": pixel_data_bytes,
+            "nonPixelBytes": non_pixel_bytes,
+            "totalBoxes": len(boxes)
+        }
     
     def _detect_pgp_signature(self, text: str) -> bool:
         """Detect PGP signature patterns in text content"""
@@ -644,7 +1250,7 @@ class LayeredInspector:
     def _analyze_png_text_chunk(self, file_path: str, chunk: Dict) -> Optional[Dict]:
         """Analyze PNG text chunk for payloads"""
         try:
-            with open(file_path, 'rb') as f:
+            with self._open_source(file_path) as f:
                 f.seek(chunk["offset"] + 8)  # Skip length and type
                 data = f.read(chunk["size"])
                 
@@ -786,6 +1392,477 @@ class LayeredInspector:
                 self.console.print(f"[dim]Error analyzing chunk {chunk.get('type')}: {e}[/dim]")
             return None
     
+    def _analyze_stealth_pnginfo(self, file_path: str, structure: Dict) -> Optional[Dict]:
+        """Decode a stealth pnginfo payload from the alpha channel of an 8-bit PNG"""
+        header = structure.get("header", {})
+        # Colour types 4 (grey + alpha) and 6 (RGBA); everything else has no alpha plane
+        if np is None or header.get("colorType") not in (4, 6) or header.get("bitDepth") != 8:
+            return None
+        
+        pixels, channel_names, _ = self._decode_pixels(file_path)
+        if pixels is None or channel_names[-1] != "A":
+            return None
+        
+        stealth = decode_stealth_pnginfo(pixels[:, :, -1])
+        if stealth is None:
+            return None
+        
+        source = f"alpha-lsb:{stealth['signature']}"
+        if stealth.get("text") is None:
+            return {
+                "source": source,
+                "size": stealth.get("bits", 0) // 8,
+                "classification": "binary",
+                "error": stealth.get("error")
+            }
+        
+        payload = self._classify_text_payload(source, stealth["bits"] // 8, stealth["text"])
+        payload["stealth"] = True
+        payload["compressed"] = stealth["compressed"]
+        return payload
+    
+    def _classify_text_payload(self, source: str, size: int, text_value: str, keyword: Optional[str] = None) -> Dict:
+        """Classify a decoded text payload as JSON or plain text"""
+        has_pgp = self._detect_pgp_signature(text_value)
+        payload = {
+            "source": source,
+            "size": size,
+            "classification": "text",
+            "content": text_value,
+            "hasPGP": has_pgp
+        }
+        if keyword is not None:
+            payload["keyword"] = keyword
+        try:
+            json_data = json.loads(text_value)
+            payload["classification"] = "json"
+            payload["content"] = json_data
+            payload["isComfyUI"] = bool(
+                isinstance(json_data, dict) and
+                (json_data.get("nodes") or json_data.get("workflow") or json_data.get("prompt"))
+            )
+        except:
+            pass
+        return payload
+    
+    def _analyze_jpeg_segments(self, file_path: str, structure: Dict) -> List[Dict]:
+        """Analyze JPEG APPn/COM segments for payloads using the offsets from phase 3"""
+        segments = structure.get("segments", [])
+        if not segments:
+            return []
+        
+        try:
+            with self._map_source(file_path) as mm:
+                view = memoryview(mm)
+                try:
+                    return self._classify_jpeg_segments(view, segments)
+                finally:
+                    view.release()
+        except Exception as e:
+            if self.verbose:
+                self.console.print(f"[dim]Error analyzing JPEG segments: {e}[/dim]")
+            return []
+    
+    def _analyze_c2pa(self, file_path: str, structure: Dict) -> List[Dict]:
+        """Locate C2PA manifest stores and report their layout (claims decoded only if requested)"""
+        try:
+            with self._map_source(file_path) as mm:
+                stores = self._locate_c2pa_stores(mm, structure)
+        except Exception as e:
+            if self.verbose:
+                self.console.print(f"[dim]Error locating C2PA manifests: {e}[/dim]")
+            return []
+        
+        payloads = []
+        for store in stores:
+            content = store.summary()
+            if self.decode_c2pa:
+                content["manifests"] = store.decode()
+            payloads.append({
+                "source": store.source,
+                "size": store.size,
+                "offset": store.offset,
+                "classification": "c2pa_manifest",
+                "content": content,
+                "declared": True
+            })
+        return payloads
+    
+    def _locate_c2pa_stores(self, mm: mmap.mmap, structure: Dict) -> List:
+        """Run the C2PA locator over a view of the mapped file"""
+        view = memoryview(mm)
+        try:
+            return self.c2pa_locator.locate(view, structure)
+        finally:
+            view.release()
+    
+    def _extract_xmp(self, file_path: str, structure: Dict) -> Dict:
+        """Locate XMP packets via the phase 3 structure and parse them incrementally"""
+        try:
+            with self._map_source(file_path) as mm:
+                return self._parse_xmp_packets(mm, structure)
+        except Exception as e:
+            if self.verbose:
+                self.console.print(f"[dim]Error extracting XMP: {e}[/dim]")
+            return {}
+    
+    def _parse_xmp_packets(self, mm: mmap.mmap, structure: Dict) -> Dict:
+        """Parse every XMP packet in the file, merging their properties"""
+        xmp = {}
+        for packet in self._locate_xmp_packets(mm, structure):
+            xmp.update(self.xmp_parser.parse(packet, properties=self.xmp_properties, namespaces=self.xmp_namespaces))
+        return xmp
+    
+    def _locate_xmp_packets(self, mm: mmap.mmap, structure: Dict) -> List:
+        """Return XMP packets as zero-copy slices where possible (JPEG APP1, PNG iTXt, raw scan otherwise)"""
+        view = memoryview(mm)
+        packets = []
+        
+        if "segments" in structure:
+            xmp_extensions = {}
+            for segment in structure["segments"]:
+                if segment.get("marker") != "0xFFE1":
+                    continue
+                start = segment["offset"] + 4
+                data = view[start:start + segment["size"]]
+                if data[:len(self.JPEG_XMP_ID)] == self.JPEG_XMP_ID:
+                    packets.append(data[len(self.JPEG_XMP_ID):])
+                elif data[:len(self.JPEG_XMP_EXT_ID)] == self.JPEG_XMP_EXT_ID:
+                    header_end = len(self.JPEG_XMP_EXT_ID)
+                    guid = bytes(data[header_end:header_end + 32])
+                    entry = xmp_extensions.setdefault(guid, {
+                        "fullLength": int.from_bytes(data[header_end + 32:header_end + 36], 'big'),
+                        "parts": {}
+                    })
+                    entry["parts"][int.from_bytes(data[header_end + 36:header_end + 40], 'big')] = data[header_end + 40:]
+            for entry in xmp_extensions.values():
+                packets.append(self._stitch_extended_xmp(entry)[0])
+        
+        elif "chunks" in structure:
+            for chunk in structure["chunks"]:
+                if chunk.get("type") != "iTXt":
+                    continue
+                start = chunk["offset"] + 8
+                end = start + chunk["size"]
+                # iTXt: keyword\0 compression_flag compression_method language\0 translated_keyword\0 text
+                if bytes(view[start:start + 18]) != b'XML:com.adobe.xmp\x00':
+                    continue
+                compressed = view[start + 18]
+                language_end = buffer_find(mm, b'\x00', start + 20, end)
+                text_start = buffer_find(mm, b'\x00', language_end + 1, end) + 1
+                if language_end < 0 or text_start <= 0:
+                    continue
+                if compressed:
+                    packets.append(zlib.decompress(view[text_start:end]))
+                else:
+                    packets.append(view[text_start:end])
+        
+        else:
+            # Containers without a structure walker: scan for the packet wrapper
+            start = buffer_find(mm, b'<x:xmpmeta')
+            if start >= 0:
+                end = buffer_find(mm, b'</x:xmpmeta>', start)
+                if end >= 0:
+                    packets.append(view[start:end + len(b'</x:xmpmeta>')])
+        
+        return packets
+    
+    def _classify_jpeg_segments(self, view: memoryview, segments: List[Dict]) -> List[Dict]:
+        """Classify APPn/COM segments over a zero-copy view and reassemble multi-segment payloads"""
+        payloads = []
+        icc_parts = {}
+        icc_info = {"count": 0, "offset": None}
+        xmp_extensions = {}
+        irb_parts = []
+        
+        for segment in segments:
+            marker = int(segment.get("marker", "0x0"), 16) & 0xFF
+            if marker != 0xFE and not 0xE0 <= marker <= 0xEF:
+                continue
+            
+            start = segment["offset"] + 4  # Skip marker and length
+            size = segment["size"]
+            data = view[start:start + size]
+            
+            try:
+                if marker == 0xFE:
+                    text_value = bytes(data).decode('utf-8', errors='ignore')
+                    payload = self._classify_text_payload("COM", size, text_value)
+                    payload["offset"] = segment["offset"]
+                    payloads.append(payload)
+                    continue
+                
+                app_n = marker - 0xE0
+                if app_n == 1 and data[:len(self.JPEG_XMP_ID)] == self.JPEG_XMP_ID:
+                    body = bytes(data[len(self.JPEG_XMP_ID):])
+                    payloads.append({
+                        "source": "APP1:XMP",
+                        "size": len(body),
+                        "offset": segment["offset"],
+                        "classification": "xmp",
+                        "content": body.decode('utf-8', errors='ignore'),
+                        "declared": True
+                    })
+                elif app_n == 1 and data[:len(self.JPEG_XMP_EXT_ID)] == self.JPEG_XMP_EXT_ID:
+                    # GUID (32 hex chars), full length and chunk offset precede the chunk data
+                    header_end = len(self.JPEG_XMP_EXT_ID)
+                    guid = bytes(data[header_end:header_end + 32]).decode('ascii', errors='ignore')
+                    full_length = int.from_bytes(data[header_end + 32:header_end + 36], 'big')
+                    chunk_offset = int.from_bytes(data[header_end + 36:header_end + 40], 'big')
+                    entry = xmp_extensions.setdefault(guid, {"fullLength": full_length, "parts": {}, "offset": segment["offset"]})
+                    entry["parts"][chunk_offset] = data[header_end + 40:]
+                elif app_n == 1 and data[:6] == b'Exif\x00\x00':
+                    continue  # Declared EXIF, handled in phase 4
+                elif app_n == 2 and data[:len(self.JPEG_ICC_ID)] == self.JPEG_ICC_ID:
+                    # ICC_PROFILE\0 + sequence number + total count, then profile bytes
+                    header_end = len(self.JPEG_ICC_ID)
+                    if len(data) >= header_end + 2:
+                        icc_parts[data[header_end]] = data[header_end + 2:]
+                        icc_info["count"] = max(icc_info["count"], data[header_end + 1])
+                        if icc_info["offset"] is None:
+                            icc_info["offset"] = segment["offset"]
+                elif app_n == 2 and data[:len(self.JPEG_MPF_ID)] == self.JPEG_MPF_ID:
+                    mpf = self._parse_mpf(data[len(self.JPEG_MPF_ID):], start + len(self.JPEG_MPF_ID))
+                    payloads.append({
+                        "source": "APP2:MPF",
+                        "size": size,
+                        "offset": segment["offset"],
+                        "classification": "mpf",
+                        "content": mpf,
+                        "declared": True
+                    })
+                elif app_n == 13 and data[:len(self.JPEG_IRB_ID)] == self.JPEG_IRB_ID:
+                    irb_parts.append((segment["offset"], data[len(self.JPEG_IRB_ID):]))
+                elif app_n == 0 and data[:5] in (b'JFIF\x00', b'JFXX\x00'):
+                    continue
+                elif app_n == 14 and data[:5] == b'Adobe':
+                    continue
+                elif app_n == 11 and data[:2] == b'JP':
+                    continue  # JUMBF boxes, handled by the C2PA locator
+                else:
+                    payloads.append(self._classify_app_segment(app_n, segment["offset"], data))
+            except Exception as e:
+                if self.verbose:
+                    self.console.print(f"[dim]Error analyzing segment {segment.get('marker')}: {e}[/dim]")
+        
+        # Reassemble multi-segment ICC profile in sequence order
+        if icc_parts:
+            count = icc_info["count"] or len(icc_parts)
+            profile = b"".join(bytes(icc_parts[i]) for i in sorted(icc_parts))
+            payloads.append({
+                "source": "APP2:ICC_PROFILE",
+                "size": len(profile),
+                "offset": icc_info["offset"],
+                "classification": "icc_profile",
+                "content": parse_icc_profile(profile),
+                "segments": len(icc_parts),
+                "complete": sorted(icc_parts) == list(range(1, count + 1)),
+                "declared": True
+            })
+        
+        # Stitch Extended XMP chunks by GUID; the GUID is the MD5 of the full packet
+        for guid, entry in xmp_extensions.items():
+            full_length = entry["fullLength"]
+            buffer, covered = self._stitch_extended_xmp(entry)
+            payloads.append({
+                "source": "APP1:ExtendedXMP",
+                "size": full_length,
+                "offset": entry["offset"],
+                "classification": "xmp",
+                "content": bytes(buffer).decode('utf-8', errors='ignore'),
+                "guid": guid,
+                "segments": len(entry["parts"]),
+                "complete": covered == full_length,
+                "digestValid": hashlib.md5(buffer).hexdigest().upper() == guid.upper(),
+                "declared": True
+            })
+        
+        # Photoshop image resource blocks may be split across APP13 segments
+        if irb_parts:
+            irb_data = b"".join(bytes(part) for _, part in irb_parts)
+            resources, iptc = self._parse_photoshop_irb(irb_data)
+            payloads.append({
+                "source": "APP13:Photoshop",
+                "size": len(irb_data),
+                "offset": irb_parts[0][0],
+                "classification": "photoshop_irb",
+                "resources": resources,
+                "content": iptc,
+                "declared": True
+            })
+        
+        return payloads
+    
+    def _stitch_extended_xmp(self, entry: Dict) -> tuple:
+        """Place Extended XMP chunks at their declared offsets, returning the packet and bytes covered"""
+        full_length = entry["fullLength"]
+        buffer = bytearray(full_length)
+        covered = 0
+        for chunk_offset, chunk in entry["parts"].items():
+            end = min(chunk_offset + len(chunk), full_length)
+            if chunk_offset < end:
+                buffer[chunk_offset:end] = chunk[:end - chunk_offset]
+                covered += end - chunk_offset
+        return buffer, covered
+    
+    def _classify_app_segment(self, app_n: int, offset: int, data: memoryview) -> Dict:
+        """Classify an APPn segment without a known identifier (JSON, text or vendor binary)"""
+        # Vendor segments usually start with a short NUL-terminated ASCII identifier
+        identifier = None
+        body = data
+        null_pos = bytes(data[:64]).find(b'\x00')
+        if null_pos > 0:
+            candidate = bytes(data[:null_pos])
+            if all(32 <= b < 127 for b in candidate):
+                identifier = candidate.decode('ascii')
+                body = data[null_pos + 1:]
+        
+        source = f"APP{app_n}:{identifier}" if identifier else f"APP{app_n}"
+        raw = bytes(body)
+        
+        try:
+            text_value = raw.decode('utf-8')
+            if text_value.strip() and all(c.isprintable() or c.isspace() for c in text_value):
+                payload = self._classify_text_payload(source, len(data), text_value, keyword=identifier)
+                payload["offset"] = offset
+                return payload
+        except UnicodeDecodeError:
+            pass
+        
+        return {
+            "source": source,
+            "size": len(data),
+            "offset": offset,
+            "classification": "binary",
+            "entropy": self._calculate_entropy(raw)
+        }
+    
+    def _parse_mpf(self, data: memoryview, base_offset: int) -> Dict:
+        """Parse the MPF index IFD (CIPA DC-007) - version, image count and MP entries"""
+        byte_order = bytes(data[:2])
+        if byte_order not in (b'II', b'MM'):
+            return {}
+        endian = 'little' if byte_order == b'II' else 'big'
+        
+        def u16(pos):
+            return int.from_bytes(data[pos:pos + 2], endian)
+        
+        def u32(pos):
+            return int.from_bytes(data[pos:pos + 4], endian)
+        
+        result = {}
+        ifd = u32(4)
+        entry_count = u16(ifd)
+        for i in range(entry_count):
+            entry = ifd + 2 + i * 12
+            tag, count, value = u16(entry), u32(entry + 4), u32(entry + 8)
+            if tag == 0xB000:
+                result["version"] = bytes(data[entry + 8:entry + 12]).decode('ascii', errors='ignore')
+            elif tag == 0xB001:
+                result["numberOfImages"] = value
+            elif tag == 0xB002:
+                images = []
+                for pos in range(value, min(value + count, len(data)) - 15, 16):
+                    attribute, image_size, image_offset = u32(pos), u32(pos + 4), u32(pos + 8)
+                    images.append({
+                        "type": f"0x{attribute & 0xFFFFFF:06X}",
+                        "size": image_size,
+                        # Offsets are relative to the MPF TIFF header; the first image is the file itself
+                        "offset": base_offset + image_offset if image_offset else 0
+                    })
+                result["images"] = images
+        return result
+    
+    def _parse_photoshop_irb(self, data: bytes) -> tuple:
+        """Walk Photoshop image resource blocks, returning resource IDs and decoded IPTC"""
+        resources = []
+        iptc = {}
+        pos = 0
+        while pos + 12 <= len(data):
+            if data[pos:pos + 4] not in (b'8BIM', b'PHUT', b'8B64', b'DCSR', b'AgHg'):
+                break
+            resource_id = int.from_bytes(data[pos + 4:pos + 6], 'big')
+            name_length = data[pos + 6]
+            pos += 6 + name_length + 1 + ((name_length + 1) % 2)  # Pascal string padded to even
+            size = int.from_bytes(data[pos:pos + 4], 'big')
+            pos += 4
+            resources.append(f"0x{resource_id:04X}")
+            if resource_id == 0x0404:  # IPTC-NAA record
+                iptc = self._parse_iptc(data[pos:pos + size])
+            pos += size + (size % 2)
+        return resources, iptc
+    
+    def _parse_iptc(self, data: bytes) -> Dict:
+        """Decode IPTC IIM datasets from record 2 (application record)"""
+        iptc = {}
+        pos = 0
+        while pos + 5 <= len(data) and data[pos] == 0x1C:
+            record, dataset = data[pos + 1], data[pos + 2]
+            length = int.from_bytes(data[pos + 3:pos + 5], 'big')
+            pos += 5
+            if length & 0x8000:  # Extended dataset: length of the length field follows
+                length_size = length & 0x7FFF
+                length = int.from_bytes(data[pos:pos + length_size], 'big')
+                pos += length_size
+            value = data[pos:pos + length].decode('utf-8', errors='replace')
+            pos += length
+            if record != 2 or dataset == 0:
+                continue
+            name = self.IPTC_DATASETS.get(dataset, f"2:{dataset}")
+            if name in iptc:
+                if not isinstance(iptc[name], list):
+                    iptc[name] = [iptc[name]]
+                iptc[name].append(value)
+            else:
+                iptc[name] = value
+        return iptc
+    
+    def _decode_pixels(self, file_path: str) -> tuple:
+        """Decode the first frame to a uint8 array; returns (pixels, channel names, note)."""
+        if self._pixel_cache is not None and self._pixel_cache[0] == file_path:
+            return self._pixel_cache[1]
+        decoded = self._decode_pixels_uncached(file_path)
+        self._pixel_cache = (file_path, decoded)
+        return decoded
+    
+    def _decode_pixels_uncached(self, file_path: str) -> tuple:
+        """Open the image with Pillow and convert supported 8-bit modes to an array."""
+        try:
+            with self._open_source(file_path) as f, Image.open(f) as img:
+                if img.mode not in ("L", "LA", "RGB", "RGBA"):
+                    return None, None, f"Unsupported pixel mode: {img.mode}"
+                return np.asarray(img), list(img.getbands()), None
+        except Exception as e:
+            return None, None, f"Could not decode pixels: {e}"
+    
+    def _file_entropy(self, file_path: Optional[str]) -> Optional[float]:
+        """Shannon entropy (bits/byte) of the whole file, histogrammed over an mmap"""
+        if np is None or not file_path:
+            return None
+        try:
+            with self._map_source(file_path) as mm:
+                return self._buffer_entropy(mm)
+        except (OSError, ValueError):
+            return None
+    
+    def _buffer_entropy(self, buffer) -> float:
+        """Shannon entropy (bits/byte) of a non-empty buffer"""
+        counts = self._byte_histogram(buffer)
+        total = counts.sum()
+        p = counts[counts > 0] / total
+        return round(float(-(p * np.log2(p)).sum()), 4)
+    
+    def _byte_histogram(self, buffer) -> "np.ndarray":
+        """256-bin byte histogram; bytes are counted in pairs through a uint16 view"""
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        even = len(data) & ~1
+        pairs = np.bincount(data[:even].view('<u2'), minlength=65536).reshape(256, 256)
+        counts = pairs.sum(axis=0) + pairs.sum(axis=1)
+        if even < len(data):
+            counts[data[-1]] += 1
+        del data
+        return counts
+    
     def _calculate_entropy(self, data: bytes) -> float:
         """Calculate Shannon entropy"""
         if not data:
@@ -794,7 +1871,7 @@ class LayeredInspector:
         for x in range(256):
             p_x = float(data.count(bytes([x]))) / len(data)
             if p_x > 0:
-                entropy += - p_x * (p_x.bit_length() - 1)
+                entropy += - p_x * math.log2(p_x)
         return round(entropy, 2)
     
     def _extract_gps_from_pil(self, img: Image.Image) -> Optional[Dict]:
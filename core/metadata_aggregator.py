@@ -6,16 +6,19 @@ This module provides the MetadataAggregator class for scanning directories,
 processing multiple files, and extracting metadata efficiently.
 """
 
+import itertools
 import os
 import sys
+import re
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Callable
-from datetime import datetime
+from typing import List, Dict, Optional, Any, Callable, BinaryIO, Iterator, Iterable, Union
+from datetime import datetime, timedelta
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from tqdm import tqdm
-import magic
 import json
+import mimetypes
+import threading
 
 # Import existing extractors
 from PIL import Image
@@ -23,6 +26,11 @@ from PIL.ExifTags import GPSTAGS, TAGS
 import exifread
 import eyed3
 
+try:
+    import magic
+except ImportError:
+    magic = None
+
 try:
     import moviepy.editor as mp
 except ImportError:
@@ -33,16 +41,47 @@ try:
 except ImportError:
     pdfplumber = None
 
-try:
-    from docx import Document as DocxDocument
-except ImportError:
-    DocxDocument = None
-
 from .data_models import (
     FileMetadata, ImageMetadata, VideoMetadata, 
     AudioMetadata, DocumentMetadata, GPSCoordinates,
     BatchProcessResult
 )
+from .icc_profile import parse_icc_profile
+from .watermark import detect_watermarks, NUMPY_AVAILABLE
+from .perceptual_hash import compute_perceptual_hashes
+from .feature_store import features_from_metadata
+from .archive_source import ArchiveMember, ARCHIVE_SUFFIXES, is_archive, split_member_path, iter_archive, list_members
+from .buffer_io import BufferReader
+from .mime_sniff import sniff_mime, SNIFF_BYTES
+from .mp4_reader import read_mp4_metadata
+from .mkv_reader import read_mkv_metadata
+from .audio_reader import read_audio_metadata
+from .ooxml_reader import read_ooxml_properties, OOXML_EXTENSIONS
+
+
+# Containers read natively instead of through moviepy, by MIME type
+CONTAINER_READERS = {
+    'video/mp4': read_mp4_metadata,
+    'video/quicktime': read_mp4_metadata,
+    'video/3gpp': read_mp4_metadata,
+    'video/3gpp2': read_mp4_metadata,
+    'audio/x-m4a': read_mp4_metadata,
+    'video/x-matroska': read_mkv_metadata,
+    'video/webm': read_mkv_metadata
+}
+
+# Video containers without a native reader; moviepy runs ffmpeg as a subprocess for these
+SUBPROCESS_EXTENSIONS = frozenset({'.avi', '.wmv', '.flv'})
+
+# Process backend: files per chunk are capped by total size and count
+CHUNK_BYTES = 32 * 1024 * 1024
+CHUNK_FILES = 64
+# Paths inspected to choose a backend, and the fewest worth a process pool
+BACKEND_SAMPLE_SIZE = 256
+PROCESS_MIN_FILES = 32
+
+# Last suffix of every archive type, to cheaply pre-filter names during a scan
+ARCHIVE_EXTENSIONS = frozenset(suffix[suffix.rindex('.'):] for suffix in ARCHIVE_SUFFIXES)
 
 
 class MetadataAggregator:
@@ -54,24 +93,44 @@ class MetadataAggregator:
     - Videos: MP4, AVI, MOV, MKV, WMV
     - Audio: MP3, WAV, FLAC, AAC, OGG
     - Documents: PDF, DOCX
+    - Archives: supported files inside ZIP/TAR archives, as archive!member paths
     """
     
     SUPPORTED_EXTENSIONS = {
         'image': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif'],
         'video': ['.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm'],
         'audio': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'],
-        'document': ['.pdf', '.docx']
+        'document': ['.pdf', '.docx', '.xlsx', '.pptx']
     }
     
-    def __init__(self, verbose: bool = True):
+    def __init__(
+        self,
+        verbose: bool = True,
+        perceptual_hashes: bool = False,
+        feature_store=None,
+        use_libmagic: bool = False,
+        count_words: bool = False
+    ):
         """
         Initialize the MetadataAggregator.
         
         Args:
             verbose: Whether to print progress information
+            perceptual_hashes: Whether to compute aHash/dHash/pHash for images
+            feature_store: Optional FeatureStore that receives a row per processed file
+            use_libmagic: Ask libmagic about files the built-in signature
+                table does not recognise (one handle per worker thread)
+            count_words: Count DOCX words from the body text instead of
+                taking the Words property saved in docProps/app.xml
         """
         self.verbose = verbose
-        self.mime = magic.Magic(mime=True)
+        self.perceptual_hashes = perceptual_hashes and NUMPY_AVAILABLE
+        self.feature_store = feature_store
+        if use_libmagic and magic is None:
+            raise ImportError("python-magic is required for use_libmagic")
+        self.use_libmagic = use_libmagic
+        self.count_words = count_words
+        self._magic = threading.local()
         self.results: List[Dict[str, Any]] = []
         self.errors: List[Dict[str, str]] = []
         self._progress_callback: Optional[Callable] = None
@@ -80,56 +139,138 @@ class MetadataAggregator:
         self, 
         path: str, 
         recursive: bool = True,
-        file_types: Optional[List[str]] = None
+        file_types: Optional[List[str]] = None,
+        include_archives: bool = True
     ) -> List[str]:
         """
         Scan directory for supported files.
         
+        Collects iter_scan() into a list; use iter_scan() directly to start
+        processing before the walk finishes.
+        
         Args:
-            path: Directory path to scan
+            path: Directory path to scan, or a single archive
             recursive: Whether to scan subdirectories
             file_types: List of file types to include (e.g., ['image', 'video'])
+            include_archives: Whether to list the members of archives found
         
         Returns:
             List of file paths
         """
-        path_obj = Path(path)
+        file_paths = list(self.iter_scan(path, recursive, file_types, include_archives))
         
-        if not path_obj.exists():
-            raise ValueError(f"Path does not exist: {path}")
+        if self.verbose:
+            print(f"Found {len(file_paths)} files in {path}")
         
-        if not path_obj.is_dir():
-            raise ValueError(f"Path is not a directory: {path}")
+        return file_paths
+    
+    def iter_scan(
+        self,
+        path: str,
+        recursive: bool = True,
+        file_types: Optional[List[str]] = None,
+        include_archives: bool = True,
+        with_stat: bool = False
+    ) -> Iterator[Union[str, tuple]]:
+        """
+        Walk a directory once and yield supported files as they are found.
         
-        # Determine which extensions to look for
-        extensions = []
-        if file_types is None:
-            # Include all supported types
-            for exts in self.SUPPORTED_EXTENSIONS.values():
-                extensions.extend(exts)
-        else:
-            for ft in file_types:
-                if ft in self.SUPPORTED_EXTENSIONS:
-                    extensions.extend(self.SUPPORTED_EXTENSIONS[ft])
-        
-        # Scan for files
-        files = []
-        if recursive:
-            for ext in extensions:
-                files.extend(path_obj.rglob(f"*{ext}"))
-                files.extend(path_obj.rglob(f"*{ext.upper()}"))
-        else:
-            for ext in extensions:
-                files.extend(path_obj.glob(f"*{ext}"))
-                files.extend(path_obj.glob(f"*{ext.upper()}"))
+        A single iterative os.scandir() pass matches extensions
+        case-insensitively against a frozenset; file and directory checks
+        use the type cached on each DirEntry, so no extra stat is made.
+        Each directory's files are yielded in name order before its
+        subdirectories are visited. ZIP and TAR archives are treated as
+        virtual directories: their supported members are yielded, in
+        archive order, as "archive!member" paths that process_file() and
+        process_batch() accept. Symlinked directories are not followed.
         
-        # Convert to strings and remove duplicates
-        file_paths = sorted(list(set(str(f) for f in files)))
+        With with_stat, each file's stat result (made once by its DirEntry)
+        is yielded alongside the path; iter_process() and process_batch()
+        accept these pairs and reuse the stat instead of stat'ing again.
         
-        if self.verbose:
-            print(f"Found {len(file_paths)} files in {path}")
+        Args:
+            path: Directory path to scan, or a single archive
+            recursive: Whether to scan subdirectories
+            file_types: List of file types to include (e.g., ['image', 'video'])
+            include_archives: Whether to list the members of archives found
+            with_stat: Yield (path, stat result) pairs instead of paths
+                (the stat is None for archive members)
         
-        return file_paths
+        Yields:
+            File paths, or (path, stat result) pairs
+        """
+        if not os.path.exists(path):
+            raise ValueError(f"Path does not exist: {path}")
+        
+        extensions = self._scan_extensions(file_types)
+        
+        if os.path.isfile(path) and is_archive(path):
+            for member_path in self._iter_archive_paths(str(path), extensions):
+                yield (member_path, None) if with_stat else member_path
+            return
+        if not os.path.isdir(path):
+            raise ValueError(f"Path is not a directory: {path}")
+        
+        pending = [str(path)]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                if self.verbose:
+                    print(f"Warning: Could not scan {directory}: {e}")
+                continue
+            
+            subdirectories = []
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            subdirectories.append(entry.path)
+                        continue
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in extensions:
+                    if not with_stat:
+                        yield entry.path
+                        continue
+                    try:
+                        yield entry.path, entry.stat()
+                    except OSError:
+                        continue
+                elif include_archives and ext in ARCHIVE_EXTENSIONS and is_archive(entry.name):
+                    for member_path in self._iter_archive_paths(entry.path, extensions):
+                        yield (member_path, None) if with_stat else member_path
+            
+            # Stack order: the first subdirectory is walked next
+            pending.extend(reversed(subdirectories))
+    
+    def _scan_extensions(self, file_types: Optional[List[str]]) -> frozenset:
+        """Lower-case extensions for the requested file types (all supported types if None)."""
+        if file_types is None:
+            file_types = list(self.SUPPORTED_EXTENSIONS)
+        return frozenset(
+            ext for ft in file_types
+            for ext in self.SUPPORTED_EXTENSIONS.get(ft, [])
+        )
+    
+    def _iter_archive_paths(self, archive: str, extensions: frozenset) -> Iterator[str]:
+        """Virtual paths of an archive's supported members, in archive order."""
+        try:
+            members = list_members(archive)
+        except Exception as e:
+            self.errors.append({'file': archive, 'error': str(e), 'type': 'archive_error'})
+            if self.verbose:
+                print(f"Warning: Could not read archive {archive}: {e}")
+            return
+        for name in members:
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield f"{archive}!{name}"
     
     def detect_file_type(self, file_path: str) -> str:
         """
@@ -149,29 +290,41 @@ class MetadataAggregator:
         
         return 'unknown'
     
-    def process_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+    def process_file(
+        self,
+        file_path: str,
+        member: Optional[ArchiveMember] = None,
+        file_stat: Optional[os.stat_result] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Process a single file and extract metadata.
         
         Args:
-            file_path: Path to file
+            file_path: Path to file, or an "archive!member" path
+            member: Archive member already read for file_path (optional)
+            file_stat: stat result from the scan, so the file is not stat'ed again (optional)
         
         Returns:
             Dictionary with metadata or None if failed
         """
         try:
+            if member is None:
+                archive, name = split_member_path(file_path)
+                if name is not None:
+                    return self._process_archive_members(archive, [name])[0][1]
+            
             file_type = self.detect_file_type(file_path)
             
             if file_type == 'image':
-                return self._process_image(file_path)
+                return self._process_image(file_path, member, file_stat)
             elif file_type == 'video':
-                return self._process_video(file_path)
+                return self._process_video(file_path, member, file_stat)
             elif file_type == 'audio':
-                return self._process_audio(file_path)
+                return self._process_audio(file_path, member, file_stat)
             elif file_type == 'document':
-                return self._process_document(file_path)
+                return self._process_document(file_path, member, file_stat)
             else:
-                return self._process_generic(file_path)
+                return self._process_generic(file_path, member, file_stat)
                 
         except Exception as e:
             self.errors.append({
@@ -183,21 +336,21 @@ class MetadataAggregator:
                 print(f"Error processing {file_path}: {e}")
             return None
     
-    def _process_image(self, file_path: str) -> Dict[str, Any]:
+    def _process_image(
+        self,
+        file_path: str,
+        member: Optional[ArchiveMember] = None,
+        file_stat: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
         """Extract metadata from image file."""
-        metadata = {
-            'file_path': file_path,
-            'file_name': os.path.basename(file_path),
-            'file_type': 'image',
-            'file_size': os.path.getsize(file_path),
-            'mime_type': self.mime.from_file(file_path),
-            'created_date': datetime.fromtimestamp(os.path.getctime(file_path)),
-            'modified_date': datetime.fromtimestamp(os.path.getmtime(file_path)),
-        }
+        with self._open(file_path, member) as f:
+            if file_stat is None and member is None:
+                file_stat = os.fstat(f.fileno())
+            metadata = self._base_metadata(file_path, 'image', member, file_stat, f.read(SNIFF_BYTES))
         
-        # Extract EXIF data
-        try:
-            with open(file_path, 'rb') as f:
+            # Extract EXIF data
+            try:
+                f.seek(0)
                 tags = exifread.process_file(f, details=False)
                 
                 # Basic image info
@@ -239,20 +392,29 @@ class MetadataAggregator:
                 if gps_data:
                     metadata['gps_coordinates'] = gps_data
                 
-        except Exception as e:
-            if self.verbose:
-                print(f"Warning: Could not extract EXIF from {file_path}: {e}")
+            except Exception as e:
+                if self.verbose:
+                    print(f"Warning: Could not extract EXIF from {file_path}: {e}")
         
-        # Get basic image info with PIL
-        try:
-            with Image.open(file_path) as img:
-                if 'width' not in metadata:
-                    metadata['width'] = img.width
-                if 'height' not in metadata:
-                    metadata['height'] = img.height
-                metadata['format'] = img.format
-        except:
-            pass
+            # Get basic image info with PIL
+            try:
+                f.seek(0)
+                with Image.open(f) as img:
+                    if 'width' not in metadata:
+                        metadata['width'] = img.width
+                    if 'height' not in metadata:
+                        metadata['height'] = img.height
+                    metadata['format'] = img.format
+                
+                    icc = img.info.get('icc_profile')
+                    if icc:
+                        profile = parse_icc_profile(icc)
+                        metadata['color_space'] = profile.get('description') or profile.get('colorSpace')
+                
+                    if self.perceptual_hashes:
+                        metadata['perceptual_hash'] = compute_perceptual_hashes(img)
+            except:
+                pass
         
         return metadata
     
@@ -299,19 +461,31 @@ class MetadataAggregator:
         except Exception as e:
             return None
     
-    def _process_video(self, file_path: str) -> Dict[str, Any]:
+    def _process_video(
+        self,
+        file_path: str,
+        member: Optional[ArchiveMember] = None,
+        file_stat: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
         """Extract metadata from video file."""
-        metadata = {
-            'file_path': file_path,
-            'file_name': os.path.basename(file_path),
-            'file_type': 'video',
-            'file_size': os.path.getsize(file_path),
-            'mime_type': self.mime.from_file(file_path),
-            'created_date': datetime.fromtimestamp(os.path.getctime(file_path)),
-            'modified_date': datetime.fromtimestamp(os.path.getmtime(file_path)),
-        }
+        metadata = self._base_metadata(file_path, 'video', member, file_stat)
         
-        if mp is None:
+        reader = CONTAINER_READERS.get(metadata['mime_type'])
+        if reader is not None:
+            try:
+                with self._open(file_path, member) as f:
+                    info = reader(f)
+                if info['error'] is None:
+                    self._apply_container_metadata(metadata, info)
+                    return metadata
+                if self.verbose:
+                    print(f"Warning: Could not read container metadata from {file_path}: {info['error']}")
+            except Exception as e:
+                if self.verbose:
+                    print(f"Warning: Could not read container metadata from {file_path}: {e}")
+        
+        # moviepy reads through ffmpeg, which needs a real file
+        if mp is None or member is not None:
             return metadata
         
         try:
@@ -332,17 +506,53 @@ class MetadataAggregator:
         
         return metadata
     
-    def _process_audio(self, file_path: str) -> Dict[str, Any]:
-        """Extract metadata from audio file."""
-        metadata = {
-            'file_path': file_path,
-            'file_name': os.path.basename(file_path),
-            'file_type': 'audio',
-            'file_size': os.path.getsize(file_path),
-            'mime_type': self.mime.from_file(file_path),
-            'created_date': datetime.fromtimestamp(os.path.getctime(file_path)),
-            'modified_date': datetime.fromtimestamp(os.path.getmtime(file_path)),
+    def _apply_container_metadata(self, metadata: Dict[str, Any], info: Dict[str, Any]) -> None:
+        """Copy fields from a container reader (read_mp4_metadata, read_mkv_metadata) into a result."""
+        fields = {
+            'duration': 'duration', 'width': 'width', 'height': 'height', 'rotation': 'rotation',
+            'frame_rate': 'frameRate', 'codec': 'codec', 'bitrate': 'bitrate',
+            'audio_codec': 'audioCodec', 'audio_sample_rate': 'audioSampleRate',
+            'audio_channels': 'audioChannels', 'creation_date': 'creationTime',
+            'gps_coordinates': 'gps'
         }
+        for key, source in fields.items():
+            if info.get(source) is not None:
+                metadata[key] = info[source]
+        
+        tags = info.get('tags') or {}
+        make = tags.get('com.apple.quicktime.make') or tags.get('make')
+        model = tags.get('com.apple.quicktime.model') or tags.get('model')
+        if make:
+            metadata['camera_make'] = str(make).strip()
+        if model:
+            metadata['camera_model'] = str(model).strip()
+        if tags:
+            metadata['tags'] = tags
+    
+    def _process_audio(
+        self,
+        file_path: str,
+        member: Optional[ArchiveMember] = None,
+        file_stat: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
+        """Extract metadata from audio file."""
+        metadata = self._base_metadata(file_path, 'audio', member, file_stat)
+        
+        try:
+            with self._open(file_path, member) as f:
+                info = read_audio_metadata(f)
+            if info['error'] is None:
+                self._apply_audio_metadata(metadata, info)
+                return metadata
+            if self.verbose:
+                print(f"Warning: Could not read audio headers from {file_path}: {info['error']}")
+        except Exception as e:
+            if self.verbose:
+                print(f"Warning: Could not read audio headers from {file_path}: {e}")
+        
+        # eyed3 only loads from a path, and only handles MP3
+        if member is not None or metadata['mime_type'] != 'audio/mpeg':
+            return metadata
         
         try:
             audiofile = eyed3.load(file_path)
@@ -371,23 +581,41 @@ class MetadataAggregator:
         
         return metadata
     
-    def _process_document(self, file_path: str) -> Dict[str, Any]:
+    def _apply_audio_metadata(self, metadata: Dict[str, Any], info: Dict[str, Any]) -> None:
+        """Copy stream properties and common tags from read_audio_metadata into a result."""
+        metadata['duration'] = info['duration']
+        metadata['bitrate'] = info['bitrate']
+        metadata['sample_rate'] = info['sampleRate']
+        metadata['channels'] = info['channels']
+        metadata['codec'] = info['codec']
+        
+        tags = info['tags']
+        for key in ('title', 'artist', 'album', 'album_artist', 'genre'):
+            if isinstance(tags.get(key), str):
+                metadata[key] = tags[key]
+        
+        # Dates are "2021", "2021-05-01", ...; track numbers "3" or "3/12"
+        year = re.match(r'\d{4}', str(tags.get('date', '')))
+        if year:
+            metadata['year'] = int(year.group())
+        track = re.match(r'\d+', str(tags.get('track', '')))
+        if track:
+            metadata['track_number'] = int(track.group())
+    
+    def _process_document(
+        self,
+        file_path: str,
+        member: Optional[ArchiveMember] = None,
+        file_stat: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
         """Extract metadata from document file."""
-        metadata = {
-            'file_path': file_path,
-            'file_name': os.path.basename(file_path),
-            'file_type': 'document',
-            'file_size': os.path.getsize(file_path),
-            'mime_type': self.mime.from_file(file_path),
-            'created_date': datetime.fromtimestamp(os.path.getctime(file_path)),
-            'modified_date': datetime.fromtimestamp(os.path.getmtime(file_path)),
-        }
+        metadata = self._base_metadata(file_path, 'document', member, file_stat)
         
         ext = Path(file_path).suffix.lower()
         
         if ext == '.pdf' and pdfplumber is not None:
             try:
-                with pdfplumber.open(file_path) as pdf:
+                with self._open(file_path, member) as f, pdfplumber.open(f) as pdf:
                     metadata['page_count'] = len(pdf.pages)
                     
                     if pdf.metadata:
@@ -409,55 +637,354 @@ class MetadataAggregator:
                 if self.verbose:
                     print(f"Warning: Could not extract PDF metadata from {file_path}: {e}")
         
-        elif ext == '.docx' and DocxDocument is not None:
+        elif ext in OOXML_EXTENSIONS:
             try:
-                doc = DocxDocument(file_path)
-                core_props = doc.core_properties
-                
-                metadata['title'] = core_props.title
-                metadata['author'] = core_props.author
-                metadata['subject'] = core_props.subject
-                metadata['keywords'] = core_props.keywords.split(',') if core_props.keywords else None
-                metadata['creation_date'] = core_props.created
-                metadata['modification_date'] = core_props.modified
-                
-                # Count words
-                word_count = 0
-                for para in doc.paragraphs:
-                    word_count += len(para.text.split())
-                metadata['word_count'] = word_count
-                
+                with self._open(file_path, member) as f:
+                    props = read_ooxml_properties(f, count_words=self.count_words)
+                if props['error'] is None:
+                    metadata['title'] = props.get('title')
+                    metadata['author'] = props.get('creator')
+                    metadata['subject'] = props.get('subject')
+                    metadata['creator'] = props.get('application')
+                    keywords = props.get('keywords')
+                    metadata['keywords'] = [k.strip() for k in re.split(r'[,;]', keywords) if k.strip()] if keywords else None
+                    metadata['creation_date'] = props.get('created')
+                    metadata['modification_date'] = props.get('modified')
+                    metadata['page_count'] = props.get('pages') or props.get('slides')
+                    metadata['word_count'] = props['wordCount'] if props['wordCount'] is not None else props.get('words')
+                elif self.verbose:
+                    print(f"Warning: Could not extract document properties from {file_path}: {props['error']}")
             except Exception as e:
                 if self.verbose:
-                    print(f"Warning: Could not extract DOCX metadata from {file_path}: {e}")
+                    print(f"Warning: Could not extract document properties from {file_path}: {e}")
         
         return metadata
     
-    def _process_generic(self, file_path: str) -> Dict[str, Any]:
+    def _process_generic(
+        self,
+        file_path: str,
+        member: Optional[ArchiveMember] = None,
+        file_stat: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
         """Extract basic metadata from unsupported file types."""
+        return self._base_metadata(file_path, 'unknown', member, file_stat)
+    
+    def _base_metadata(
+        self,
+        file_path: str,
+        file_type: str,
+        member: Optional[ArchiveMember] = None,
+        file_stat: Optional[os.stat_result] = None,
+        header: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        """
+        Name, size, MIME type and dates of a file or archive member.
+        
+        Size and dates come from a single stat (the scan's, when given).
+        The creation date is the birth time where the platform records one
+        (macOS, BSD, Windows) and the inode change time otherwise.
+        
+        Args:
+            file_path: Path to file (or archive!member path)
+            file_type: Detected file type
+            member: Archive member already read for file_path
+            file_stat: stat result for file_path (stat'ed here if None)
+            header: Leading bytes the caller has already read (read here if None)
+        """
+        if member is not None:
+            return {
+                'file_path': file_path,
+                'file_name': os.path.basename(member.name),
+                'file_type': file_type,
+                'file_size': member.size,
+                'mime_type': self._detect_mime(member.data[:SNIFF_BYTES] if header is None else header, member.name),
+                # Archives only record a modification time
+                'created_date': None,
+                'modified_date': member.modified,
+            }
+        if header is None:
+            with open(file_path, 'rb') as f:
+                header = f.read(SNIFF_BYTES)
+                if file_stat is None:
+                    file_stat = os.fstat(f.fileno())
+        elif file_stat is None:
+            file_stat = os.stat(file_path)
+        
+        birth_ns = getattr(file_stat, 'st_birthtime_ns', None)
+        if birth_ns is None and hasattr(file_stat, 'st_birthtime'):
+            birth_ns = int(file_stat.st_birthtime * 1_000_000_000)
         return {
             'file_path': file_path,
             'file_name': os.path.basename(file_path),
-            'file_type': 'unknown',
-            'file_size': os.path.getsize(file_path),
-            'mime_type': self.mime.from_file(file_path),
-            'created_date': datetime.fromtimestamp(os.path.getctime(file_path)),
-            'modified_date': datetime.fromtimestamp(os.path.getmtime(file_path)),
+            'file_type': file_type,
+            'file_size': file_stat.st_size,
+            'mime_type': self._detect_mime(header, file_path),
+            'created_date': _datetime_from_ns(file_stat.st_ctime_ns if birth_ns is None else birth_ns),
+            'modified_date': _datetime_from_ns(file_stat.st_mtime_ns),
         }
     
+    def _detect_mime(self, header: bytes, file_name: str) -> str:
+        """
+        MIME type from the signature table, then libmagic (if enabled), then the extension.
+        """
+        mime = sniff_mime(header, file_name)
+        if mime is None and self.use_libmagic:
+            # libmagic handles must not be shared between threads
+            handle = getattr(self._magic, 'handle', None)
+            if handle is None:
+                handle = self._magic.handle = magic.Magic(mime=True)
+            mime = handle.from_buffer(bytes(header))
+        if mime is None:
+            mime = mimetypes.guess_type(file_name, strict=False)[0]
+        return mime or 'application/octet-stream'
+    
+    def _open(self, file_path: str, member: Optional[ArchiveMember] = None) -> BinaryIO:
+        """Binary stream over a file, or over an archive member's data without copying it."""
+        if member is not None:
+            return BufferReader(member.data)
+        return open(file_path, 'rb')
+    
+    def _process_files(self, files: List[tuple]) -> List[tuple]:
+        """Process plain (path, stat result or None) files; (path, metadata or None) for each."""
+        return [(file_path, self.process_file(file_path, file_stat=file_stat)) for file_path, file_stat in files]
+    
+    def _process_archive_members(self, archive: str, names: List[str]) -> List[tuple]:
+        """
+        Process members of one archive in a single pass, in archive order.
+        
+        Args:
+            archive: Archive path
+            names: Member names to process
+        
+        Returns:
+            List of (virtual path, metadata or None), one per requested member
+        """
+        results = {}
+        failed = {}
+        try:
+            for member in iter_archive(archive, names):
+                if member.error is not None:
+                    failed[member.name] = member.error
+                    continue
+                results[member.name] = self.process_file(member.path, member)
+        except Exception as e:
+            # The archive itself is unreadable past this point (e.g. a corrupt TAR stream);
+            # members already processed keep their results
+            reason = f"Could not read {archive}: {e}"
+        else:
+            reason = None
+        
+        for name in names:
+            if name in results:
+                continue
+            error = failed.get(name) or reason or f"{name} not found in {archive}"
+            self.errors.append({
+                'file': f"{archive}!{name}",
+                'error': error,
+                'type': 'processing_error'
+            })
+            if self.verbose:
+                print(f"Error processing {archive}!{name}: {error}")
+        return [(f"{archive}!{name}", results.get(name)) for name in names]
+    
+    def _run_tasks(self, tasks: List[tuple]) -> List[tuple]:
+        """Run a chunk of tasks from _iter_tasks(); (path, metadata or None) for every path covered."""
+        outcomes = []
+        for task in tasks:
+            if task[0] == 'archive':
+                outcomes.extend(self._process_archive_members(task[1], task[2]))
+            else:
+                outcomes.extend(self._process_files(task[1]))
+        return outcomes
+    
+    def _iter_tasks(self, paths: Iterable[Union[str, tuple]]) -> Iterator[tuple]:
+        """
+        Group paths into picklable tasks: ('files', [(path, stat)]) or ('archive', archive, names).
+        
+        Items are paths or (path, stat result) pairs from iter_scan(). A run
+        of consecutive members of the same archive (as iter_scan() yields
+        them) becomes one task, so the archive is opened, and a TAR
+        decompressed, once per run.
+        """
+        archive_run, names = None, []
+        for item in paths:
+            file_path, file_stat = item if isinstance(item, tuple) else (item, None)
+            if archive_run is not None and file_path.startswith(archive_run + '!'):
+                names.append(file_path[len(archive_run) + 1:])
+                continue
+            archive, name = split_member_path(file_path)
+            if names:
+                yield ('archive', archive_run, names)
+            archive_run, names = (archive, [name]) if name is not None else (None, [])
+            if name is None:
+                yield ('files', [(file_path, file_stat)])
+        if names:
+            yield ('archive', archive_run, names)
+    
+    def _iter_chunks(self, tasks: Iterator[tuple], chunk_bytes: int, chunk_files: int) -> Iterator[List[tuple]]:
+        """
+        Group tasks into chunks of about chunk_bytes or chunk_files, whichever comes first.
+        
+        Many small files share a chunk so inter-process overhead is paid
+        once per chunk, while a large file (or an archive run) gets a chunk
+        of its own and does not hold up a worker's other files.
+        """
+        chunk, size = [], 0
+        for task in tasks:
+            if task[0] == 'archive':
+                task_size = chunk_bytes
+            else:
+                file_path, file_stat = task[1][0]
+                try:
+                    task_size = file_stat.st_size if file_stat is not None else os.path.getsize(file_path)
+                except OSError:
+                    task_size = 0
+            if chunk and (size + task_size > chunk_bytes or len(chunk) >= chunk_files):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(task)
+            size += task_size
+        if chunk:
+            yield chunk
+    
+    def _choose_backend(self, paths: List[Union[str, tuple]], exhausted: bool, max_workers: int) -> str:
+        """
+        Pick 'process' or 'thread' from a sample of the paths.
+        
+        Extraction is mostly pure-Python work serialized by the GIL (EXIF,
+        Pillow headers, audio headers, PDF/OOXML parsing, and the MP4/MOV
+        and MKV/WebM readers), so a mostly-CPU-bound mix goes to processes.
+        Only AVI/WMV/FLV files still go through moviepy, which waits on an
+        ffmpeg subprocess; a mix dominated by those, or a batch too small to
+        be worth a pool start-up, stays on threads.
+        """
+        if max_workers < 2 or (os.cpu_count() or 1) < 2:
+            return 'thread'
+        if exhausted and len(paths) < PROCESS_MIN_FILES:
+            return 'thread'
+        file_paths = [item[0] if isinstance(item, tuple) else item for item in paths]
+        cpu_bound = sum(1 for path in file_paths if Path(path).suffix.lower() not in SUBPROCESS_EXTENSIONS)
+        return 'process' if cpu_bound * 2 >= len(paths) else 'thread'
+    
+    def iter_process(
+        self,
+        paths: Iterable[Union[str, tuple]],
+        max_workers: int = 4,
+        max_in_flight: Optional[int] = None,
+        backend: str = 'auto',
+        chunk_bytes: int = CHUNK_BYTES,
+        chunk_files: int = CHUNK_FILES
+    ) -> Iterator[tuple]:
+        """
+        Process files in parallel, yielding results as they complete.
+        
+        Paths are pulled from the iterable lazily (e.g. straight from
+        iter_scan()) and at most max_in_flight tasks are submitted at a
+        time, so memory stays flat however many files there are. Results
+        are not kept on the aggregator; failures are recorded in
+        self.errors.
+        
+        The 'thread' backend runs one file per task in this process. The
+        'process' backend sends size-aware chunks of files to worker
+        processes, each holding its own aggregator (and extractor state)
+        built once at start-up. 'auto' chooses from the file-type mix of
+        the first paths.
+        
+        Args:
+            paths: Iterable of file paths (or archive!member paths), or of
+                (path, stat result) pairs from iter_scan(with_stat=True)
+            max_workers: Maximum number of parallel workers
+            max_in_flight: Tasks (chunks for 'process') submitted but not yet
+                consumed (defaults to 4 per worker)
+            backend: 'thread', 'process' or 'auto'
+            chunk_bytes: Target bytes of files per chunk ('process' only)
+            chunk_files: Maximum files per chunk ('process' only)
+        
+        Yields:
+            (file path, metadata dict or None if processing failed), in completion order
+        """
+        if backend not in ('thread', 'process', 'auto'):
+            raise ValueError(f"Unsupported backend: {backend}")
+        
+        paths = iter(paths)
+        if backend == 'auto':
+            sample = list(itertools.islice(paths, BACKEND_SAMPLE_SIZE))
+            backend = self._choose_backend(sample, len(sample) < BACKEND_SAMPLE_SIZE, max_workers)
+            paths = itertools.chain(sample, paths)
+        if self.verbose:
+            print(f"Processing with {max_workers} {backend} workers")
+        
+        max_in_flight = max(max_in_flight or 4 * max_workers, 1)
+        if backend == 'process':
+            settings = {'verbose': self.verbose, 'perceptual_hashes': self.perceptual_hashes, 'use_libmagic': self.use_libmagic,
+                        'count_words': self.count_words}
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(settings,))
+            chunks = self._iter_chunks(self._iter_tasks(paths), chunk_bytes, chunk_files)
+            run = _process_in_worker
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            chunks = ([task] for task in self._iter_tasks(paths))
+            run = self._run_tasks
+        in_flight = {}
+        
+        try:
+            while True:
+                # Top up the window, then wait for at least one task to finish
+                for chunk in chunks:
+                    in_flight[executor.submit(run, chunk)] = chunk
+                    if len(in_flight) >= max_in_flight:
+                        break
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    try:
+                        outcomes = future.result()
+                        if backend == 'process':
+                            # Errors recorded in the worker come back with its results
+                            outcomes, errors = outcomes
+                            self.errors.extend(errors)
+                    except Exception as e:
+                        outcomes = [(file_path, None) for file_path in _task_paths(chunk)]
+                        for file_path, _ in outcomes:
+                            self.errors.append({
+                                'file': file_path,
+                                'error': str(e),
+                                'type': 'execution_error'
+                            })
+                    
+                    for file_path, result in outcomes:
+                        # Appended from this thread only, so the store has a single writer
+                        if result and self.feature_store is not None:
+                            self.feature_store.append(os.path.abspath(file_path), features_from_metadata(result))
+                        yield file_path, result
+        finally:
+            # A consumer that stops early should not wait for queued work
+            executor.shutdown(cancel_futures=True)
+            if self.feature_store is not None:
+                self.feature_store.flush()
+    
     def process_batch(
         self, 
-        file_list: List[str],
+        file_list: Iterable[Union[str, tuple]],
         max_workers: int = 4,
-        show_progress: bool = True
+        show_progress: bool = True,
+        backend: str = 'auto'
     ) -> BatchProcessResult:
         """
-        Process multiple files in parallel.
+        Process multiple files in parallel and keep every result.
+        
+        Convenience wrapper around iter_process() that collects results in
+        self.results; for very large corpora iterate iter_process() instead.
         
         Args:
-            file_list: List of file paths to process
+            file_list: File paths (or (path, stat result) pairs) to process,
+                as a list or any iterable
             max_workers: Maximum number of parallel workers
             show_progress: Whether to show progress bar
+            backend: 'thread', 'process' or 'auto' (see iter_process)
         
         Returns:
             BatchProcessResult with statistics
@@ -471,44 +998,25 @@ class MetadataAggregator:
         
         # Create progress bar
         progress_bar = tqdm(
-            total=len(file_list),
+            total=len(file_list) if hasattr(file_list, '__len__') else None,
             desc="Processing files",
             disable=not show_progress
         )
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_file = {
-                executor.submit(self.process_file, file_path): file_path 
-                for file_path in file_list
-            }
-            
-            # Process completed tasks
-            for future in as_completed(future_to_file):
-                file_path = future_to_file[future]
-                try:
-                    result = future.result()
-                    if result:
-                        self.results.append(result)
-                        successful += 1
-                    else:
-                        failed += 1
-                except Exception as e:
-                    failed += 1
-                    self.errors.append({
-                        'file': file_path,
-                        'error': str(e),
-                        'type': 'execution_error'
-                    })
-                
-                progress_bar.update(1)
+        for _, result in self.iter_process(file_list, max_workers=max_workers, backend=backend):
+            if result:
+                self.results.append(result)
+                successful += 1
+            else:
+                failed += 1
+            progress_bar.update(1)
         
         progress_bar.close()
         
         processing_time = time.time() - start_time
         
         result = BatchProcessResult(
-            total_files=len(file_list),
+            total_files=successful + failed,
             successful=successful,
             failed=failed,
             processing_time=processing_time,
@@ -525,6 +1033,38 @@ class MetadataAggregator:
         
         return result
     
+    def detect_watermarks(self, max_workers: Optional[int] = None) -> int:
+        """
+        Decode invisible-watermark (DWT-DCT) marks for all processed images.
+        
+        Runs in a process pool since decoding is CPU-bound; results are stored
+        under 'invisible_watermark' on each image result.
+        
+        Args:
+            max_workers: Worker processes (defaults to the CPU count)
+        
+        Returns:
+            Number of images carrying a known watermark
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for watermark detection")
+        
+        images = {r['file_path']: r for r in self.results if r.get('file_type') == 'image'}
+        detections = detect_watermarks(list(images), max_workers=max_workers)
+        
+        found = 0
+        for file_path, detection in detections.items():
+            images[file_path]['invisible_watermark'] = detection
+            if self.feature_store is not None:
+                self.feature_store.append(os.path.abspath(file_path), features_from_metadata(images[file_path]))
+            if detection.get('detected'):
+                found += 1
+        
+        if self.verbose:
+            print(f"Invisible watermarks: {found} of {len(images)} images")
+        
+        return found
+    
     def get_results(self) -> List[Dict[str, Any]]:
         """Get all processing results."""
         return self.results
@@ -558,33 +1098,78 @@ class MetadataAggregator:
             print(f"Results exported to {output_path}")
 
 
+def _datetime_from_ns(ns: int) -> datetime:
+    """Local datetime from a nanosecond timestamp, exact to the microsecond."""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds) + timedelta(microseconds=remainder // 1000)
+
+
+def _task_paths(tasks: List[tuple]) -> List[str]:
+    """Every path covered by a chunk of tasks."""
+    paths = []
+    for task in tasks:
+        if task[0] == 'archive':
+            paths.extend(f"{task[1]}!{name}" for name in task[2])
+        else:
+            paths.extend(file_path for file_path, _ in task[1])
+    return paths
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(settings: Dict[str, Any]) -> None:
+    """Build one aggregator per worker process and load Pillow's format plugins up front."""
+    Image.init()
+    _worker_state["aggregator"] = MetadataAggregator(**settings)
+
+
+def _process_in_worker(tasks: List[tuple]) -> tuple:
+    """
+    Run a chunk of tasks in a worker process.
+    
+    Returns (outcomes, errors). The whole chunk travels back as one pickle,
+    which stores each metadata key string once rather than once per file.
+    """
+    aggregator = _worker_state["aggregator"]
+    aggregator.errors = []
+    outcomes = aggregator._run_tasks(tasks)
+    return outcomes, aggregator.errors
+
+
 if __name__ == "__main__":
     # Example usage
     import argparse
     
     parser = argparse.ArgumentParser(description="Aggregate metadata from files")
-    parser.add_argument("path", help="Directory path to scan")
+    parser.add_argument("path", help="Directory path (or ZIP/TAR archive) to scan")
     parser.add_argument("--recursive", "-r", action="store_true", help="Scan recursively")
     parser.add_argument("--types", "-t", nargs="+", help="File types to process")
     parser.add_argument("--output", "-o", help="Output file path")
     parser.add_argument("--format", "-f", choices=['json', 'csv'], default='json', help="Output format")
     parser.add_argument("--workers", "-w", type=int, default=4, help="Number of parallel workers")
+    parser.add_argument("--libmagic", action="store_true",
+                        help="Fall back to libmagic for files the built-in signatures do not recognise")
+    parser.add_argument("--word-count", action="store_true",
+                        help="Count DOCX words from the body text instead of the saved Words property")
+    parser.add_argument("--backend", "-b", choices=['auto', 'thread', 'process'], default='auto',
+                        help="Run workers as threads or processes (auto picks from the file-type mix)")
     
     args = parser.parse_args()
     
     # Create aggregator
-    aggregator = MetadataAggregator(verbose=True)
+    aggregator = MetadataAggregator(verbose=True, use_libmagic=args.libmagic, count_words=args.word_count)
+    
+    # Scan directory; processing starts on the first file found, reusing the scan's stat
+    files = aggregator.iter_scan(args.path, recursive=args.recursive, file_types=args.types, with_stat=True)
     
-    # Scan directory
-    files = aggregator.scan_directory(args.path, recursive=args.recursive, file_types=args.types)
+    # Process files
+    result = aggregator.process_batch(files, max_workers=args.workers, backend=args.backend)
     
-    if not files:
+    if not result.total_files:
         print("No files found!")
         sys.exit(1)
     
-    # Process files
-    result = aggregator.process_batch(files, max_workers=args.workers)
-    
     # Export if requested
     if args.output:
         aggregator.export_results(args.output, format=args.format)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+MIME Sniff - MIME type detection from a file's leading bytes.
+
+This module provides sniff_mime(), which matches the first SNIFF_BYTES of a
+file against an in-process signature table covering the image, video,
+audio, document and archive formats BareBlocks handles. It needs no file
+access of its own, so callers pass the header they have already read, and
+it is safe to call from any thread or process. Containers whose header is
+shared by several formats (ISO-BMFF brands, RIFF forms, EBML doc types,
+ZIP-based office documents) are told apart by the brand or form bytes, or
+by the file extension for OOXML.
+"""
+
+import os
+from typing import Optional
+
+
+# Bytes a caller should read for sniff_mime() (the TAR magic sits at 257)
+SNIFF_BYTES = 512
+
+# (offset, magic bytes, MIME type), checked in order
+SIGNATURES = [
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (0, b"II*\x00", "image/tiff"),
+    (0, b"MM\x00*", "image/tiff"),
+    (0, b"BM", "image/bmp"),
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"ID3", "audio/mpeg"),
+    (0, b"fLaC", "audio/flac"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"FLV\x01", "video/x-flv"),
+    (0, b"0&\xb2u\x8ef\xcf\x11", "video/x-ms-asf"),
+    (0, b"\x1f\x8b", "application/gzip"),
+    (0, b"(\xb5/\xfd", "application/zstd"),
+    (257, b"ustar", "application/x-tar"),
+]
+
+# ISO-BMFF major brands (bytes 8-12, after "ftyp")
+FTYP_BRANDS = {
+    b"heic": "image/heic", b"heix": "image/heic", b"mif1": "image/heic", b"msf1": "image/heic",
+    b"avif": "image/avif", b"avis": "image/avif",
+    b"qt  ": "video/quicktime",
+    b"M4A ": "audio/x-m4a", b"M4B ": "audio/x-m4a",
+    b"3gp4": "video/3gpp", b"3gp5": "video/3gpp", b"3g2a": "video/3gpp2",
+}
+
+# RIFF form types (bytes 8-12)
+RIFF_FORMS = {b"WEBP": "image/webp", b"WAVE": "audio/x-wav", b"AVI ": "video/x-msvideo"}
+
+# ZIP-based formats recognised by extension
+ZIP_EXTENSIONS = {
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+
+
+def sniff_mime(header: bytes, file_name: Optional[str] = None) -> Optional[str]:
+    """
+    MIME type of a file from its leading bytes.
+
+    Args:
+        header: First SNIFF_BYTES (or more) of the file
+        file_name: Name used to tell ZIP-based office formats apart
+
+    Returns:
+        MIME type, or None if no signature matches
+    """
+    header = bytes(header[:SNIFF_BYTES])
+    for offset, signature, mime in SIGNATURES:
+        if header.startswith(signature, offset):
+            return mime
+
+    if header[4:8] == b"ftyp":
+        return FTYP_BRANDS.get(header[8:12], "video/mp4")
+    if header.startswith(b"RIFF") and header[8:12] in RIFF_FORMS:
+        return RIFF_FORMS[header[8:12]]
+    if header.startswith(EBML_MAGIC):
+        # The DocType string sits in the EBML header right after the magic
+        return "video/webm" if b"webm" in header[:64] else "video/x-matroska"
+    if header.startswith(b"PK\x03\x04"):
+        ext = os.path.splitext(file_name or "")[1].lower()
+        return ZIP_EXTENSIONS.get(ext, "application/zip")
+    # MPEG audio frame sync: MP3 (layer III) or ADTS AAC (layer 0)
+    if len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0:
+        return "audio/aac" if header[1] & 0x06 == 0 else "audio/mpeg"
+    return None
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+MKV Reader - Container-level metadata from Matroska and WebM files.
+
+This module provides read_mkv_metadata(), a pure-Python EBML reader that
+gets duration, dates, muxing and writing application, track codecs,
+dimensions, frame rate, audio format and tags without touching the media
+data. The EBML header gives the DocType. The Segment's children are then
+walked by their element headers alone, and only Info, Tracks, Tags and
+SeekHead payloads are read. The walk stops at the first Cluster. Tags
+(and any other element written after the media, as mkvmerge and most
+muxers do) are found through the SeekHead offsets and read with one seek,
+so a recording of any length costs a few kilobytes of I/O.
+"""
+
+import struct
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Iterator, Tuple, Union, BinaryIO
+
+
+# Largest Info/Tracks/Tags/SeekHead element read into memory
+MAX_ELEMENT_SIZE = 16 * 1024 * 1024
+
+# Matroska DateUTC counts nanoseconds from 2001-01-01 UTC
+EPOCH_2001 = datetime(2001, 1, 1)
+
+# Default TimecodeScale: segment ticks are 1 ms
+DEFAULT_TIMECODE_SCALE = 1000000
+
+# Element IDs (with their length marker bits, as stored)
+EBML = 0x1A45DFA3
+DOC_TYPE = 0x4282
+SEGMENT = 0x18538067
+SEEK_HEAD = 0x114D9B74
+SEEK = 0x4DBB
+SEEK_ID = 0x53AB
+SEEK_POSITION = 0x53AC
+INFO = 0x1549A966
+TIMECODE_SCALE = 0x2AD7B1
+DURATION = 0x4489
+DATE_UTC = 0x4461
+TITLE = 0x7BA9
+MUXING_APP = 0x4D80
+WRITING_APP = 0x5741
+TRACKS = 0x1654AE6B
+TRACK_ENTRY = 0xAE
+TRACK_NUMBER = 0xD7
+TRACK_UID = 0x73C5
+TRACK_TYPE = 0x83
+CODEC_ID = 0x86
+NAME = 0x536E
+LANGUAGE = 0x22B59C
+DEFAULT_DURATION = 0x23E383
+VIDEO = 0xE0
+PIXEL_WIDTH = 0xB0
+PIXEL_HEIGHT = 0xBA
+AUDIO = 0xE1
+SAMPLING_FREQUENCY = 0xB5
+CHANNELS = 0x9F
+BIT_DEPTH = 0x6264
+TAGS = 0x1254C367
+TAG = 0x7373
+TARGETS = 0x63C0
+TAG_TRACK_UID = 0x63C5
+SIMPLE_TAG = 0x67C8
+TAG_NAME = 0x45A3
+TAG_STRING = 0x4487
+TAG_BINARY = 0x4485
+CLUSTER = 0x1F43B675
+
+# Segment children whose payload is read; everything else is skipped by size
+WANTED = (SEEK_HEAD, INFO, TRACKS, TAGS)
+
+TRACK_TYPES = {1: "video", 2: "audio", 3: "complex", 16: "logo", 17: "subtitle", 18: "buttons", 32: "control", 33: "metadata"}
+
+
+def read_mkv_metadata(source: Union[str, BinaryIO]) -> Dict[str, Any]:
+    """
+    Read container metadata from a Matroska (.mkv/.mka) or WebM file.
+
+    Args:
+        source: Path to the file, or a seekable binary stream over it
+
+    Returns:
+        Dictionary with docType, duration, creationTime, title, muxingApp,
+        writingApp, width, height, frameRate, codec, audioCodec,
+        audioSampleRate, audioChannels, bitrate, tracks, tags and error
+    """
+    result = {
+        "docType": None,
+        "duration": None,
+        "creationTime": None,
+        "title": None,
+        "muxingApp": None,
+        "writingApp": None,
+        "width": None,
+        "height": None,
+        "frameRate": None,
+        "codec": None,
+        "audioCodec": None,
+        "audioSampleRate": None,
+        "audioChannels": None,
+        "bitrate": None,
+        "tracks": [],
+        "tags": {},
+        "error": None
+    }
+
+    with open(source, "rb") if isinstance(source, str) else nullcontext(source) as f:
+        file_size = f.seek(0, 2)
+        f.seek(0)
+        header = _read_element_header(f, 0)
+        if header is None or header[0] != EBML or header[2] is None:
+            result["error"] = "Not an EBML file"
+            return result
+        _, header_size, size = header
+        f.seek(header_size)
+        ebml = f.read(min(size, 4096))
+        for element_id, start, end in _elements(ebml):
+            if element_id == DOC_TYPE:
+                result["docType"] = _string(ebml, start, end)
+
+        segment_offset = header_size + size
+        header = _read_element_header(f, segment_offset)
+        if header is None or header[0] != SEGMENT:
+            result["error"] = "No Segment element"
+            return result
+        _, header_size, segment_size = header
+        segment_start = segment_offset + header_size
+        segment_end = file_size if segment_size is None else min(segment_start + segment_size, file_size)
+
+        try:
+            payloads = _read_segment_children(f, segment_start, segment_end)
+        except (struct.error, IndexError, ValueError) as e:
+            result["error"] = f"Malformed Segment: {e}"
+            return result
+
+    try:
+        if INFO in payloads:
+            _parse_info(payloads[INFO], result)
+        if TRACKS in payloads:
+            _parse_tracks(payloads[TRACKS], result)
+        if TAGS in payloads:
+            _parse_tags(payloads[TAGS], result)
+    except (struct.error, IndexError, ValueError) as e:
+        result["error"] = f"Malformed metadata: {e}"
+
+    if result["duration"]:
+        result["bitrate"] = int((segment_end - segment_start) * 8 / result["duration"])
+    return result
+
+
+def _read_segment_children(f, segment_start: int, segment_end: int) -> Dict[int, bytes]:
+    """
+    Payloads of the Segment's Info, Tracks and Tags elements.
+
+    Children are walked by header up to the first Cluster (or an element of
+    unknown size); elements placed after the media are then read from the
+    positions listed in the SeekHead(s).
+    """
+    payloads = {}
+    seek_positions = {}
+    visited = set()
+
+    def read_at(offset: int) -> Optional[int]:
+        """Read the element at an offset if wanted; offset of the next one, or None at a Cluster."""
+        visited.add(offset)
+        header = _read_element_header(f, offset)
+        if header is None:
+            return None
+        element_id, header_size, size = header
+        if element_id == CLUSTER or size is None:
+            return None
+        if element_id in WANTED and element_id not in payloads and size <= MAX_ELEMENT_SIZE:
+            f.seek(offset + header_size)
+            payload = f.read(size)
+            if element_id == SEEK_HEAD:
+                _parse_seek_head(payload, segment_start, seek_positions)
+            else:
+                payloads[element_id] = payload
+        return offset + header_size + size
+
+    offset = segment_start
+    while offset is not None and offset < segment_end:
+        offset = read_at(offset)
+
+    # A SeekHead may list a second SeekHead, so keep going until nothing new turns up
+    pending = True
+    while pending:
+        pending = False
+        for element_id, positions in list(seek_positions.items()):
+            if element_id in payloads:
+                continue
+            for position in positions:
+                if position not in visited and position < segment_end:
+                    read_at(position)
+                    pending = True
+    return payloads
+
+
+def _parse_seek_head(data: bytes, segment_start: int, seek_positions: Dict[int, list]) -> None:
+    """Absolute file offsets of the elements a SeekHead lists, by element id."""
+    for element_id, start, end in _elements(data):
+        if element_id != SEEK:
+            continue
+        target = position = None
+        for child_id, child_start, child_end in _elements(data, start, end):
+            if child_id == SEEK_ID:
+                target = _uint(data, child_start, child_end)
+            elif child_id == SEEK_POSITION:
+                position = _uint(data, child_start, child_end)
+        if target in WANTED and position is not None:
+            seek_positions.setdefault(target, []).append(segment_start + position)
+
+
+def _parse_info(data: bytes, result: Dict[str, Any]) -> None:
+    scale = DEFAULT_TIMECODE_SCALE
+    duration = None
+    for element_id, start, end in _elements(data):
+        if element_id == TIMECODE_SCALE:
+            scale = _uint(data, start, end) or DEFAULT_TIMECODE_SCALE
+        elif element_id == DURATION:
+            duration = _float(data, start, end)
+        elif element_id == DATE_UTC and end - start == 8:
+            result["creationTime"] = EPOCH_2001 + timedelta(microseconds=struct.unpack_from(">q", data, start)[0] // 1000)
+        elif element_id == TITLE:
+            result["title"] = _string(data, start, end)
+        elif element_id == MUXING_APP:
+            result["muxingApp"] = _string(data, start, end)
+        elif element_id == WRITING_APP:
+            result["writingApp"] = _string(data, start, end)
+    if duration:
+        result["duration"] = round(duration * scale / 1e9, 3)
+
+
+def _parse_tracks(data: bytes, result: Dict[str, Any]) -> None:
+    for element_id, start, end in _elements(data):
+        if element_id == TRACK_ENTRY:
+            result["tracks"].append(_parse_track_entry(data, start, end))
+
+    video = next((t for t in result["tracks"] if t["type"] == "video"), None)
+    audio = next((t for t in result["tracks"] if t["type"] == "audio"), None)
+    if video:
+        result.update({
+            "width": video["width"],
+            "height": video["height"],
+            "frameRate": video["frameRate"],
+            "codec": video["codec"]
+        })
+    if audio:
+        result.update({
+            "audioCodec": audio["codec"],
+            "audioSampleRate": audio["sampleRate"],
+            "audioChannels": audio["channels"]
+        })
+
+
+def _parse_track_entry(data: bytes, start: int, end: int) -> Dict[str, Any]:
+    track = {
+        "number": None,
+        "uid": None,
+        "type": None,
+        "codec": None,
+        "name": None,
+        "language": None,
+        "width": None,
+        "height": None,
+        "frameRate": None,
+        "sampleRate": None,
+        "channels": None,
+        "bitDepth": None,
+        "tags": {}
+    }
+    # CodecPrivate and other binary children are skipped by size
+    for element_id, child_start, child_end in _elements(data, start, end):
+        if element_id == TRACK_NUMBER:
+            track["number"] = _uint(data, child_start, child_end)
+        elif element_id == TRACK_UID:
+            track["uid"] = _uint(data, child_start, child_end)
+        elif element_id == TRACK_TYPE:
+            kind = _uint(data, child_start, child_end)
+            track["type"] = TRACK_TYPES.get(kind, str(kind))
+        elif element_id == CODEC_ID:
+            track["codec"] = _string(data, child_start, child_end)
+        elif element_id == NAME:
+            track["name"] = _string(data, child_start, child_end)
+        elif element_id == LANGUAGE:
+            track["language"] = _string(data, child_start, child_end)
+        elif element_id == DEFAULT_DURATION:
+            # Nanoseconds per frame
+            frame_ns = _uint(data, child_start, child_end)
+            if frame_ns:
+                track["frameRate"] = round(1e9 / frame_ns, 3)
+        elif element_id == VIDEO:
+            for video_id, video_start, video_end in _elements(data, child_start, child_end):
+                if video_id == PIXEL_WIDTH:
+                    track["width"] = _uint(data, video_start, video_end)
+                elif video_id == PIXEL_HEIGHT:
+                    track["height"] = _uint(data, video_start, video_end)
+        elif element_id == AUDIO:
+            for audio_id, audio_start, audio_end in _elements(data, child_start, child_end):
+                if audio_id == SAMPLING_FREQUENCY:
+                    rate = _float(data, audio_start, audio_end)
+                    track["sampleRate"] = int(rate) if rate else None
+                elif audio_id == CHANNELS:
+                    track["channels"] = _uint(data, audio_start, audio_end)
+                elif audio_id == BIT_DEPTH:
+                    track["bitDepth"] = _uint(data, audio_start, audio_end)
+    if track["type"] == "audio" and track["channels"] is None:
+        track["channels"] = 1
+    if track["type"] == "audio" and track["sampleRate"] is None:
+        track["sampleRate"] = 8000
+    return track
+
+
+def _parse_tags(data: bytes, result: Dict[str, Any]) -> None:
+    """Global tags into result["tags"], track-targeted ones into that track's tags."""
+    tracks_by_uid = {t["uid"]: t for t in result["tracks"] if t["uid"] is not None}
+    for element_id, start, end in _elements(data):
+        if element_id != TAG:
+            continue
+        target = result["tags"]
+        for child_id, child_start, child_end in _elements(data, start, end):
+            if child_id == TARGETS:
+                for target_id, target_start, target_end in _elements(data, child_start, child_end):
+                    if target_id == TAG_TRACK_UID:
+                        uid = _uint(data, target_start, target_end)
+                        if uid in tracks_by_uid:
+                            target = tracks_by_uid[uid]["tags"]
+        for child_id, child_start, child_end in _elements(data, start, end):
+            if child_id == SIMPLE_TAG:
+                _parse_simple_tag(data, child_start, child_end, target, "")
+
+
+def _parse_simple_tag(data: bytes, start: int, end: int, tags: Dict[str, Any], prefix: str) -> None:
+    """One SimpleTag; nested tags are named PARENT/CHILD and binary values reported by size."""
+    name = value = None
+    nested = []
+    for element_id, child_start, child_end in _elements(data, start, end):
+        if element_id == TAG_NAME:
+            name = _string(data, child_start, child_end)
+        elif element_id == TAG_STRING:
+            value = _string(data, child_start, child_end)
+        elif element_id == TAG_BINARY:
+            value = f"<binary, {child_end - child_start} bytes>"
+        elif element_id == SIMPLE_TAG:
+            nested.append((child_start, child_end))
+    if not name:
+        return
+    name = prefix + name
+    if value is not None:
+        tags.setdefault(name, value)
+    for child_start, child_end in nested:
+        _parse_simple_tag(data, child_start, child_end, tags, name + "/")
+
+
+def _read_element_header(f, offset: int) -> Optional[Tuple[int, int, Optional[int]]]:
+    """(id, header size, payload size or None if unknown) of the element at an offset."""
+    f.seek(offset)
+    header = f.read(12)
+    try:
+        element_id, position = _vint(header, 0, keep_marker=True)
+        size, position = _vint(header, position)
+    except (IndexError, ValueError):
+        return None
+    return element_id, position, size
+
+
+def _elements(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+    """(id, payload start, payload end) of each element in data[start:end]."""
+    end = len(data) if end is None else end
+    position = start
+    while position < end:
+        try:
+            element_id, position = _vint(data, position, keep_marker=True)
+            size, position = _vint(data, position)
+        except (IndexError, ValueError):
+            return
+        if size is None or position + size > end:
+            return
+        yield element_id, position, position + size
+        position += size
+
+
+def _vint(data: bytes, position: int, keep_marker: bool = False) -> Tuple[Optional[int], int]:
+    """
+    Decode an EBML variable-length integer.
+
+    Element IDs keep their length marker bit; sizes drop it, and a size of
+    all ones means "unknown" and is returned as None.
+    """
+    first = data[position]
+    if first == 0:
+        raise ValueError("Invalid EBML variable-length integer")
+    length = 9 - first.bit_length()
+    if len(data) < position + length:
+        raise IndexError("Truncated EBML variable-length integer")
+    raw = int.from_bytes(data[position:position + length], "big")
+    if keep_marker:
+        return raw, position + length
+    value = raw & ((1 << (7 * length)) - 1)
+    if value == (1 << (7 * length)) - 1:
+        return None, position + length
+    return value, position + length
+
+
+def _uint(data: bytes, start: int, end: int) -> int:
+    return int.from_bytes(data[start:end], "big")
+
+
+def _float(data: bytes, start: int, end: int) -> Optional[float]:
+    if end - start == 4:
+        return struct.unpack_from(">f", data, start)[0]
+    if end - start == 8:
+        return struct.unpack_from(">d", data, start)[0]
+    return None
+
+
+def _string(data: bytes, start: int, end: int) -> str:
+    return data[start:end].rstrip(b"\x00").decode("utf-8", "replace")
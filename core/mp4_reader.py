@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+MP4 Reader - Container-level metadata from MP4, MOV and M4A files.
+
+This module provides read_mp4_metadata(), a pure-Python ISO-BMFF reader that
+gets duration, dimensions, frame rate, codecs, audio format, creation time,
+GPS position and tags without decoding anything. Top-level boxes are walked
+by their headers alone, so `mdat` is skipped by offset however large it is,
+and a `moov` box stored after the media data costs one extra seek. The
+`moov` box is then read in one go and parsed in memory: `mvhd` for the
+movie timescale, duration and dates, and for each `trak` its `tkhd`,
+`mdhd`, `hdlr`, first `stsd` sample entry and `stts` sample timing.
+Position and tags come from QuickTime `udta` text atoms (`©xyz`, `©mak`,
+...) and from `meta` boxes, both QuickTime `keys`/`ilst` (e.g.
+com.apple.quicktime.location.ISO6709) and iTunes-style `ilst` items.
+"""
+
+import re
+import struct
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Iterator, Tuple, Union, BinaryIO
+
+
+# Largest moov box read into memory; sample tables of long recordings are a few MB
+MAX_MOOV_SIZE = 64 * 1024 * 1024
+
+# ISO-BMFF and QuickTime times count seconds from 1904-01-01 UTC
+EPOCH_1904 = datetime(1904, 1, 1)
+
+HANDLER_TYPES = {b"vide": "video", b"soun": "audio", b"text": "text", b"sbtl": "subtitle", b"meta": "metadata", b"tmcd": "timecode", b"hint": "hint"}
+
+# Well-known types of `data` boxes in `ilst` items
+DATA_UTF8, DATA_UTF16, DATA_JPEG, DATA_PNG, DATA_INT, DATA_UINT, DATA_FLOAT32, DATA_FLOAT64 = 1, 2, 13, 14, 21, 22, 23, 24
+
+# iTunes-style `ilst` item and QuickTime `udta` text atom names
+ITUNES_TAGS = {
+    b"\xa9nam": "title", b"\xa9ART": "artist", b"\xa9alb": "album", b"aART": "album_artist",
+    b"\xa9day": "date", b"\xa9gen": "genre", b"\xa9too": "encoder", b"\xa9cmt": "comment",
+    b"\xa9wrt": "composer", b"cprt": "copyright", b"desc": "description", b"\xa9xyz": "location",
+    b"\xa9mak": "make", b"\xa9mod": "model", b"\xa9swr": "software",
+    b"trkn": "track", b"disk": "disc",
+}
+
+# iTunes items holding a binary (number, total) pair
+INDEX_PAIR_TAGS = (b"trkn", b"disk")
+
+ISO6709 = re.compile(r"([+-]\d+(?:\.\d*)?)([+-]\d+(?:\.\d*)?)([+-]\d+(?:\.\d*)?)?")
+
+
+def read_mp4_metadata(source: Union[str, BinaryIO]) -> Dict[str, Any]:
+    """
+    Read container metadata from an MP4/MOV/M4A file.
+
+    Args:
+        source: Path to the file, or a seekable binary stream over it
+
+    Returns:
+        Dictionary with brand, duration, creationTime, modificationTime,
+        width, height, frameRate, codec, audioCodec, audioSampleRate,
+        audioChannels, bitrate, tracks, gps, tags, moovOffset, moovAtEnd
+        and error
+    """
+    result = {
+        "brand": None,
+        "duration": None,
+        "creationTime": None,
+        "modificationTime": None,
+        "width": None,
+        "height": None,
+        "rotation": None,
+        "frameRate": None,
+        "codec": None,
+        "audioCodec": None,
+        "audioSampleRate": None,
+        "audioChannels": None,
+        "bitrate": None,
+        "tracks": [],
+        "gps": None,
+        "tags": {},
+        "moovOffset": None,
+        "moovAtEnd": False,
+        "error": None
+    }
+
+    with open(source, "rb") if isinstance(source, str) else nullcontext(source) as f:
+        file_size = f.seek(0, 2)
+        moov = None
+        media_bytes = 0
+        for box_type, offset, header_size, size in _top_level_boxes(f, file_size):
+            if box_type == b"ftyp":
+                f.seek(offset + header_size)
+                result["brand"] = f.read(4).decode("latin1").strip() or None
+            elif box_type == b"mdat":
+                media_bytes += size - header_size
+            elif box_type == b"moov" and moov is None:
+                if size > MAX_MOOV_SIZE:
+                    result["error"] = f"moov box too large ({size:,} bytes)"
+                    return result
+                f.seek(offset + header_size)
+                moov = f.read(size - header_size)
+                result["moovOffset"] = offset
+                result["moovAtEnd"] = media_bytes > 0
+
+    if moov is None:
+        result["error"] = "No moov box"
+        return result
+
+    try:
+        _parse_moov(moov, result)
+    except (struct.error, IndexError, ValueError) as e:
+        result["error"] = f"Malformed moov: {e}"
+
+    if result["duration"] and media_bytes:
+        result["bitrate"] = int(media_bytes * 8 / result["duration"])
+    return result
+
+
+def _top_level_boxes(f, file_size: int) -> Iterator[Tuple[bytes, int, int, int]]:
+    """(type, offset, header size, size) of each top-level box, reading headers only."""
+    offset = 0
+    while offset + 8 <= file_size:
+        f.seek(offset)
+        header = f.read(16)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header[:8])
+        header_size = 8
+        if size == 1 and len(header) == 16:
+            size = struct.unpack(">Q", header[8:16])[0]
+            header_size = 16
+        elif size == 0:
+            size = file_size - offset
+        if size < header_size:
+            return
+        yield box_type, offset, header_size, size
+        offset += size
+
+
+def _boxes(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[bytes, int, int]]:
+    """(type, payload start, payload end) of each box in data[start:end]."""
+    end = len(data) if end is None else end
+    position = start
+    while position + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, position)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, position + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = end - position
+        if size < header_size or position + size > end:
+            return
+        yield box_type, position + header_size, position + size
+        position += size
+
+
+def _child(data: bytes, start: int, end: int, box_type: bytes) -> Optional[Tuple[int, int]]:
+    """Payload bounds of the first child box of a type."""
+    for child_type, child_start, child_end in _boxes(data, start, end):
+        if child_type == box_type:
+            return child_start, child_end
+    return None
+
+
+def _mac_time(seconds: int) -> Optional[datetime]:
+    """UTC datetime from a 1904-based timestamp (0 means unset)."""
+    return EPOCH_1904 + timedelta(seconds=seconds) if seconds else None
+
+
+def _parse_moov(data: bytes, result: Dict[str, Any]) -> None:
+    for box_type, start, end in _boxes(data):
+        if box_type == b"mvhd":
+            version = data[start]
+            if version == 1:
+                created, modified, timescale, duration = struct.unpack_from(">QQIQ", data, start + 4)
+            else:
+                created, modified, timescale, duration = struct.unpack_from(">IIII", data, start + 4)
+            result["creationTime"] = _mac_time(created)
+            result["modificationTime"] = _mac_time(modified)
+            if timescale:
+                result["duration"] = round(duration / timescale, 3)
+        elif box_type == b"trak":
+            result["tracks"].append(_parse_trak(data, start, end))
+        elif box_type == b"udta":
+            _parse_udta(data, start, end, result["tags"])
+        elif box_type == b"meta":
+            _parse_meta(data, start, end, result["tags"])
+
+    video = next((t for t in result["tracks"] if t["type"] == "video"), None)
+    audio = next((t for t in result["tracks"] if t["type"] == "audio"), None)
+    if video:
+        result.update({
+            "width": video["width"],
+            "height": video["height"],
+            "rotation": video["rotation"],
+            "frameRate": video["frameRate"],
+            "codec": video["codec"]
+        })
+    if audio:
+        result.update({
+            "audioCodec": audio["codec"],
+            "audioSampleRate": audio["sampleRate"],
+            "audioChannels": audio["channels"]
+        })
+    if result["duration"] is None:
+        durations = [t["duration"] for t in result["tracks"] if t["duration"]]
+        result["duration"] = max(durations) if durations else None
+
+    location = result["tags"].get("com.apple.quicktime.location.ISO6709") or result["tags"].get("location")
+    if isinstance(location, str):
+        result["gps"] = parse_iso6709(location)
+
+
+def _parse_trak(data: bytes, start: int, end: int) -> Dict[str, Any]:
+    track = {
+        "id": None,
+        "type": None,
+        "codec": None,
+        "duration": None,
+        "language": None,
+        "width": None,
+        "height": None,
+        "rotation": None,
+        "frameRate": None,
+        "sampleRate": None,
+        "channels": None,
+        "sampleCount": None
+    }
+
+    tkhd = _child(data, start, end, b"tkhd")
+    if tkhd:
+        position = tkhd[0]
+        version = data[position]
+        if version == 1:
+            track["id"] = struct.unpack_from(">I", data, position + 20)[0]
+            matrix_at = position + 4 + 8 + 8 + 4 + 4 + 8 + 8 + 8
+        else:
+            track["id"] = struct.unpack_from(">I", data, position + 12)[0]
+            matrix_at = position + 4 + 4 + 4 + 4 + 4 + 4 + 8 + 8
+        a, b = struct.unpack_from(">ii", data, matrix_at)
+        width, height = struct.unpack_from(">II", data, matrix_at + 36)
+        track["width"] = width >> 16 or None
+        track["height"] = height >> 16 or None
+        if a or b:
+            # Display rotation from the first row of the 16.16 transformation matrix
+            track["rotation"] = {(1, 0): 0, (0, 1): 90, (-1, 0): 180, (0, -1): 270}.get((_sign(a), _sign(b)))
+
+    mdia = _child(data, start, end, b"mdia")
+    if not mdia:
+        return track
+
+    timescale = None
+    mdhd = _child(data, mdia[0], mdia[1], b"mdhd")
+    if mdhd:
+        position = mdhd[0]
+        if data[position] == 1:
+            timescale, duration = struct.unpack_from(">IQ", data, position + 20)
+            language = struct.unpack_from(">H", data, position + 32)[0]
+        else:
+            timescale, duration = struct.unpack_from(">II", data, position + 12)
+            language = struct.unpack_from(">H", data, position + 20)[0]
+        if timescale:
+            track["duration"] = round(duration / timescale, 3)
+        # Packed ISO-639-2/T code: three 5-bit letters offset by 0x60
+        if language and language != 0x7FFF:
+            track["language"] = "".join(chr(((language >> shift) & 0x1F) + 0x60) for shift in (10, 5, 0))
+
+    hdlr = _child(data, mdia[0], mdia[1], b"hdlr")
+    if hdlr:
+        handler = data[hdlr[0] + 8:hdlr[0] + 12]
+        track["type"] = HANDLER_TYPES.get(handler, handler.decode("latin1"))
+
+    minf = _child(data, mdia[0], mdia[1], b"minf")
+    stbl = _child(data, minf[0], minf[1], b"stbl") if minf else None
+    if not stbl:
+        return track
+
+    stsd = _child(data, stbl[0], stbl[1], b"stsd")
+    if stsd:
+        _parse_sample_entry(data, stsd[0] + 8, stsd[1], track)
+
+    stts = _child(data, stbl[0], stbl[1], b"stts")
+    if stts:
+        count = struct.unpack_from(">I", data, stts[0] + 4)[0]
+        count = min(count, (stts[1] - stts[0] - 8) // 8)
+        samples = total_delta = 0
+        for sample_count, sample_delta in struct.iter_unpack(">II", data[stts[0] + 8:stts[0] + 8 + count * 8]):
+            samples += sample_count
+            total_delta += sample_count * sample_delta
+        track["sampleCount"] = samples
+        if track["type"] == "video" and timescale and total_delta:
+            track["frameRate"] = round(samples * timescale / total_delta, 3)
+    return track
+
+
+def _parse_sample_entry(data: bytes, start: int, end: int, track: Dict[str, Any]) -> None:
+    """Codec and format from the first sample description."""
+    entry = next(_boxes(data, start, end), None)
+    if entry is None:
+        return
+    codec, position, _ = entry
+    track["codec"] = codec.decode("latin1").strip()
+    # Sample entries start with 6 reserved bytes and a data reference index
+    position += 8
+    if track["type"] == "video":
+        track["width"] = track["width"] or struct.unpack_from(">H", data, position + 16)[0] or None
+        track["height"] = track["height"] or struct.unpack_from(">H", data, position + 18)[0] or None
+    elif track["type"] == "audio":
+        version = struct.unpack_from(">H", data, position)[0]
+        if version == 2:
+            # QuickTime sound description v2: float64 rate and 32-bit channel count
+            rate, channels = struct.unpack_from(">dI", data, position + 24)
+            track["sampleRate"], track["channels"] = int(rate), channels
+        else:
+            channels, _, _, _, rate = struct.unpack_from(">HHHHI", data, position + 8)
+            track["sampleRate"], track["channels"] = rate >> 16, channels
+
+
+def _parse_udta(data: bytes, start: int, end: int, tags: Dict[str, Any]) -> None:
+    """QuickTime user data: ©-prefixed text atoms, plus a nested iTunes meta box."""
+    for box_type, box_start, box_end in _boxes(data, start, end):
+        if box_type == b"meta":
+            _parse_meta(data, box_start, box_end, tags)
+        elif box_type[:1] == b"\xa9" and box_end - box_start >= 4:
+            # Text atom: 16-bit length, 16-bit language code, then the string
+            length = struct.unpack_from(">H", data, box_start)[0]
+            if length <= box_end - box_start - 4:
+                name = ITUNES_TAGS.get(box_type, box_type[1:].decode("latin1"))
+                tags.setdefault(name, data[box_start + 4:box_start + 4 + length].decode("utf-8", "replace"))
+
+
+def _parse_meta(data: bytes, start: int, end: int, tags: Dict[str, Any]) -> None:
+    """QuickTime (keys + ilst) or iTunes (ilst) metadata."""
+    # ISO meta is a full box (version and flags first); QuickTime meta is not
+    if data[start + 4:start + 8] != b"hdlr":
+        start += 4
+    keys = []
+    keys_box = _child(data, start, end, b"keys")
+    if keys_box:
+        position = keys_box[0] + 8
+        for _ in range(struct.unpack_from(">I", data, keys_box[0] + 4)[0]):
+            size = struct.unpack_from(">I", data, position)[0]
+            if size < 8 or position + size > keys_box[1]:
+                break
+            keys.append(data[position + 8:position + size].decode("utf-8", "replace"))
+            position += size
+
+    ilst = _child(data, start, end, b"ilst")
+    if not ilst:
+        return
+    for item_type, item_start, item_end in _boxes(data, ilst[0], ilst[1]):
+        value_box = _child(data, item_start, item_end, b"data")
+        if not value_box:
+            continue
+        index = struct.unpack(">I", item_type)[0]
+        if keys and 1 <= index <= len(keys):
+            name = keys[index - 1]
+        else:
+            name = ITUNES_TAGS.get(item_type, item_type.decode("latin1"))
+        if item_type in INDEX_PAIR_TAGS and value_box[1] - value_box[0] >= 14:
+            # Implicit data: 2 reserved bytes, number, total
+            number, total = struct.unpack_from(">HH", data, value_box[0] + 10)
+            value = f"{number}/{total}" if total else str(number)
+        else:
+            value = _data_value(data, value_box[0], value_box[1])
+        if value is not None:
+            tags.setdefault(name, value)
+
+
+def _data_value(data: bytes, start: int, end: int) -> Any:
+    """Value of an ilst `data` box; artwork is skipped and reported by size."""
+    kind = struct.unpack_from(">I", data, start)[0] & 0xFFFFFF
+    value = data[start + 8:end]
+    if kind == DATA_UTF8:
+        return value.decode("utf-8", "replace")
+    if kind == DATA_UTF16:
+        return value.decode("utf-16-be", "replace")
+    if kind in (DATA_INT, DATA_UINT) and len(value) in (1, 2, 4, 8):
+        return int.from_bytes(value, "big", signed=kind == DATA_INT)
+    if kind == DATA_FLOAT32 and len(value) == 4:
+        return struct.unpack(">f", value)[0]
+    if kind == DATA_FLOAT64 and len(value) == 8:
+        return struct.unpack(">d", value)[0]
+    if kind in (DATA_JPEG, DATA_PNG):
+        return f"<{'JPEG' if kind == DATA_JPEG else 'PNG'} image, {len(value)} bytes>"
+    return None
+
+
+def parse_iso6709(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode an ISO 6709 position string such as "+37.7858-122.4064+012.345/".
+
+    Degrees, degrees-minutes and degrees-minutes-seconds forms are accepted.
+
+    Returns:
+        Dictionary with latitude, longitude, latitude_ref, longitude_ref
+        and altitude (if present), or None
+    """
+    match = ISO6709.match(text.strip())
+    if not match:
+        return None
+    latitude = _iso6709_angle(match.group(1), 2)
+    longitude = _iso6709_angle(match.group(2), 3)
+    if latitude is None or longitude is None:
+        return None
+    gps = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "latitude_ref": "S" if latitude < 0 else "N",
+        "longitude_ref": "W" if longitude < 0 else "E"
+    }
+    if match.group(3):
+        gps["altitude"] = float(match.group(3))
+    return gps
+
+
+def _iso6709_angle(value: str, degree_digits: int) -> Optional[float]:
+    """Signed decimal degrees from a ±DD[D][MM[SS]][.fff] component."""
+    sign = -1.0 if value[0] == "-" else 1.0
+    whole, _, fraction = value[1:].partition(".")
+    fraction = float("0." + fraction) if fraction else 0.0
+    digits = len(whole)
+    if digits == degree_digits:
+        return sign * (int(whole) + fraction)
+    if digits == degree_digits + 2:
+        return sign * (int(whole[:degree_digits]) + (int(whole[degree_digits:]) + fraction) / 60)
+    if digits == degree_digits + 4:
+        seconds = int(whole[degree_digits + 2:]) + fraction
+        return sign * (int(whole[:degree_digits]) + int(whole[degree_digits:degree_digits + 2]) / 60 + seconds / 3600)
+    return None
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
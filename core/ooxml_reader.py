@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+OOXML Reader - Document properties from DOCX, XLSX and PPTX files.
+
+This module provides read_ooxml_properties(), which reads the core
+(docProps/core.xml: title, author, dates, revision, ...) and extended
+(docProps/app.xml: application, pages, words, slides, ...) properties of an
+Office Open XML package straight from the zip. Only the package
+relationships and those two small parts are opened, and each is parsed as
+a stream with iterparse, so the size of the document body does not matter.
+
+Counting words in the body text is opt-in: it streams word/document.xml
+with iterparse, one paragraph at a time, instead of building the whole
+document tree.
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Union, BinaryIO
+
+
+OOXML_EXTENSIONS = ('.docx', '.xlsx', '.pptx')
+
+# Relationship types (last path segment) of the parts read from _rels/.rels
+OFFICE_DOCUMENT = "officeDocument"
+CORE_PROPERTIES = "core-properties"
+EXTENDED_PROPERTIES = "extended-properties"
+
+# Where the parts live when _rels/.rels is missing or incomplete
+DEFAULT_PARTS = {
+    CORE_PROPERTIES: "docProps/core.xml",
+    EXTENDED_PROPERTIES: "docProps/app.xml",
+}
+
+MAIN_PARTS = {"document.xml": "docx", "workbook.xml": "xlsx", "presentation.xml": "pptx"}
+
+# core.xml elements (local names), kept under the same keys
+CORE_FIELDS = frozenset({
+    "title", "subject", "creator", "keywords", "description", "lastModifiedBy", "revision",
+    "category", "contentStatus", "identifier", "language", "version",
+    "created", "modified", "lastPrinted",
+})
+CORE_DATES = ("created", "modified", "lastPrinted")
+
+# app.xml elements (local names) and their result keys; numeric ones are converted to int
+APP_FIELDS = {
+    "Application": "application", "AppVersion": "appVersion", "Company": "company",
+    "Manager": "manager", "Template": "template",
+}
+APP_COUNTS = {
+    "TotalTime": "totalTime", "Pages": "pages", "Words": "words", "Characters": "characters",
+    "CharactersWithSpaces": "charactersWithSpaces", "Lines": "lines", "Paragraphs": "paragraphs",
+    "Slides": "slides", "Notes": "notes", "HiddenSlides": "hiddenSlides",
+}
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Run content that separates words like a space
+WORD_BREAKS = (W + "tab", W + "br", W + "cr")
+
+
+def read_ooxml_properties(source: Union[str, BinaryIO], count_words: bool = False) -> Dict[str, Any]:
+    """
+    Read document properties from a DOCX, XLSX or PPTX file.
+
+    Args:
+        source: Path to the file, or a seekable binary stream over it
+        count_words: Also count the words of a DOCX body (streams word/document.xml)
+
+    Returns:
+        Dictionary with documentType, the core properties (title, subject,
+        creator, keywords, description, lastModifiedBy, revision, created,
+        modified, ...), the extended properties (application, company,
+        pages, words, characters, slides, ...), wordCount and error.
+        Properties missing from the package are absent.
+    """
+    result = {"documentType": None, "wordCount": None, "error": None}
+
+    with open(source, "rb") if isinstance(source, str) else nullcontext(source) as f:
+        try:
+            with zipfile.ZipFile(f) as zf:
+                names = set(zf.namelist())
+                parts = _package_parts(zf, names)
+                main = parts.get(OFFICE_DOCUMENT)
+                if main:
+                    result["documentType"] = MAIN_PARTS.get(main.rsplit("/", 1)[-1])
+                if parts.get(CORE_PROPERTIES) in names:
+                    with zf.open(parts[CORE_PROPERTIES]) as part:
+                        _read_core(part, result)
+                if parts.get(EXTENDED_PROPERTIES) in names:
+                    with zf.open(parts[EXTENDED_PROPERTIES]) as part:
+                        _read_app(part, result)
+                if count_words and result["documentType"] == "docx" and main in names:
+                    with zf.open(main) as part:
+                        result["wordCount"] = count_docx_words(part)
+        except (zipfile.BadZipFile, ET.ParseError, KeyError, OSError) as e:
+            result["error"] = f"Could not read OOXML package: {e}"
+    return result
+
+
+def count_docx_words(stream: BinaryIO) -> int:
+    """
+    Count the words of a word/document.xml stream.
+
+    Text runs are joined per paragraph and split on whitespace, so a word
+    split across runs (e.g. by a formatting change) counts once. Each
+    paragraph is cleared once counted, keeping memory flat.
+    """
+    words = 0
+    parts = []
+    for _, element in ET.iterparse(stream, events=("end",)):
+        tag = element.tag
+        if tag == W + "t":
+            parts.append(element.text or "")
+        elif tag in WORD_BREAKS:
+            parts.append(" ")
+        elif tag == W + "p":
+            words += len("".join(parts).split())
+            parts = []
+            element.clear()
+        elif tag == W + "tbl":
+            element.clear()
+    return words
+
+
+def _package_parts(zf: zipfile.ZipFile, names: set) -> Dict[str, str]:
+    """Part names of the main document and property parts, from _rels/.rels."""
+    parts = {}
+    if "_rels/.rels" in names:
+        with zf.open("_rels/.rels") as rels:
+            for _, element in ET.iterparse(rels, events=("end",)):
+                if _local_name(element.tag) != "Relationship":
+                    continue
+                kind = element.get("Type", "").rsplit("/", 1)[-1]
+                target = element.get("Target", "").lstrip("/")
+                if kind in (OFFICE_DOCUMENT, CORE_PROPERTIES, EXTENDED_PROPERTIES) and target:
+                    parts.setdefault(kind, target)
+    for kind, name in DEFAULT_PARTS.items():
+        parts.setdefault(kind, name)
+    if OFFICE_DOCUMENT not in parts:
+        parts[OFFICE_DOCUMENT] = next((name for name in ("word/document.xml", "xl/workbook.xml", "ppt/presentation.xml") if name in names), None)
+    return parts
+
+
+def _read_core(stream: BinaryIO, result: Dict[str, Any]) -> None:
+    for _, element in ET.iterparse(stream, events=("end",)):
+        key = _local_name(element.tag)
+        text = (element.text or "").strip()
+        if key not in CORE_FIELDS or not text:
+            continue
+        result[key] = _parse_date(text) if key in CORE_DATES else text
+
+
+def _read_app(stream: BinaryIO, result: Dict[str, Any]) -> None:
+    # Only direct children of <Properties>; HeadingPairs/TitlesOfParts hold nested vectors
+    depth = 0
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        name = _local_name(element.tag)
+        text = (element.text or "").strip()
+        if name in APP_FIELDS and text:
+            result[APP_FIELDS[name]] = text
+        elif name in APP_COUNTS and text.isdigit():
+            result[APP_COUNTS[name]] = int(text)
+        element.clear()
+
+
+def _parse_date(text: str) -> Optional[datetime]:
+    """Naive UTC datetime from a W3CDTF timestamp (e.g. 2024-01-02T03:04:05Z)."""
+    try:
+        value = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
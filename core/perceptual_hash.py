@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Perceptual Hash - aHash/dHash/pHash computation and Hamming-distance search.
+
+This module provides compute_perceptual_hashes(), which decodes images at a
+reduced size (Pillow's JPEG draft mode) and computes 64-bit average,
+difference and DCT hashes compatible with the imagehash package, and the
+HashIndex class, a multi-index hashing structure that answers "all hashes
+within Hamming distance k" without scanning the whole collection.
+"""
+
+import math
+from typing import Dict, List, Tuple, Union
+
+from PIL import Image
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+HASH_KINDS = ("ahash", "dhash", "phash")
+
+# pHash works on a 32x32 thumbnail; JPEG draft decoding stops at a scale at least this large
+DRAFT_SIZE = (64, 64)
+
+
+def _dct_rows(n: int, rows: int) -> "np.ndarray":
+    """First `rows` rows of the unnormalized DCT-II matrix (scipy.fftpack.dct scaling)."""
+    k = np.arange(rows)[:, None]
+    i = np.arange(n)[None, :]
+    return 2.0 * np.cos(math.pi * k * (2 * i + 1) / (2 * n))
+
+
+def _bits_to_int(bits: "np.ndarray") -> int:
+    """Pack a boolean array (row-major, MSB first) into an integer."""
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+_PHASH_DCT = None
+
+
+def compute_perceptual_hashes(source: Union[str, Image.Image]) -> Dict[str, str]:
+    """
+    Compute 64-bit aHash, dHash and pHash for an image.
+
+    Args:
+        source: Image path or an open PIL image (draft mode only applies to
+            images that have not been loaded yet)
+
+    Returns:
+        Dictionary of hash kind to 16-digit hex string
+    """
+    global _PHASH_DCT
+    if _PHASH_DCT is None:
+        _PHASH_DCT = _dct_rows(32, 8)
+
+    if isinstance(source, str):
+        with Image.open(source) as img:
+            return compute_perceptual_hashes(img)
+
+    img = source
+    if img.format == "JPEG":
+        # Decode straight to greyscale at 1/2..1/8 scale in the IDCT
+        img.draft("L", DRAFT_SIZE)
+    gray = img.convert("L")
+
+    average = np.asarray(gray.resize((8, 8), Image.LANCZOS), dtype=np.float32)
+    difference = np.asarray(gray.resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    thumbnail = np.asarray(gray.resize((32, 32), Image.LANCZOS), dtype=np.float64)
+
+    # Low-frequency 8x8 corner of the 2-D DCT: D[:8] @ X @ D[:8].T
+    low = _PHASH_DCT @ thumbnail @ _PHASH_DCT.T
+
+    return {
+        "ahash": f"{_bits_to_int(average > average.mean()):016x}",
+        "dhash": f"{_bits_to_int(difference[:, 1:] > difference[:, :-1]):016x}",
+        "phash": f"{_bits_to_int(low > np.median(low)):016x}"
+    }
+
+
+def hamming_distance(a: Union[int, str], b: Union[int, str]) -> int:
+    """Hamming distance between two hashes given as integers or hex strings."""
+    if isinstance(a, str):
+        a = int(a, 16)
+    if isinstance(b, str):
+        b = int(b, 16)
+    return bin(a ^ b).count("1")
+
+
+_POPCOUNT8 = None
+
+
+def popcount64(values: "np.ndarray") -> "np.ndarray":
+    """Number of set bits in each element of a uint64 array."""
+    global _POPCOUNT8
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    if _POPCOUNT8 is None:
+        _POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return _POPCOUNT8[np.ascontiguousarray(values).view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+
+class HashIndex:
+    """
+    Multi-index hashing over 64-bit hashes.
+
+    Each hash is split into four 16-bit substrings, and each substring
+    position gets a bucket table (ids sorted by substring value plus 65536
+    bucket offsets). If two hashes are within distance k, at least one
+    substring is within k // 4 of the query's substring, so a query only
+    probes buckets near its own substrings and verifies those candidates.
+    """
+
+    SUBSTRINGS = 4
+    SUBSTRING_BITS = 16
+
+    def __init__(self, hashes: "np.ndarray", paths: List[str]):
+        """
+        Build the index.
+
+        Args:
+            hashes: uint64 array of hashes
+            paths: File path for each hash
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for HashIndex")
+        self.hashes = np.ascontiguousarray(hashes, dtype=np.uint64)
+        self.paths = list(paths)
+        self._order = []
+        self._offsets = []
+        for t in range(self.SUBSTRINGS):
+            keys = self._substrings(self.hashes, t)
+            # Stable argsort of uint16 keys is a radix sort: linear in the number of hashes
+            self._order.append(np.argsort(keys, kind="stable").astype(np.int64))
+            self._offsets.append(np.concatenate(([0], np.cumsum(np.bincount(keys, minlength=1 << self.SUBSTRING_BITS)))))
+        self._probe_masks = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @classmethod
+    def from_hex(cls, hex_hashes: List[str], paths: List[str]) -> "HashIndex":
+        """Build an index from hex strings as returned by compute_perceptual_hashes()."""
+        return cls(np.array([int(h, 16) for h in hex_hashes], dtype=np.uint64), paths)
+
+    def save(self, path: str) -> None:
+        """Persist hashes and paths to an .npz file (buckets are rebuilt on load)."""
+        np.savez(path, hashes=self.hashes, paths=np.array(self.paths, dtype=str))
+
+    @classmethod
+    def load(cls, path: str) -> "HashIndex":
+        """Load an index written by save()."""
+        with np.load(path) as data:
+            return cls(data["hashes"], data["paths"].tolist())
+
+    def query(self, value: Union[int, str], k: int) -> List[Tuple[str, int]]:
+        """
+        Find all hashes within Hamming distance k.
+
+        Args:
+            value: Query hash as integer or hex string
+            k: Maximum Hamming distance
+
+        Returns:
+            List of (path, distance) sorted by distance
+        """
+        if isinstance(value, str):
+            value = int(value, 16)
+        query = np.uint64(value)
+        radius = k // self.SUBSTRINGS
+
+        masks = self._masks(radius)
+        candidates = []
+        for t in range(self.SUBSTRINGS):
+            keys = self._substrings(np.array([query]), t)[0] ^ masks
+            starts = self._offsets[t][keys]
+            ends = self._offsets[t][keys.astype(np.int64) + 1]
+            for start, end in zip(starts[ends > starts], ends[ends > starts]):
+                candidates.append(self._order[t][start:end])
+
+        if not candidates:
+            return []
+        ids = np.unique(np.concatenate(candidates))
+        distances = popcount64(self.hashes[ids] ^ query)
+        keep = distances <= k
+        ids, distances = ids[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")
+        return [(self.paths[i], int(d)) for i, d in zip(ids[order], distances[order])]
+
+    def _substrings(self, hashes: "np.ndarray", t: int) -> "np.ndarray":
+        """16-bit substring t (0 = most significant) of each hash."""
+        shift = np.uint64(self.SUBSTRING_BITS * (self.SUBSTRINGS - 1 - t))
+        return ((hashes >> shift) & np.uint64(0xFFFF)).astype(np.uint16)
+
+    def _masks(self, radius: int) -> "np.ndarray":
+        """All 16-bit XOR masks with at most `radius` set bits."""
+        if radius not in self._probe_masks:
+            values = np.arange(1 << self.SUBSTRING_BITS, dtype=np.uint16)
+            weights = popcount64(values.astype(np.uint64))
+            self._probe_masks[radius] = values[weights <= radius]
+        return self._probe_masks[radius]
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+PNG IDAT - Streaming analysis of the compressed image data.
+
+This module provides analyze_idat_stream(), which feeds the concatenated IDAT
+chunks of a PNG through a zlib decompressor in bounded chunks without
+decoding pixels. It records the zlib header (window size and the encoder's
+compression level hint), compares the inflated size with the size implied by
+IHDR, counts the filter type of every scanline and reports any bytes left
+over after the zlib stream ends. Inflated data is inspected as it is
+produced and then dropped, so memory stays bounded by the read buffer and
+one block of output regardless of image size.
+"""
+
+import zlib
+from contextlib import nullcontext
+from typing import Dict, List, Any, Iterator, Union, BinaryIO
+
+
+READ_SIZE = 64 * 1024
+# Upper bound on inflated bytes produced per decompress() call
+INFLATE_SIZE = 256 * 1024
+
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+FILTER_TYPES = ["None", "Sub", "Up", "Average", "Paeth"]
+LEVEL_HINTS = {0: "fastest", 1: "fast", 2: "default", 3: "maximum"}
+
+# Adam7 passes: (x start, y start, x step, y step)
+ADAM7 = [(0, 0, 8, 8), (4, 0, 8, 8), (0, 4, 4, 8), (2, 0, 4, 4), (0, 2, 2, 4), (1, 0, 2, 2), (0, 1, 1, 2)]
+
+TRAILING_PREVIEW = 32
+
+
+def _row_lengths(header: Dict[str, Any]) -> List[tuple]:
+    """(row count, bytes per row including the filter byte) for each pass."""
+    bits_per_pixel = CHANNELS.get(header["colorType"], 1) * header["bitDepth"]
+    width, height = header["width"], header["height"]
+    passes = ADAM7 if header.get("interlaced") else [(0, 0, 1, 1)]
+    rows = []
+    for x0, y0, dx, dy in passes:
+        pass_width = (width - x0 + dx - 1) // dx if width > x0 else 0
+        pass_height = (height - y0 + dy - 1) // dy if height > y0 else 0
+        if pass_width and pass_height:
+            rows.append((pass_height, 1 + (pass_width * bits_per_pixel + 7) // 8))
+    return rows
+
+
+def _filter_positions(rows: List[tuple]) -> Iterator[int]:
+    """Stream offsets of every scanline's filter byte, in order."""
+    position = 0
+    for count, length in rows:
+        for _ in range(count):
+            yield position
+            position += length
+
+
+def _zlib_header(cmf: int, flg: int) -> Dict[str, Any]:
+    """Decode the two-byte zlib header (RFC 1950)."""
+    return {
+        "method": "deflate" if cmf & 0x0F == 8 else f"unknown ({cmf & 0x0F})",
+        "windowSize": 1 << ((cmf >> 4) + 8),
+        "levelHint": LEVEL_HINTS[flg >> 6],
+        "presetDictionary": bool(flg & 0x20),
+        "checkValid": (cmf * 256 + flg) % 31 == 0
+    }
+
+
+def analyze_idat_stream(
+    source: Union[str, BinaryIO],
+    chunks: List[Dict[str, Any]],
+    header: Dict[str, Any],
+    read_size: int = READ_SIZE
+) -> Dict[str, Any]:
+    """
+    Stream the IDAT chunks of a PNG through zlib.
+
+    Args:
+        source: Path to the PNG, or a seekable binary stream over it
+        chunks: Chunk list from the structure walk (type, size, offset)
+        header: Parsed IHDR (width, height, bitDepth, colorType, interlaced)
+        read_size: Bytes read from the file per step
+
+    Returns:
+        Dictionary with zlibHeader, compressedSize, inflatedSize,
+        expectedSize, sizeMatches, scanlines, filterTypes, filterStrategy,
+        streamComplete, trailingBytes and trailingPreview
+    """
+    idat = [chunk for chunk in chunks if chunk["type"] == "IDAT"]
+    expected_rows = _row_lengths(header)
+    expected_size = sum(count * length for count, length in expected_rows)
+
+    result = {
+        "zlibHeader": None,
+        "compressedSize": sum(chunk["size"] for chunk in idat),
+        "inflatedSize": 0,
+        "expectedSize": expected_size,
+        "sizeMatches": False,
+        "scanlines": 0,
+        "filterTypes": {name: 0 for name in FILTER_TYPES},
+        "invalidFilters": 0,
+        "filterStrategy": None,
+        "streamComplete": False,
+        "trailingBytes": 0,
+        "trailingPreview": None,
+        "error": None
+    }
+    if not idat:
+        result["error"] = "No IDAT chunks"
+        return result
+
+    histogram = [0] * 256
+    positions = _filter_positions(expected_rows)
+    next_filter = next(positions, None)
+    inflated = 0
+    trailing = 0
+    preview = b""
+    prefix = b""
+    decompressor = zlib.decompressobj()
+
+    def consume(block: bytes) -> None:
+        # Pick out the filter bytes that fall inside this block of output
+        nonlocal inflated, next_filter
+        end = inflated + len(block)
+        while next_filter is not None and next_filter < end:
+            histogram[block[next_filter - inflated]] += 1
+            next_filter = next(positions, None)
+        inflated = end
+
+    try:
+        with open(source, "rb") if isinstance(source, str) else nullcontext(source) as f:
+            for chunk in idat:
+                f.seek(chunk["offset"] + 8)
+                remaining = chunk["size"]
+                while remaining > 0:
+                    data = f.read(min(read_size, remaining))
+                    if not data:
+                        remaining = 0
+                        break
+                    remaining -= len(data)
+
+                    if decompressor.eof:
+                        trailing += len(data)
+                        preview += data[:TRAILING_PREVIEW - len(preview)]
+                        continue
+                    if len(prefix) < 2:
+                        prefix += data[:2 - len(prefix)]
+                        if len(prefix) == 2:
+                            result["zlibHeader"] = _zlib_header(prefix[0], prefix[1])
+
+                    consume(decompressor.decompress(data, INFLATE_SIZE))
+                    while decompressor.unconsumed_tail and not decompressor.eof:
+                        consume(decompressor.decompress(decompressor.unconsumed_tail, INFLATE_SIZE))
+
+                    if decompressor.eof and decompressor.unused_data:
+                        # Bytes after the end of the zlib stream (Adler-32 already consumed)
+                        trailing += len(decompressor.unused_data)
+                        preview += decompressor.unused_data[:TRAILING_PREVIEW]
+    except zlib.error as e:
+        result["error"] = f"zlib error: {e}"
+    except OSError as e:
+        result["error"] = str(e)
+
+    counts = {name: histogram[i] for i, name in enumerate(FILTER_TYPES)}
+    used = [name for name, count in counts.items() if count]
+    result.update({
+        "inflatedSize": inflated,
+        "sizeMatches": decompressor.eof and inflated == expected_size,
+        "scanlines": sum(histogram),
+        "filterTypes": counts,
+        "invalidFilters": sum(histogram[len(FILTER_TYPES):]),
+        # Adaptive filtering (per-row choice) is what libpng does by default
+        "filterStrategy": ("adaptive" if len(used) > 1 else used[0]) if used else None,
+        "streamComplete": decompressor.eof,
+        "trailingBytes": trailing,
+        "trailingPreview": preview.hex() if preview else None
+    })
+    return result
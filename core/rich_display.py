@@ -44,6 +44,14 @@ class RichDisplay:
         ai_metadata = report.get("aiMetadata", {})
         self._display_ai_metadata(ai_metadata)
         
+        # Pixel Analysis Section (only when requested)
+        pixel_analysis = report.get("pixelAnalysis") or {}
+        self._display_pixel_analysis(pixel_analysis)
+        
+        # JPEG Forensics Section (only when requested)
+        forensics = report.get("forensics") or {}
+        self._display_forensics(forensics)
+        
         # Anomalies Section
         anomalies = report.get("anomalies", {})
         self._display_anomalies(anomalies)
@@ -87,7 +95,10 @@ class RichDisplay:
                 "zTXt": "Compressed Text",
                 "iTXt": "International Text",
                 "tIME": "Last Modified",
-                "pHYs": "Pixel Dimensions"
+                "pHYs": "Pixel Dimensions",
+                "acTL": "Animation Control",
+                "fcTL": "Frame Control",
+                "fdAT": "Frame Data"
             }
             
             for chunk in structure.get("chunks", [])[:20]:  # Show first 20
@@ -115,6 +126,15 @@ class RichDisplay:
             stats_table.add_row("Pixel Data:", f"{structure.get('pixelDataBytes', 0):,} bytes")
             stats_table.add_row("Non-Pixel Data:", f"{structure.get('nonPixelBytes', 0):,} bytes")
             stats_table.add_row("Total Chunks:", str(structure.get("totalChunks", 0)))
+            idat = structure.get("idat")
+            if idat and idat.get("zlibHeader"):
+                zlib_header = idat["zlibHeader"]
+                stats_table.add_row("IDAT zlib:", f"window {zlib_header['windowSize']:,}, level hint {zlib_header['levelHint']}")
+                stats_table.add_row("Inflated:", f"{idat['inflatedSize']:,} of {idat['expectedSize']:,} expected bytes")
+                filters = ", ".join(f"{name} {count:,}" for name, count in idat["filterTypes"].items() if count)
+                stats_table.add_row("Scanline Filters:", f"{idat['filterStrategy']} ({filters})")
+                if idat["trailingBytes"]:
+                    stats_table.add_row("After zlib Stream:", f"[yellow]{idat['trailingBytes']:,} bytes[/yellow]")
             self.console.print(stats_table)
         
         elif "segments" in structure:
@@ -138,10 +158,12 @@ class RichDisplay:
     def _display_metadata(self, metadata: Dict[str, Any]):
         """Display declared metadata"""
         exif = metadata.get("exif", {})
+        xmp = metadata.get("xmp", {})
+        icc = metadata.get("icc_profile", {})
         image_props = metadata.get("image_properties", {})
         gps = metadata.get("gps", {})
         
-        if not exif and not image_props:
+        if not exif and not xmp and not image_props:
             return
         
         # EXIF Table
@@ -175,6 +197,23 @@ class RichDisplay:
             
             self.console.print(table)
         
+        # XMP Table
+        if xmp:
+            table = Table(title="[bold green]Declared Metadata (XMP)[/bold green]",
+                        box=box.ROUNDED, show_header=True)
+            table.add_column("Property", style="cyan", width=30)
+            table.add_column("Value", style="green")
+            
+            for prop, value in list(xmp.items())[:20]:
+                if isinstance(value, (list, dict)):
+                    value = str(value)[:50] + "..." if len(str(value)) > 50 else str(value)
+                table.add_row(prop, str(value))
+            
+            if len(xmp) > 20:
+                table.add_row("[dim]...[/dim]", f"[dim]+ {len(xmp) - 20} more properties[/dim]")
+            
+            self.console.print(table)
+        
         # Image Properties
         if image_props:
             props_table = Table(show_header=False, box=box.ROUNDED, padding=(1, 2))
@@ -189,6 +228,9 @@ class RichDisplay:
             if image_props.get("dpi"):
                 props_table.add_row("DPI:", str(image_props["dpi"]))
             props_table.add_row("Color Profile:", "[green]Yes[/green]" if image_props.get("has_color_profile") else "[red]No[/red]")
+            if icc:
+                props_table.add_row("ICC Description:", str(icc.get("description")))
+                props_table.add_row("ICC Details:", f"v{icc.get('version')} {icc.get('deviceClass')} {icc.get('colorSpace')}, {icc.get('renderingIntent')}")
             
             self.console.print(Panel(props_table, title="[bold green]Image Properties[/bold green]", 
                                     border_style="green"))
@@ -250,16 +292,105 @@ class RichDisplay:
         table.add_row("[bold]Graph Detected:[/bold]", "[green]Yes[/green]" if ai_meta.get("graphDetected") else "[red]No[/red]")
         table.add_row("[bold]Wildcards Present:[/bold]", "[green]Yes[/green]" if ai_meta.get("wildcardsPresent") else "[red]No[/red]")
         table.add_row("[bold]Resolved Prompt:[/bold]", "[green]Available[/green]" if ai_meta.get("resolvedPromptAvailable") else "[red]Not Available[/red]")
+        watermark = ai_meta.get("invisibleWatermark") or {}
+        if watermark.get("detected"):
+            table.add_row("[bold]Invisible Watermark:[/bold]", f"{watermark['mark']} ({watermark['bitAccuracy']:.0%} of {watermark['bitLength']} bits)")
         
         self.console.print(Panel(table, title="[bold magenta]AI/Workflow Metadata[/bold magenta]",
                                 border_style="magenta"))
         self.console.print()
     
+    def _display_pixel_analysis(self, pixel_data: Dict[str, Any]):
+        """Display per-channel LSB steganalysis results"""
+        lsb = pixel_data.get("lsb")
+        if not lsb:
+            return
+        
+        table = Table(title="[bold yellow]LSB Steganalysis[/bold yellow]",
+                     box=box.ROUNDED, show_header=True)
+        table.add_column("Channel", style="cyan")
+        table.add_column("Chi-square p", style="green", justify="right")
+        table.add_column("RS Rate", style="green", justify="right")
+        table.add_column("Sequential", style="green", justify="right")
+        table.add_column("Embedding Rate", style="yellow", justify="right")
+        
+        for name, channel in lsb.get("channels", {}).items():
+            rs_rate = channel.get("rsEmbeddingRate")
+            rate = f"{channel.get('embeddingRate', 0):.1%}"
+            if channel.get("suspicious"):
+                rate = f"[red]{rate}[/red]"
+            table.add_row(
+                name,
+                f"{channel.get('chiSquareP', 0):.4f}",
+                f"{rs_rate:.1%}" if rs_rate is not None else "N/A",
+                f"{channel.get('sequentialEmbedding', 0):.0%}",
+                rate
+            )
+        
+        self.console.print(table)
+        self.console.print()
+    
+    def _display_forensics(self, forensics: Dict[str, Any]):
+        """Display ELA tile grid and double-compression evidence"""
+        ela = forensics.get("ela")
+        if not ela:
+            return
+        double = forensics.get("doubleCompression") or {}
+        
+        table = Table(show_header=False, box=box.ROUNDED, padding=(0, 2))
+        table.add_column(style="cyan", width=25)
+        table.add_column(style="green")
+        
+        table.add_row("[bold]ELA Quality:[/bold]", str(ela.get("quality")))
+        table.add_row("[bold]Error Level:[/bold]", f"mean {ela.get('mean')}, max {ela.get('max')}")
+        grid = ela.get("grid", [])
+        table.add_row("[bold]Tiles:[/bold]", f"{len(grid)} x {len(grid[0]) if grid else 0} ({ela.get('tileSize')} px)")
+        outliers = ela.get("outlierTiles", [])
+        table.add_row("[bold]Outlier Tiles:[/bold]", f"[yellow]{outliers}[/yellow]" if outliers else "None")
+        table.add_row("[bold]Double Compression:[/bold]",
+                     f"[yellow]Suspected[/yellow] (score {double.get('score')})" if double.get("suspected")
+                     else f"Not detected (score {double.get('score')})")
+        if ela.get("heatmap"):
+            table.add_row("[bold]Heatmap:[/bold]", ela["heatmap"])
+        
+        self.console.print(Panel(table, title="[bold yellow]JPEG Forensics[/bold yellow]", border_style="yellow"))
+        self.console.print()
+    
+    def _display_entropy_profile(self, profile: Dict[str, Any]):
+        """Display high-entropy regions from the windowed entropy profile"""
+        if not profile.get("windows"):
+            return
+        
+        table = Table(title=f"[bold yellow]Entropy Profile[/bold yellow] [dim]({profile['windows']:,} windows of {profile['windowSize']:,} bytes, "
+                            f"mean {profile['mean']}, max {profile['max']})[/dim]",
+                     box=box.ROUNDED, show_header=True)
+        table.add_column("Offset", style="dim", justify="right")
+        table.add_column("Length", style="green", justify="right")
+        table.add_column("Entropy", style="cyan", justify="right")
+        table.add_column("Elements", style="yellow")
+        table.add_column("Expected", justify="center")
+        
+        for region in profile.get("regions", [])[:20]:
+            table.add_row(
+                f"{region['start']:,}",
+                f"{region['length']:,} bytes",
+                str(region["meanEntropy"]),
+                ", ".join(region["elements"][:6]) + (" ..." if len(region["elements"]) > 6 else ""),
+                "[green]Yes[/green]" if region["expected"] else "[yellow]No[/yellow]"
+            )
+        if not profile.get("regions"):
+            table.add_row("-", "-", "-", f"[dim]No windows above {profile['threshold']} bits/byte[/dim]", "-")
+        
+        self.console.print(table)
+        self.console.print()
+    
     def _display_anomalies(self, anomalies: Dict[str, Any]):
         """Display anomaly heuristics"""
         flags = anomalies.get("flags", [])
         ratio = anomalies.get("nonPixelRatio", 0)
         
+        self._display_entropy_profile(anomalies.get("entropyProfile") or {})
+        
         if flags:
             flags_text = ", ".join(flags)
             self.console.print(Panel(
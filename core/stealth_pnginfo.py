@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Stealth PNG Info - Generation metadata hidden in alpha-channel LSBs.
+
+NovelAI and the A1111 stealth-pnginfo extension write a signature, a 32-bit
+bit length and the (optionally gzipped) parameters into the least significant
+bit of the alpha channel, walking pixels column by column. This module
+provides decode_stealth_pnginfo(), which reads the signature first and stops
+immediately when it is absent, then unpacks only the declared number of bits.
+"""
+
+import gzip
+from typing import Dict, Any, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Signature -> whether the payload is gzip-compressed
+STEALTH_SIGNATURES = {
+    b"stealth_pnginfo": False,
+    b"stealth_pngcomp": True,
+}
+SIGNATURE_BITS = 15 * 8
+LENGTH_BITS = 32
+
+
+def decode_stealth_pnginfo(alpha: "np.ndarray") -> Optional[Dict[str, Any]]:
+    """
+    Recover a stealth pnginfo payload from an alpha plane.
+
+    Args:
+        alpha: uint8 array of shape (height, width)
+
+    Returns:
+        Dictionary with signature, compressed, bits and text, or None when the
+        image carries no stealth payload
+    """
+    height, width = alpha.shape
+    capacity = height * width
+    if capacity < SIGNATURE_BITS + LENGTH_BITS:
+        return None
+
+    signature = _read_bits(alpha, 0, SIGNATURE_BITS)
+    if signature not in STEALTH_SIGNATURES:
+        return None
+
+    length = int.from_bytes(_read_bits(alpha, SIGNATURE_BITS, LENGTH_BITS), "big")
+    start = SIGNATURE_BITS + LENGTH_BITS
+    if length == 0 or length % 8 or length > capacity - start:
+        return {"signature": signature.decode("ascii"), "error": f"Invalid payload length: {length} bits"}
+
+    data = _read_bits(alpha, start, length)
+    compressed = STEALTH_SIGNATURES[signature]
+    result = {
+        "signature": signature.decode("ascii"),
+        "compressed": compressed,
+        "bits": length,
+        "text": None
+    }
+    try:
+        if compressed:
+            data = gzip.decompress(data)
+        result["text"] = data.decode("utf-8", errors="replace")
+    except (OSError, EOFError) as e:
+        result["error"] = f"Could not decompress payload: {e}"
+    return result
+
+
+def _read_bits(alpha: "np.ndarray", start: int, count: int) -> bytes:
+    """Pack `count` alpha LSBs (column-major, MSB first) starting at bit `start`."""
+    height = alpha.shape[0]
+    first_column = start // height
+    last_column = (start + count - 1) // height + 1
+    # Only the columns spanning the requested bits are transposed and copied
+    column_major = alpha[:, first_column:last_column].T.ravel()
+    skip = start - first_column * height
+    return np.packbits(column_major[skip:skip + count] & 1).tobytes()
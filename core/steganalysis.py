@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Steganalysis - Vectorized LSB embedding detection over decoded pixels.
+
+This module provides the LSBAnalyzer class, which runs the chi-square attack
+(Westfeld & Pfitzmann) and RS analysis (Fridrich, Goljan & Du) per channel.
+Images are processed in row strips so temporaries stay bounded; only 256-bin
+histograms and RS group counts are accumulated across strips.
+"""
+
+import math
+from typing import Dict, List, Any, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _flip_positive(x):
+    """F1: 0<->1, 2<->3, ... (flip the LSB)."""
+    return x ^ 1
+
+
+def _flip_negative(x):
+    """F-1: -1<->0, 1<->2, ... (shifted LSB flip)."""
+    return ((x + 1) ^ 1) - 1
+
+
+def _build_rs_tables():
+    """
+    Packed lookup tables for the change in smoothness when a mask flips pixels.
+
+    A group (x0, x1, x2, x3) with mask [0, 1, 1, 0] changes smoothness by
+    t_left[x0, x1] + t_mid[x1, x2] + t_right[x2, x3]; each term only depends on
+    one pixel pair, so it is precomputed for all 256x256 pairs. The four RS
+    variants (M, -M, and both again with every LSB flipped) are packed into
+    4-bit fields of one uint16, each term offset by +2 so the three-term sum
+    (delta + 6, range 0..12) never carries into the next field.
+    """
+    a = np.arange(256, dtype=np.int16)[:, None]
+    b = np.arange(256, dtype=np.int16)[None, :]
+    index = np.arange(65536)
+    packed = [np.zeros(65536, dtype=np.uint16) for _ in range(3)]
+    for m, flip in enumerate((_flip_positive, _flip_negative)):
+        terms = (
+            np.abs(flip(b) - a) - np.abs(b - a),            # x0 fixed, x1 flipped
+            np.abs(flip(b) - flip(a)) - np.abs(b - a),      # x1, x2 both flipped
+            np.abs(b - flip(a)) - np.abs(b - a),            # x2 flipped, x3 fixed
+        )
+        for t, term in enumerate(terms):
+            # Pair indices come from little-endian uint16 views: first | second << 8
+            term = (term.T.ravel() + 2).astype(np.uint16)
+            packed[t] |= term << (4 * m)
+            # Same term evaluated on the image with all LSBs flipped
+            packed[t] |= term[index ^ 0x0101] << (4 * (m + 2))
+    return tuple(packed)
+
+
+def _decode_rs_histogram():
+    """For every packed value, whether each of the 4 fields is regular (>6) or singular (<6)."""
+    values = np.arange(65536)
+    fields = np.stack([(values >> (4 * v)) & 0xF for v in range(4)])
+    return fields > 6, fields < 6
+
+
+class LSBAnalyzer:
+    """
+    Estimates LSB embedding per channel with chi-square and RS analysis.
+
+    RS analysis gives an embedding-rate estimate (fraction of pixels carrying
+    a message bit) that works for randomly scattered embedding; the chi-square
+    profile over increasing image prefixes detects sequential embedding.
+    """
+
+    def __init__(self, strip_rows: int = 512, rate_threshold: float = 0.15):
+        """
+        Initialize the LSBAnalyzer.
+
+        Args:
+            strip_rows: Rows processed per strip (bounds temporary memory)
+            rate_threshold: Estimated embedding rate above which a channel is suspicious
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for LSBAnalyzer")
+        self.strip_rows = strip_rows
+        self.rate_threshold = rate_threshold
+        self._rs_tables = _build_rs_tables()
+        self._rs_regular, self._rs_singular = _decode_rs_histogram()
+
+    def analyze(self, pixels: "np.ndarray", channel_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Analyze an 8-bit image array.
+
+        Args:
+            pixels: uint8 array of shape (height, width) or (height, width, channels)
+            channel_names: Names for the channels (e.g. ['R', 'G', 'B'])
+
+        Returns:
+            Dictionary with per-channel results and the maximum estimated rate
+        """
+        if pixels.ndim == 2:
+            pixels = pixels[:, :, None]
+        height, width, channels = pixels.shape
+        names = channel_names or [f"C{i}" for i in range(channels)]
+
+        results = {}
+        for c in range(channels):
+            results[names[c]] = self._analyze_channel(pixels[:, :, c], height, width)
+
+        suspicious = [name for name, r in results.items() if r["suspicious"]]
+        return {
+            "channels": results,
+            "maxEmbeddingRate": max((r["embeddingRate"] for r in results.values()), default=None),
+            "suspiciousChannels": suspicious,
+            "lsbEmbeddingSuspected": bool(suspicious)
+        }
+
+    def _analyze_channel(self, channel: "np.ndarray", height: int, width: int) -> Dict[str, Any]:
+        """Accumulate histogram and RS counts strip by strip for one channel."""
+        histogram = np.zeros(256, dtype=np.int64)
+        # Chi-square p-value after each strip, for the sequential-embedding profile
+        prefix_profile = []
+        # Histogram of packed RS deltas; decoded into R/S counts once per channel
+        rs_histogram = np.zeros(65536, dtype=np.int64)
+        group_width = width - width % 4
+
+        for top in range(0, height, self.strip_rows):
+            strip = channel[top:top + self.strip_rows]
+            if group_width:
+                # One contiguous copy per strip; pair indices are zero-copy uint16 views of it
+                plane = np.ascontiguousarray(strip[:, :group_width]).reshape(-1)
+                pairs = plane.view('<u2')
+                joint = np.bincount(pairs, minlength=65536).reshape(256, 256)
+                histogram += joint.sum(axis=0) + joint.sum(axis=1)
+                rs_histogram += self._rs_histogram(pairs, plane)
+            if group_width < width:
+                histogram += np.bincount(strip[:, group_width:].ravel(), minlength=256)
+            prefix_profile.append((min(top + self.strip_rows, height) / height, self._chi_square_p(histogram)))
+
+        p_value = prefix_profile[-1][1] if prefix_profile else 0.0
+        # Largest image prefix where the pair-of-values histogram still looks embedded
+        sequential = 0.0
+        for fraction, p in prefix_profile:
+            if p > 0.95:
+                sequential = fraction
+            else:
+                break
+
+        rate = None
+        if group_width:
+            # Rows: M, -M, M (flipped), -M (flipped); columns: regular, singular
+            regular = (self._rs_regular * rs_histogram).sum(axis=1)
+            singular = (self._rs_singular * rs_histogram).sum(axis=1)
+            rate = self._rs_estimate(np.stack([regular, singular], axis=1).reshape(2, 2, 2))
+        # RS breaks down near full embedding, where the chi-square attack is strongest
+        embedding_rate = max(rate or 0.0, sequential)
+        return {
+            "chiSquareP": round(p_value, 4),
+            "sequentialEmbedding": round(sequential, 3),
+            "rsEmbeddingRate": None if rate is None else round(rate, 4),
+            "embeddingRate": round(embedding_rate, 4),
+            "suspicious": embedding_rate > self.rate_threshold
+        }
+
+    def _rs_histogram(self, pairs: "np.ndarray", plane: "np.ndarray") -> "np.ndarray":
+        """Histogram of packed smoothness deltas for all four RS variants.
+
+        pairs views the plane as (x0, x1), (x2, x3) per group; the middle pair
+        (x1, x2) comes from the same buffer viewed one byte later.
+        """
+        left, mid, right = self._rs_tables
+        packed = left[pairs[0::2]]
+        packed += mid[plane[1:-1].view('<u2')[0::2]]
+        packed += right[pairs[1::2]]
+        return np.bincount(packed, minlength=65536)
+
+    def _rs_estimate(self, rs_counts: "np.ndarray") -> Optional[float]:
+        """Solve the RS quadratic for the embedding rate (scale-free, so raw counts are used).
+
+        rs_counts[flipped, mask, kind]: flipped 0/1, mask M/-M, kind regular/singular.
+        """
+        d0 = float(rs_counts[0, 0, 0] - rs_counts[0, 0, 1])     # R_M - S_M
+        dn0 = float(rs_counts[0, 1, 0] - rs_counts[0, 1, 1])    # R_-M - S_-M
+        d1 = float(rs_counts[1, 0, 0] - rs_counts[1, 0, 1])     # Same, LSBs flipped
+        dn1 = float(rs_counts[1, 1, 0] - rs_counts[1, 1, 1])
+        a = 2 * (d1 + d0)
+        b = dn0 - dn1 - d1 - 3 * d0
+        c = d0 - dn0
+
+        if abs(a) < 1e-9:
+            if abs(b) < 1e-9:
+                return None
+            x = -c / b
+        else:
+            discriminant = b * b - 4 * a * c
+            if discriminant < 0:
+                return None
+            root = math.sqrt(discriminant)
+            x = min(((-b + root) / (2 * a), (-b - root) / (2 * a)), key=abs)
+        if abs(x - 0.5) < 1e-9:
+            return None
+        return float(min(max(x / (x - 0.5), 0.0), 1.0))
+    
+    def _chi_square_p(self, histogram: "np.ndarray") -> float:
+        """Probability of embedding from the pairs-of-values chi-square statistic."""
+        even = histogram[0::2].astype(np.float64)
+        odd = histogram[1::2].astype(np.float64)
+        expected = (even + odd) / 2
+        used = expected > 4
+        dof = int(np.count_nonzero(used)) - 1
+        if dof < 1:
+            return 0.0
+        chi2 = float((((even[used] - expected[used]) ** 2) / expected[used]).sum())
+        return 1.0 - _chi2_cdf(chi2, dof)
+
+
+def _chi2_cdf(x: float, dof: int) -> float:
+    """Chi-square CDF via the Wilson-Hilferty normal approximation."""
+    if x <= 0:
+        return 0.0
+    k = float(dof)
+    z = ((x / k) ** (1.0 / 3.0) - (1.0 - 2.0 / (9.0 * k))) / math.sqrt(2.0 / (9.0 * k))
+    return 0.5 * math.erfc(-z / math.sqrt(2.0))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+XMP Parser - Streaming extraction of XMP properties from raw packets.
+
+This module provides the XMPParser class, which feeds XMP packets through an
+incremental XML parser in bounded chunks, keeps only the namespaces and
+properties a caller asks for, and stops as soon as every requested property
+has been seen. Identical packets are parsed once per parser instance, with
+the most recent CACHE_SIZE results kept.
+"""
+
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable, Union, Tuple
+
+
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+# Parsed packets kept per parser (least recently used are dropped first)
+CACHE_SIZE = 256
+
+# Canonical prefixes for well-known XMP namespaces; packets may declare others
+XMP_NAMESPACES = {
+    "http://purl.org/dc/elements/1.1/": "dc",
+    "http://ns.adobe.com/xap/1.0/": "xmp",
+    "http://ns.adobe.com/xap/1.0/mm/": "xmpMM",
+    "http://ns.adobe.com/xap/1.0/rights/": "xmpRights",
+    "http://ns.adobe.com/xap/1.0/sType/ResourceEvent#": "stEvt",
+    "http://ns.adobe.com/xap/1.0/sType/ResourceRef#": "stRef",
+    "http://ns.adobe.com/xap/1.0/g/img/": "xmpGImg",
+    "http://ns.adobe.com/xmp/note/": "xmpNote",
+    "http://ns.adobe.com/xmp/1.0/DynamicMedia/": "xmpDM",
+    "http://ns.adobe.com/photoshop/1.0/": "photoshop",
+    "http://ns.adobe.com/camera-raw-settings/1.0/": "crs",
+    "http://ns.adobe.com/lightroom/1.0/": "lr",
+    "http://ns.adobe.com/tiff/1.0/": "tiff",
+    "http://ns.adobe.com/exif/1.0/": "exif",
+    "http://ns.adobe.com/exif/1.0/aux/": "aux",
+    "http://cipa.jp/exif/1.0/": "exifEX",
+    "http://ns.adobe.com/pdf/1.3/": "pdf",
+    "http://iptc.org/std/Iptc4xmpCore/1.0/xmlns/": "Iptc4xmpCore",
+    "http://iptc.org/std/Iptc4xmpExt/2008-02-29/": "Iptc4xmpExt",
+    "http://ns.useplus.org/ldf/xmp/1.0/": "plus",
+    "http://ns.google.com/photos/1.0/camera/": "GCamera",
+    "http://c2pa.org/manifest/1.0/": "c2pa",
+}
+
+
+class XMPParser:
+    """
+    Incremental XMP packet parser with property projection and packet caching.
+
+    Properties are returned keyed by "prefix:name" using the canonical prefixes
+    in XMP_NAMESPACES (falling back to the prefix declared in the packet).
+    Simple values become strings, rdf:Seq/rdf:Bag become lists, rdf:Alt becomes
+    the x-default (or first) entry, and structures become dictionaries.
+    """
+
+    def __init__(self, chunk_size: int = 64 * 1024):
+        """
+        Initialize the XMPParser.
+
+        Args:
+            chunk_size: Number of bytes fed to the XML parser per step
+        """
+        self.chunk_size = chunk_size
+        self._cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def clear_cache(self) -> None:
+        """Forget cached packets, e.g. between batches."""
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+
+    def parse(
+        self,
+        packet: Union[bytes, bytearray, memoryview],
+        properties: Optional[Iterable[str]] = None,
+        namespaces: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse an XMP packet, optionally projecting to selected properties.
+
+        Args:
+            packet: Raw packet bytes (a memoryview slice avoids copying)
+            properties: Properties to keep, e.g. ['dc:creator', 'xmp:CreatorTool'];
+                parsing stops once all of them have been found
+            namespaces: Namespace prefixes to keep entirely, e.g. ['xmpMM']
+
+        Returns:
+            Dictionary of property name to value
+        """
+        wanted = frozenset(properties) if properties is not None else None
+        wanted_ns = frozenset(namespaces) if namespaces is not None else None
+
+        key = (hashlib.blake2b(packet, digest_size=16).digest(), wanted, wanted_ns)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return dict(cached)
+            self.cache_misses += 1
+
+        result = self._parse_packet(memoryview(packet), wanted, wanted_ns)
+
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return dict(result)
+
+    def _parse_packet(
+        self,
+        view: memoryview,
+        wanted: Optional[frozenset],
+        wanted_ns: Optional[frozenset]
+    ) -> Dict[str, Any]:
+        """Stream the packet through XMLPullParser and collect top-level properties."""
+        parser = ET.XMLPullParser(events=("start-ns", "start", "end"))
+        declared_prefixes: Dict[str, str] = {}
+        result: Dict[str, Any] = {}
+        # Early exit is only possible when the caller named every property it needs
+        remaining = set(wanted) if wanted is not None and wanted_ns is None else None
+
+        depth = 0
+        description_depth = None
+
+        def keep(name: str) -> bool:
+            if wanted is None and wanted_ns is None:
+                return True
+            if wanted is not None and name in wanted:
+                return True
+            return wanted_ns is not None and name.split(":", 1)[0] in wanted_ns
+
+        try:
+            for pos in range(0, len(view), self.chunk_size):
+                parser.feed(view[pos:pos + self.chunk_size])
+                for event, item in parser.read_events():
+                    if event == "start-ns":
+                        prefix, uri = item
+                        declared_prefixes.setdefault(uri, prefix)
+                    elif event == "start":
+                        depth += 1
+                        if item.tag == f"{{{RDF_NS}}}Description" and description_depth is None:
+                            description_depth = depth
+                            # Simple properties are often written as attributes
+                            for attr, value in item.attrib.items():
+                                if attr.startswith(f"{{{RDF_NS}}}"):
+                                    continue
+                                name = self._qualified_name(attr, declared_prefixes)
+                                if keep(name):
+                                    result[name] = value
+                                    if remaining is not None:
+                                        remaining.discard(name)
+                    else:
+                        if description_depth is not None and depth == description_depth + 1:
+                            name = self._qualified_name(item.tag, declared_prefixes)
+                            if keep(name):
+                                result[name] = self._element_value(item, declared_prefixes)
+                                if remaining is not None:
+                                    remaining.discard(name)
+                            item.clear()
+                        elif description_depth is not None and depth == description_depth:
+                            description_depth = None
+                        depth -= 1
+
+                    if remaining is not None and not remaining:
+                        return result
+        except ET.ParseError:
+            # Trailing padding or junk after the packet; keep what was parsed
+            pass
+
+        return result
+
+    def _qualified_name(self, tag: str, declared_prefixes: Dict[str, str]) -> str:
+        """Convert '{uri}local' to 'prefix:local'."""
+        if not tag.startswith("{"):
+            return tag
+        uri, local = tag[1:].split("}", 1)
+        prefix = XMP_NAMESPACES.get(uri) or declared_prefixes.get(uri) or uri
+        return f"{prefix}:{local}"
+
+    def _element_value(self, element: ET.Element, declared_prefixes: Dict[str, str]) -> Any:
+        """Convert a property element into a string, list or dictionary."""
+        for container in element:
+            kind = container.tag.replace(f"{{{RDF_NS}}}", "")
+            if kind in ("Seq", "Bag"):
+                return [self._element_value(li, declared_prefixes) for li in container]
+            if kind == "Alt":
+                items = list(container)
+                for li in items:
+                    if li.get(XML_LANG) == "x-default":
+                        return self._element_value(li, declared_prefixes)
+                return self._element_value(items[0], declared_prefixes) if items else None
+
+        # Structures: rdf:parseType="Resource", nested rdf:Description, or qualifier attributes
+        fields = {}
+        for attr, value in element.attrib.items():
+            if not attr.startswith(f"{{{RDF_NS}}}") and attr != XML_LANG:
+                fields[self._qualified_name(attr, declared_prefixes)] = value
+        for child in element:
+            if child.tag == f"{{{RDF_NS}}}Description":
+                fields.update(self._element_value(child, declared_prefixes) or {})
+            else:
+                fields[self._qualified_name(child.tag, declared_prefixes)] = self._element_value(child, declared_prefixes)
+        if fields:
+            return fields
+
+        return (element.text or "").strip()